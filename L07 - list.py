@@ -1,3 +1,7 @@
+from itertools import chain
+from math import isqrt
+
+
 class My_List:
     def __init__(self, l: list[any]) -> None:
         self._list = l
@@ -5,8 +9,16 @@ class My_List:
     def __repr__(self) -> str:
         return str(self._list)
 
-    def add(self, e) -> None:
-        self._list.append(e)
+    def __iter__(self):
+        return iter(self._list)
+
+    def add(self, e, i: int = None) -> None:
+        if i is None:
+            self._list.append(e)
+        elif 0 <= i <= len(self._list):
+            self._list.insert(i, e)
+        else:
+            raise IndexError("Index out of range")
 
     def get(self, i):
         if 0 <= i < len(self._list):
@@ -30,6 +42,151 @@ class My_List:
         return len(self._list)
 
 
+class My_Blocked_List:
+    """
+    Unrolled (sqrt-decomposed) list with the same API as My_List.
+
+    Elements live in a list of blocks of roughly `load` elements each, so an
+    insert or remove at any index only shifts one block (O(sqrt(n))) instead of
+    the whole list. Block sizes are indexed by a Fenwick tree, so finding the
+    block that holds index i is O(log n). Blocks are split when they grow
+    past 2 * load and merged with a neighbour when they shrink below load / 2.
+    The whole structure is rebuilt with a new load when n outgrows load**2.
+
+    Parameters
+    ----------
+    l: list
+        Initial elements.
+    load: int
+        Target block size. Defaults to sqrt(len(l)) (with a small minimum).
+    """
+
+    _MIN_LOAD = 32
+
+    def __init__(self, l: list[any], load: int = None) -> None:
+        self._n = len(l)
+        self._fixed_load = load is not None
+        self._load = load if load is not None else max(self._MIN_LOAD, isqrt(self._n))
+        self._blocks = [l[i : i + self._load] for i in range(0, self._n, self._load)]
+        self._tree = None  # Fenwick tree over block sizes, rebuilt lazily
+
+    def __repr__(self) -> str:
+        return str(list(self))
+
+    def __iter__(self):
+        return chain.from_iterable(self._blocks)
+
+    def _rebuild(self) -> None:
+        items = list(self)
+        if not self._fixed_load:
+            self._load = max(self._MIN_LOAD, isqrt(self._n))
+        self._blocks = [
+            items[i : i + self._load] for i in range(0, self._n, self._load)
+        ]
+        self._tree = None
+
+    def _build_tree(self) -> None:
+        tree = [0] + [len(b) for b in self._blocks]
+        for k in range(1, len(tree)):
+            parent = k + (k & -k)
+            if parent < len(tree):
+                tree[parent] += tree[k]
+        self._tree = tree
+
+    def _update_tree(self, b: int, delta: int) -> None:
+        if self._tree is None:
+            return
+        tree = self._tree
+        k = b + 1
+        while k < len(tree):
+            tree[k] += delta
+            k += k & -k
+
+    def _locate(self, i: int) -> tuple[int, int]:
+        # Returns (block number, position inside the block) for index i
+        if self._tree is None:
+            self._build_tree()
+        tree = self._tree
+        b = 0
+        step = 1 << (len(tree) - 1).bit_length()
+        while step:
+            k = b + step
+            if k < len(tree) and tree[k] <= i:
+                b = k
+                i -= tree[k]
+            step >>= 1
+        if b == len(self._blocks):  # i == n, one past the last element
+            b -= 1
+            i += len(self._blocks[b])
+        return b, i
+
+    def add(self, e, i: int = None) -> None:
+        if i is None:
+            i = self._n
+        if not 0 <= i <= self._n:
+            raise IndexError("Index out of range")
+        if not self._blocks:
+            self._blocks.append([e])
+            self._n = 1
+            self._tree = None
+            return
+        b, j = self._locate(i)
+        block = self._blocks[b]
+        block.insert(j, e)
+        self._n += 1
+        if len(block) > 2 * self._load:
+            self._blocks[b : b + 1] = [block[: self._load], block[self._load :]]
+            self._tree = None
+        else:
+            self._update_tree(b, 1)
+        if not self._fixed_load and self._n > 4 * self._load * self._load:
+            self._rebuild()
+
+    def get(self, i):
+        if 0 <= i < self._n:
+            b, j = self._locate(i)
+            return self._blocks[b][j]
+        else:
+            raise IndexError("Index out of range")
+
+    def remove(self, i):
+        if not 0 <= i < self._n:
+            raise IndexError("Index out of range")
+        b, j = self._locate(i)
+        block = self._blocks[b]
+        e = block.pop(j)
+        self._n -= 1
+        if not block:
+            del self._blocks[b]
+            self._tree = None
+        elif len(block) < self._load // 2 and len(self._blocks) > 1:
+            # Merge with a neighbour, splitting again if the result is too big
+            if b == len(self._blocks) - 1:
+                b -= 1
+            merged = self._blocks[b] + self._blocks[b + 1]
+            if len(merged) > 2 * self._load:
+                half = len(merged) // 2
+                self._blocks[b : b + 2] = [merged[:half], merged[half:]]
+            else:
+                self._blocks[b : b + 2] = [merged]
+            self._tree = None
+        else:
+            self._update_tree(b, -1)
+        return e
+
+    def index_of(self, e) -> int:
+        base = 0
+        for block in self._blocks:
+            try:
+                return base + block.index(e)
+            except ValueError:
+                base += len(block)
+        return -1
+
+    def size(self) -> int:
+        return self._n
+
+
 if __name__ == "__main__":
 
     L = My_List([3, 2, 5, 1, 9, 0, 8, 6, 7, 4])
@@ -53,3 +210,29 @@ if __name__ == "__main__":
     # 5
     print(L.size())
     # 10
+
+    B = My_Blocked_List([3, 2, 5, 1, 9, 0, 8, 6, 7, 4], load=2)
+    B.add(-1)
+    B.add(11, 3)
+    print(B)
+    # [3, 2, 5, 11, 1, 9, 0, 8, 6, 7, 4, -1]
+    print(B.get(3), B.remove(3), B.remove(2))
+    # 11 11 5
+    print(B, B.index_of(8), B.size())
+    # [3, 2, 1, 9, 0, 8, 6, 7, 4, -1] 5 10
+
+    # Random-position inserts/removes: blocked list vs flat list
+    from random import randint, seed
+    from time import perf_counter
+
+    seed(0)
+    n = 200_000
+    positions = [randint(0, n) for _ in range(20_000)]
+    for cls in (My_List, My_Blocked_List):
+        S = cls(list(range(n)))
+        start = perf_counter()
+        for p in positions:
+            S.add(p, p)
+        for p in positions:
+            S.remove(p)
+        print(f"{cls.__name__}: {perf_counter() - start:.3f}s")
@@ -1,9 +1,19 @@
+from importlib import import_module
 from typing import TypeVar, Callable
 
 T = TypeVar("T")
 
+# Galloping search primitives shared with L12
+_search = import_module("L12 - binary_search")
+gallop_left = _search.gallop_left
+gallop_right = _search.gallop_right
 
-def merge_sort(A: list[T], key: Callable = lambda x: x, reverse: bool = False) -> None:
+MIN_GALLOP = 7
+
+
+def merge_sort(
+    A: list[T], key: Callable = lambda x: x, reverse: bool = False, gallop: bool = False
+) -> None:
     def merge(A, p, q, r):
         # TODO
         # pass
@@ -32,6 +42,52 @@ def merge_sort(A: list[T], key: Callable = lambda x: x, reverse: bool = False) -
                 A[k] = R[j]
                 j += 1
 
+    def merge_gallop(A, p, q, r):
+        L = A[p:q + 1]
+        R = A[q + 1:r + 1]
+        nL, nR = len(L), len(R)
+
+        # Merge one element at a time until one side wins MIN_GALLOP times in
+        # a row; then switch to galloping, which finds with an exponential
+        # search how many elements of one side go before the head of the
+        # other and copies them as a single slice. Galloping stops when the
+        # runs it finds get short again (same strategy as Timsort). Unlike
+        # merge, no sentinel is needed, so any comparable key works.
+        i = j = 0
+        k = p
+        while i < nL and j < nR:
+            wins_l = wins_r = 0
+            while i < nL and j < nR and wins_l < MIN_GALLOP and wins_r < MIN_GALLOP:
+                if key(R[j]) < key(L[i]):
+                    A[k] = R[j]
+                    j += 1
+                    wins_r += 1
+                    wins_l = 0
+                else:
+                    A[k] = L[i]
+                    i += 1
+                    wins_l += 1
+                    wins_r = 0
+                k += 1
+            while i < nL and j < nR:
+                # Elements of L with key <= key(R[j]) go first (keeps stability)
+                i2 = gallop_right(L, key(R[j]), key, lo=i)
+                A[k:k + i2 - i] = L[i:i2]
+                k += i2 - i
+                run_l, i = i2 - i, i2
+                if i == nL:
+                    break
+                # Elements of R with key < key(L[i])
+                j2 = gallop_left(R, key(L[i]), key, lo=j)
+                A[k:k + j2 - j] = R[j:j2]
+                k += j2 - j
+                run_r, j = j2 - j, j2
+                if run_l < MIN_GALLOP and run_r < MIN_GALLOP:
+                    break
+        A[k:k + nL - i] = L[i:]
+        k += nL - i
+        A[k:k + nR - j] = R[j:]
+
     def merge_sort_rec(A, p, r):
         # TODO
         # pass
@@ -39,7 +95,10 @@ def merge_sort(A: list[T], key: Callable = lambda x: x, reverse: bool = False) -
             q = (p + r) // 2
             merge_sort_rec(A, p, q)
             merge_sort_rec(A, q + 1, r)
-            merge(A, p, q, r)
+            if gallop:
+                merge_gallop(A, p, q, r)
+            else:
+                merge(A, p, q, r)
 
     merge_sort_rec(A, 0, len(A) - 1)
     if reverse:
@@ -63,3 +122,18 @@ if __name__ == "__main__":
     merge_sort(B, key=lambda x: x[1])
     print(B)
     # [(2, 0), (8, 1), (0, 2), (9, 3), (6, 4), (5, 5), (1, 6), (4, 7), (3, 8), (7, 9)]
+    C = ["pear", "apple", "fig", "kiwi"]
+    merge_sort(C, gallop=True)  # No numeric sentinel needed
+    print(C)
+    # ['apple', 'fig', 'kiwi', 'pear']
+
+    # Galloping pays off on partially ordered input (few long runs)
+    from random import random
+    from time import perf_counter
+
+    D = sorted(random() for _ in range(50_000)) + sorted(random() for _ in range(50_000))
+    for g in (False, True):
+        E = D[:]
+        start = perf_counter()
+        merge_sort(E, gallop=g)
+        print(f"merge_sort(gallop={g}): {perf_counter() - start:.3f}s")
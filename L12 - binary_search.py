@@ -1,35 +1,444 @@
+from enum import Enum
 from typing import TypeVar, Callable
 
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, only used by binary_search_many
+    np = None
+
 T = TypeVar("T")
 
 
 def binary_search(A: list[T], e: T, key: Callable = lambda x: x):
-    
-    def binary_search_rec(A, p, r, e):
-        
-        if p > r:
-            return -1
-        
-        mid = (p+r) // 2
-        
-        if key(A[mid]) == e:
+    p, r = 0, len(A) - 1
+    while p <= r:
+        mid = (p + r) // 2
+        k = key(A[mid])  # Only one key evaluation per probe
+        if k == e:
             return mid
-        
+        if k < e:
+            p = mid + 1
+        else:
+            r = mid - 1
+    return -1
+
+
+def lower_bound(
+    A: list[T], e: T, key: Callable = lambda x: x, lo: int = 0, hi: int = None
+) -> int:
+    """
+    Returns the first index i in [lo, hi) such that key(A[i]) >= e, or hi if
+    there is none. Equivalent to bisect.bisect_left(A, e, lo, hi, key=key).
+
+    Parameters
+    ----------
+    A: list[T]
+        List sorted by key.
+    e: T
+        Value searched for, compared against key(A[i]).
+    key: Callable
+        Function applied to the elements of A. Defaults to the identity.
+    lo, hi: int
+        Slice of A to search. Defaults to the whole list.
+    """
+    if hi is None:
+        hi = len(A)
+    while lo < hi:
+        mid = (lo + hi) // 2
         if key(A[mid]) < e:
-            return binary_search_rec(A,mid+1,r,e)
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def upper_bound(
+    A: list[T], e: T, key: Callable = lambda x: x, lo: int = 0, hi: int = None
+) -> int:
+    """
+    Returns the first index i in [lo, hi) such that key(A[i]) > e, or hi if
+    there is none. Equivalent to bisect.bisect_right(A, e, lo, hi, key=key).
+    """
+    if hi is None:
+        hi = len(A)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if e < key(A[mid]):
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+
+def equal_range(A: list[T], e: T, key: Callable = lambda x: x) -> tuple[int, int]:
+    """
+    Returns the half-open range [first, last) of indices whose key equals e.
+    The range is empty (first == last) when e is not in A, and first is then
+    the position where e would be inserted.
+    """
+    first = lower_bound(A, e, key)
+    return first, upper_bound(A, e, key, lo=first)
+
+
+def search_range(A: list[T], e: T, key: Callable = lambda x: x) -> tuple[int, int]:
+    """
+    Returns the indices (first, last) of the first and last element whose key
+    equals e, both inclusive, or (-1, -1) if e is not in A.
+    """
+    first, last = equal_range(A, e, key)
+    if first == last:
+        return -1, -1
+    return first, last - 1
+
+
+def _gallop(A, e, key: Callable, lo: int, hi: int, strict: bool) -> int:
+    # Probes lo, lo + 1, lo + 3, lo + 7, ... until the key passes e (or the
+    # end of A), then finishes with a binary search inside the last bracket.
+    # hi=None means A may have no len(): indices past its end raise
+    # IndexError and behave like +infinity.
+    def before(i):  # True if A[i] comes before the searched position
+        try:
+            k = key(A[i])
+        except IndexError:
+            return False
+        return k <= e if strict else k < e
+
+    prev, step = lo - 1, 1
+    cur = lo
+    while (hi is None or cur < hi) and before(cur):
+        prev, cur = cur, cur + step
+        step <<= 1
+    if hi is not None and cur > hi:
+        cur = hi
+    lo = prev + 1
+    while lo < cur:  # Everything in (prev, cur) is still undecided
+        mid = (lo + cur) // 2
+        if before(mid):
+            lo = mid + 1
         else:
-            return binary_search_rec(A, p , mid-1,e)
+            cur = mid
+    return lo
+
+
+def gallop_left(
+    A, e: T, key: Callable = lambda x: x, lo: int = 0, hi: int = None
+) -> int:
+    """
+    Exponential (galloping) version of lower_bound: returns the first index
+    i >= lo with key(A[i]) >= e. Costs O(log d) probes where d = i - lo, so it
+    is cheap when the answer is close to lo.
+
+    A only needs __getitem__. If it has no len() and hi is not given, the end
+    of A is discovered through IndexError, which allows unbounded or lazily
+    materialized sequences.
+    """
+    if hi is None and hasattr(A, "__len__"):
+        hi = len(A)
+    return _gallop(A, e, key, lo, hi, strict=False)
+
+
+def gallop_right(
+    A, e: T, key: Callable = lambda x: x, lo: int = 0, hi: int = None
+) -> int:
+    """
+    Exponential (galloping) version of upper_bound: returns the first index
+    i >= lo with key(A[i]) > e. See gallop_left.
+    """
+    if hi is None and hasattr(A, "__len__"):
+        hi = len(A)
+    return _gallop(A, e, key, lo, hi, strict=True)
+
+
+def exponential_search(A, e: T, key: Callable = lambda x: x) -> int:
+    """
+    Same result convention as binary_search (index of an element whose key
+    equals e, here the first one, or -1), but searching from the front with
+    gallop_left, so it does not need len(A).
+    """
+    i = gallop_left(A, e, key)
+    try:
+        return i if key(A[i]) == e else -1
+    except IndexError:
+        return -1
+
+
+class SortedStream:
+    """
+    Searchable view of a sorted iterator. Elements are pulled from the
+    iterator only as far as a search needs them and kept in an internal
+    buffer, so later searches reuse what was already read. Searches gallop
+    over the buffer and double the number of elements read each time they
+    need more, so a target near the front costs O(log d).
+
+    Parameters
+    ----------
+    it: iterable
+        Elements sorted by key.
+    key: Callable
+        Function applied to the elements.
+    """
+
+    def __init__(self, it, key: Callable = lambda x: x) -> None:
+        self._it = iter(it)
+        self._key = key
+        self._buffer = []
+        self._exhausted = False
+
+    def __repr__(self) -> str:
+        return f"SortedStream({self._buffer}{'' if self._exhausted else ', ...'})"
+
+    def __getitem__(self, i: int):
+        # Fills the buffer up to index i, reading in doubling chunks
+        buffer = self._buffer
+        while i >= len(buffer) and not self._exhausted:
+            want = max(i + 1, 2 * len(buffer), 16) - len(buffer)
+            before = len(buffer)
+            buffer.extend(e for _, e in zip(range(want), self._it))
+            if len(buffer) - before < want:
+                self._exhausted = True
+        return buffer[i]  # Raises IndexError past the end of the stream
 
-    return binary_search_rec(A, 0, len(A) - 1, e)
+    def lower_bound(self, e: T, lo: int = 0) -> int:
+        return _gallop(self, e, self._key, lo, None, strict=False)
+
+    def upper_bound(self, e: T, lo: int = 0) -> int:
+        return _gallop(self, e, self._key, lo, None, strict=True)
+
+    def search(self, e: T) -> int:
+        return exponential_search(self, e, self._key)
+
+
+def binary_search_many(
+    A: list[T], queries: list[T], key: Callable = None
+) -> list[int]:
+    """
+    Looks up every value of queries in the sorted list A at once. Returns, in
+    the original query order, the index of the first element of A whose key
+    equals each query, or -1 if there is none.
+
+    Queries are sorted and swept over A in a single pass, so the search for a
+    query starts where the previous (smaller) one ended. When there are about
+    as many queries as elements the sweep is a linear merge (O(n + q));
+    otherwise each query is a lower_bound restricted to the remaining suffix.
+    If NumPy is installed, key is None and the values are numeric, the
+    vectorized numpy.searchsorted is used instead.
+
+    Parameters
+    ----------
+    A: list[T]
+        List sorted by key.
+    queries: list[T]
+        Values to look up.
+    key: Callable
+        Function applied to the elements of A. None means the identity.
+    """
+    n = len(A)
+    if np is not None and key is None:
+        arr = np.asarray(A)
+        q = np.asarray(queries)
+        if arr.dtype.kind in "iuf" and q.dtype.kind in "iuf" and n > 0:
+            pos = np.searchsorted(arr, q, side="left")
+            found = arr[np.minimum(pos, n - 1)] == q
+            return np.where(found & (pos < n), pos, -1).tolist()
+
+    order = sorted(range(len(queries)), key=queries.__getitem__)
+    result = [-1] * len(queries)
+    if n == 0:
+        return result
+
+    if len(queries) * n.bit_length() > n:
+        # Merge both sorted sequences
+        keys = A if key is None else [key(x) for x in A]
+        i = 0
+        for j in order:
+            e = queries[j]
+            while i < n and keys[i] < e:
+                i += 1
+            if i == n:
+                break
+            if keys[i] == e:
+                result[j] = i
+    else:
+        i = 0
+        key = key if key is not None else lambda x: x
+        for j in order:
+            e = queries[j]
+            i = lower_bound(A, e, key, lo=i)
+            if i == n:
+                break
+            if key(A[i]) == e:
+                result[j] = i
+    return result
+
+
+def interpolation_search(A: list[T], e: T, key: Callable = lambda x: x) -> int:
+    """
+    Searches the sorted list A for e by interpolating its probable position
+    from the values at both ends of the current range. O(log log n) probes on
+    uniformly distributed numeric keys, O(n) in the worst case. Returns an
+    index whose key equals e, or -1.
+    """
+    p, r = 0, len(A) - 1
+    while p <= r:
+        kp, kr = key(A[p]), key(A[r])
+        if e < kp or e > kr:
+            return -1
+        if kp == kr:
+            return p if kp == e else -1
+        mid = p + int((e - kp) * (r - p) / (kr - kp))
+        k = key(A[mid])
+        if k == e:
+            return mid
+        if k < e:
+            p = mid + 1
+        else:
+            r = mid - 1
+    return -1
+
+
+class Layout(Enum):
+    EYTZINGER = 0
+    INTERPOLATION = 1
+    FENCE = 2
+
+
+class StaticSearchIndex:
+    """
+    Read-only search index over a sorted list, built once and queried many
+    times. search(e) returns the index in A of the first element whose key
+    equals e, or -1 (interpolation returns any matching index).
+
+    - EYTZINGER: the keys are rearranged in BFS order of the implicit complete
+      binary tree (children of k at 2k and 2k+1), so the first levels of every
+      search touch the same few cache lines and the loop has no early exits.
+    - INTERPOLATION: interpolation search over the keys, best for uniformly
+      distributed numbers.
+    - FENCE: a small list with the first key of every block of block_size
+      elements is searched first, then only the selected block is searched.
+
+    Parameters
+    ----------
+    A: list[T]
+        List sorted by key.
+    layout: Layout
+        Layout used for the searches.
+    key: Callable
+        Function applied to the elements of A. Evaluated once per element.
+    block_size: int
+        Block size of the FENCE layout.
+    """
+
+    def __init__(
+        self,
+        A: list[T],
+        layout: Layout = Layout.EYTZINGER,
+        key: Callable = lambda x: x,
+        block_size: int = 256,
+    ) -> None:
+        self.layout = layout
+        self.n = len(A)
+        keys = [key(x) for x in A]
+        if layout == Layout.EYTZINGER:
+            self._build_eytzinger(keys)
+        elif layout == Layout.FENCE:
+            self._keys = keys
+            self._block_size = block_size
+            self._fences = keys[::block_size]
+        else:
+            self._keys = keys
+
+    def _build_eytzinger(self, keys: list) -> None:
+        # In-order traversal of the implicit tree assigns the sorted keys
+        self._tree = [None] * (self.n + 1)
+        self._pos = [-1] * (self.n + 1)  # Position of every tree slot in A
+        i = 0
+        k = 1
+        stack = []
+        while stack or k <= self.n:
+            if k <= self.n:
+                stack.append(k)
+                k = 2 * k
+            else:
+                k = stack.pop()
+                self._tree[k] = keys[i]
+                self._pos[k] = i
+                i += 1
+                k = 2 * k + 1
+
+    def search(self, e: T) -> int:
+        if self.layout == Layout.EYTZINGER:
+            tree = self._tree
+            n = self.n
+            k = 1
+            while k <= n:
+                k = 2 * k + (tree[k] < e)
+            # Undo the right turns taken after the last left turn
+            k >>= ((~k) & (k + 1)).bit_length()
+            return self._pos[k] if k and tree[k] == e else -1
+        if self.layout == Layout.FENCE:
+            # Last block starting with a key < e holds the first match, or
+            # the match is the first element of the next block
+            b = max(lower_bound(self._fences, e) - 1, 0)
+            lo = b * self._block_size
+            i = lower_bound(self._keys, e, lo=lo, hi=min(lo + self._block_size, self.n))
+            return i if i < self.n and self._keys[i] == e else -1
+        return interpolation_search(self._keys, e)
 
 
 if __name__ == "__main__":
 
     A = [-5, 0, 1, 13, 21, 46, 99, 101, 102, 200]
-    
+
     print(binary_search(A, 21))
     # 4
     print(binary_search(A, 22))
     # -1
     print(binary_search(A, 200))
     # 9
+
+    B = [1, 2, 2, 2, 3, 5, 5, 8]
+    print(lower_bound(B, 2), upper_bound(B, 2))
+    # 1 4
+    print(equal_range(B, 5), equal_range(B, 4))
+    # (5, 7) (5, 5)
+    print(search_range(B, 2), search_range(B, 4))
+    # (1, 3) (-1, -1)
+    C = [("a", 1), ("b", 3), ("c", 3), ("d", 7)]
+    print(search_range(C, 3, key=lambda x: x[1]))
+    # (1, 2)
+    print(binary_search_many(A, [200, 22, -5, 21, 1000]))
+    # [9, -1, 0, 4, -1]
+
+    # One million queries: loop of single lookups vs one batched call
+    from random import randint, seed
+    from time import perf_counter
+
+    seed(0)
+    A = sorted(randint(0, 10**7) for _ in range(10**6))
+    Q = [randint(0, 10**7) for _ in range(10**6)]
+    start = perf_counter()
+    single = [binary_search(A, e) for e in Q]
+    print(f"binary_search loop: {perf_counter() - start:.3f}s")
+    start = perf_counter()
+    many = binary_search_many(A, Q)
+    print(f"binary_search_many: {perf_counter() - start:.3f}s")
+    print(all((s == -1) == (m == -1) for s, m in zip(single, many)))
+    # True
+
+    # Static layouts vs binary_search on the same sorted list
+    Q = Q[:10**5]
+    start = perf_counter()
+    expected = [binary_search(A, e) for e in Q]
+    print(f"binary_search: {perf_counter() - start:.3f}s")
+    for layout in Layout:
+        index = StaticSearchIndex(A, layout)
+        start = perf_counter()
+        found = [index.search(e) for e in Q]
+        print(f"{layout.name}: {perf_counter() - start:.3f}s")
+        assert all((x == -1) == (y == -1) for x, y in zip(expected, found))
+
+    print(exponential_search(A[:10], A[3]), gallop_left(B, 3), gallop_right(B, 5))
+    # 3 4 7
+    S = SortedStream(x * x for x in range(10**9))
+    print(S.search(144), S.search(145), S.lower_bound(145))
+    # 12 -1 13
@@ -1,4 +1,5 @@
-from typing import TypeVar, Callable
+import os
+from typing import TypeVar, Callable, Iterable
 from collections import namedtuple
 from functools import partial
 
@@ -8,52 +9,153 @@ Customer = namedtuple("Customer", ["name", "rfc", "address"])
 
 
 # HASH CODE FUNCTION FOR CUSTOMER OBJECTS
-def hash_code(e: Customer, m: int) -> int:
+def hash_code(e: Customer | str, m: int, hash_function: Callable = None) -> int:
     """
     Calculates a hash value for a Customer object.
     
     Args:
-        e: Customer object to hash
+        e: Customer object to hash, or directly its RFC
         m: Size of the hash table
+        hash_function: Optional f(key, m) from hash_functions.py applied to
+            the RFC, e.g. partial(hash_code, m=m, hash_function=fibonacci_hash)
         
     Returns:
         An integer hash value in the range [0, m-1]
     """
     # Use the RFC as the primary key for hashing
+    rfc = e.rfc if isinstance(e, Customer) else e
+    if hash_function is not None:
+        return hash_function(rfc, m)
     # Convert to a hash value using the built-in hash function
     # Take modulo m to ensure the hash is within the range [0, m-1]
-    return abs(hash(e.rfc)) % m
+    return abs(hash(rfc)) % m
+
+
+def parse_customer(line: str) -> Customer:
+    """Parses one tab-separated line of Clientes.txt."""
+    return Customer(*[e.strip() for e in line.split("\t")])
 
 
 class HashTable:
-    def __init__(self, A: list[T], hash_code: Callable) -> None:
-        self.table = {}
+    def __init__(
+        self, A: list[T], hash_code: Callable, m: int = None, key: Callable = None
+    ) -> None:
+        """
+        Hash table with separate chaining over a preallocated bucket array.
+
+        Args:
+            A: Initial elements
+            hash_code: Function mapping a key to a bucket in [0, m-1]
+            m: Number of buckets. Defaults to the m bound in a partial
+                hash_code, or len(A)
+            key: Function extracting the key of an element, e.g.
+                lambda c: c.rfc. Elements with the same key are the same
+                entry, and get(key) looks them up. Defaults to the element
+                itself (full equality), with hash_code applied to it
+        """
+        if m is None:
+            m = getattr(hash_code, "keywords", {}).get("m") or max(len(A), 1)
+        self.table: list[list[T]] = [None] * m  # Buckets are created on first use
+        # Keys of the elements in each bucket, parallel to self.table, so the
+        # lookup is a C-level list.index. Without key the elements are the keys.
+        self.keys: list[list] = self.table if key is None else [None] * m
         self.hash_code = hash_code
-        for e in A:
-            self.insert(e)
+        self.key = key
+        self.size = 0
+        self.insert_many(A)
+
+    @classmethod
+    def from_file(
+        cls,
+        path: str,
+        parser: Callable,
+        hash_code: Callable,
+        key: Callable = None,
+        unique: bool = False,
+        chunk_size: int = 1 << 20,
+    ) -> "HashTable":
+        """
+        Builds a table from a text file with one element per line, without
+        loading the whole file in memory.
+
+        The number of buckets is estimated from the file size and the
+        average line length of the first chunk, so the table does not need
+        to know the number of lines beforehand. The file is then read in
+        chunks of about chunk_size bytes and each chunk is batch-inserted.
+
+        Args:
+            path: Path of the file
+            parser: Function turning a line into an element, e.g. parse_customer
+            hash_code: Function (k, m) -> bucket, e.g. hash_code; m is bound here
+            key: Same as in the constructor
+            unique: True if the file is known not to repeat keys, which skips
+                the duplicate check on insert
+            chunk_size: Approximate bytes read per chunk
+
+        Returns:
+            The new table
+        """
+        with open(path, "r", buffering=chunk_size) as f:
+            lines = f.readlines(chunk_size)
+            sample = sum(len(l) for l in lines)
+            m = max(len(lines) * os.path.getsize(path) // max(sample, 1), 1)
+            table = cls([], partial(hash_code, m=m), m=m, key=key)
+            while lines:
+                table.insert_many((parser(l) for l in lines if l.strip()), unique)
+                lines = f.readlines(chunk_size)
+        return table
 
     def __repr__(self) -> str:
-        return str(self.table)
+        return str({h: bucket for h, bucket in enumerate(self.table) if bucket})
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _find(self, k) -> tuple[int, int]:
+        """
+        Locates the entry with key k, computing its hash only once.
+
+        Returns:
+            (h, i): bucket index and position inside the bucket (-1 if absent)
+        """
+        h = self.hash_code(k)
+        if not 0 <= h < len(self.table):
+            raise ValueError(f"hash_code returned {h}, outside [0, {len(self.table) - 1}]")
+        keys = self.keys[h]
+        if keys:
+            try:
+                return h, keys.index(k)
+            except ValueError:
+                pass
+        return h, -1
+
+    def _key(self, e: T):
+        return e if self.key is None else self.key(e)
 
     def search(self, e: T) -> bool:
         """
         Searches for an element in the hash table.
         
         Args:
-            e: Element to search for
+            e: Element to search for (compared by key when the table has one)
             
         Returns:
             True if the element is in the hash table, False otherwise
         """
-        # Compute the hash value for the element
-        h = self.hash_code(e)
-        
-        # Check if the hash exists in the table
-        if h not in self.table:
-            return False
-        
-        # Check if the element is in the list at the hash position
-        return e in self.table[h]
+        return self._find(self._key(e))[1] != -1
+
+    def get(self, k) -> T:
+        """
+        Looks up an element by its key (e.g. an RFC).
+
+        Args:
+            k: Key to search for
+
+        Returns:
+            The stored element, or None if there is none with that key
+        """
+        h, i = self._find(k)
+        return self.table[h][i] if i != -1 else None
 
     def insert(self, e: T) -> bool:
         """
@@ -65,55 +167,128 @@ class HashTable:
         Returns:
             True if the element was inserted, False if it was already in the table
         """
-        # If the element is already in the table, don't insert it again
-        if self.search(e):
+        k = e if self.key is None else self.key(e)
+        h, i = self._find(k)
+        if i != -1:
             return False
-        
-        # Compute the hash value
-        h = self.hash_code(e)
-        
-        # If this is the first element with this hash, create a new list
-        if h not in self.table:
-            self.table[h] = []
-            
-        # Add the element to the list at the hash position
-        self.table[h].append(e)
-        
+        self._append(h, k, e)
         return True
 
+    def upsert(self, e: T) -> bool:
+        """
+        Inserts an element, or replaces the one with the same key.
+
+        Args:
+            e: Element to insert or update
+
+        Returns:
+            True if the element was inserted, False if it replaced an existing one
+        """
+        k = self._key(e)
+        h, i = self._find(k)
+        if i != -1:
+            self.table[h][i] = e
+            return False
+        self._append(h, k, e)
+        return True
+
+    def _append(self, h: int, k, e: T) -> None:
+        if self.table[h] is None:
+            self.table[h] = [e]
+            if self.key is not None:
+                self.keys[h] = [k]
+        else:
+            self.table[h].append(e)
+            if self.key is not None:
+                self.keys[h].append(k)
+        self.size += 1
+
+    def insert_many(self, A: Iterable[T], unique: bool = False) -> int:
+        """
+        Inserts many elements.
+
+        Args:
+            A: Elements to insert
+            unique: True if A is known to have no repeated keys and none of
+                them is already in the table; skips the duplicate check
+
+        Returns:
+            Number of elements inserted
+        """
+        if not unique:
+            return sum(self.insert(e) for e in A)
+        table, keys, key, hash_code = self.table, self.keys, self.key, self.hash_code
+        m = len(table)
+        n = 0
+        for e in A:
+            k = e if key is None else key(e)
+            h = hash_code(k)
+            if not 0 <= h < m:
+                raise ValueError(f"hash_code returned {h}, outside [0, {m - 1}]")
+            if table[h] is None:
+                table[h] = [e]
+                if key is not None:
+                    keys[h] = [k]
+            else:
+                table[h].append(e)
+                if key is not None:
+                    keys[h].append(k)
+            n += 1
+        self.size += n
+        return n
+
+    def search_many(self, A: Iterable[T]) -> list[bool]:
+        """
+        Searches for many elements.
+
+        Args:
+            A: Elements to search for
+
+        Returns:
+            A list with the result of search for each element, in order
+        """
+        return [self._find(e if self.key is None else self.key(e))[1] != -1 for e in A]
+
+    def delete_many(self, A: Iterable[T]) -> int:
+        """
+        Deletes many elements.
+
+        Args:
+            A: Elements to delete
+
+        Returns:
+            Number of elements that were deleted
+        """
+        return sum(self.delete(e) for e in A)
+
     def delete(self, e: T) -> bool:
         """
         Deletes an element from the hash table.
         
         Args:
-            e: Element to delete
+            e: Element to delete (compared by key when the table has one)
             
         Returns:
             True if the element was deleted, False if it wasn't in the table
         """
-        # Compute the hash value
-        h = self.hash_code(e)
-        
-        # Check if the hash exists and the element is in the list
-        if h in self.table and e in self.table[h]:
-            # Remove the element from the list
-            self.table[h].remove(e)
-            
-            # If the list is now empty, remove the hash entry
-            if not self.table[h]:
-                del self.table[h]
-                
-            return True
-        
-        # Element was not in the table
-        return False
+        h, i = self._find(self._key(e))
+        if i == -1:
+            return False
+        # Order inside a bucket does not matter: move the last one into the gap
+        bucket = self.table[h]
+        bucket[i] = bucket[-1]
+        bucket.pop()
+        if self.key is not None:
+            keys = self.keys[h]
+            keys[i] = keys[-1]
+            keys.pop()
+        self.size -= 1
+        return True
 
 
 if __name__ == "__main__":
     with open("Clientes.txt", "r") as f:
-        customers = [
-            Customer(*[e.strip() for e in l.split("\t")]) for l in f.readlines()
-        ]
+        customers = [parse_customer(l) for l in f]
 
     hc = partial(hash_code, m=len(customers))
     ht = HashTable(customers, hc)
@@ -128,4 +303,22 @@ if __name__ == "__main__":
     print(ht.delete(customers[0]))
     # False
     print(ht.insert(customers[0]))
-    # True
\ No newline at end of file
+    # True
+
+    # Same customers keyed by RFC: lookups by RFC and updates in place
+    ht = HashTable(customers, hc, key=lambda c: c.rfc)
+    print(ht.get(customers[0].rfc) == customers[0])
+    # True
+    print(ht.upsert(customers[0]._replace(address="Nueva dirección")))
+    # False
+    print(ht.get(customers[0].rfc).address)
+    # Nueva dirección
+
+    # Streaming load: the file is read in chunks and the table pre-sized
+    ht = HashTable.from_file(
+        "Clientes.txt", parse_customer, hash_code, key=lambda c: c.rfc, unique=True
+    )
+    print(len(ht) == len(customers))
+    # True
+    print(ht.search_many(customers[:3]), ht.delete_many(customers[:3]))
+    # [True, True, True] 3
@@ -1,4 +1,5 @@
-from typing import TypeVar, Callable
+from collections import deque
+from typing import TypeVar, Callable, Iterable, Iterator
 
 T = TypeVar("T")
 
@@ -30,6 +31,34 @@ class BST:  # (Binary Search Tree) -> ABB (Árbol Binario de Búsqueda)
     def __init__(self, root: Node = None) -> None:
         self.root = root
 
+    @classmethod
+    def from_sorted(cls, keys: Iterable[T]) -> "BST":
+        """
+        Builds a perfectly balanced tree from keys in non-decreasing order,
+        in O(n) instead of n inserts of O(h) each. The middle key is the
+        root and each half is built the same way.
+        """
+        keys = list(keys)
+        if any(keys[i] > keys[i + 1] for i in range(len(keys) - 1)):
+            raise ValueError("Keys are not sorted")
+
+        def build(lo: int, hi: int, parent: Node) -> Node:
+            # Subtree with keys[lo:hi]; the depth is only log2(n)
+            if lo >= hi:
+                return None
+            mid = (lo + hi) // 2
+            x = Node(keys[mid], parent)
+            x.left = build(lo, mid, x)
+            x.right = build(mid + 1, hi, x)
+            return x
+
+        return cls(build(0, len(keys), None))
+
+    @classmethod
+    def from_iterable(cls, keys: Iterable[T]) -> "BST":
+        """Sorts keys (O(n log n)) and builds a balanced tree with from_sorted."""
+        return cls.from_sorted(sorted(keys))
+
     def __repr__(self) -> str:
         return str(self.root)
 
@@ -50,24 +79,69 @@ class BST:  # (Binary Search Tree) -> ABB (Árbol Binario de Búsqueda)
             return x.right.key >= x.key and self.__assert_bst_property(x.right)
         return True
 
+    def __iter__(self) -> Iterator[T]:
+        return self.in_order()
+
     def in_order_walk(self) -> list[int]:
-        return self.__in_order_walk(self.root)
+        return list(self.in_order())
 
-    def __in_order_walk(self, x: Node) -> list[int]:
-        if x is None:
-            return []
-        return self.__in_order_walk(x.left) + [x.key] + self.__in_order_walk(x.right)
+    # The traversals are generators with an explicit stack: no recursion
+    # limit on degenerate trees, O(n) time and O(height) extra memory.
+
+    def in_order(self) -> Iterator[T]:
+        stack = []
+        x = self.root
+        while stack or x is not None:
+            while x is not None:
+                stack.append(x)
+                x = x.left
+            x = stack.pop()
+            yield x.key
+            x = x.right
+
+    def pre_order(self) -> Iterator[T]:
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            x = stack.pop()
+            yield x.key
+            if x.right is not None:
+                stack.append(x.right)
+            if x.left is not None:
+                stack.append(x.left)
+
+    def post_order(self) -> Iterator[T]:
+        stack = []
+        x = self.root
+        last = None  # Last node yielded
+        while stack or x is not None:
+            while x is not None:
+                stack.append(x)
+                x = x.left
+            top = stack[-1]
+            if top.right is not None and top.right is not last:
+                x = top.right  # Visit the right subtree first
+            else:
+                last = stack.pop()
+                yield last.key
+
+    def level_order(self) -> Iterator[T]:
+        # BFS: the queue holds at most one level, O(width) memory
+        queue = deque([self.root] if self.root is not None else [])
+        while queue:
+            x = queue.popleft()
+            yield x.key
+            if x.left is not None:
+                queue.append(x.left)
+            if x.right is not None:
+                queue.append(x.right)
 
     def search(self, k: int) -> bool:
         return self.__search(self.root, k) is not None
 
     def __search(self, x: Node, k: int) -> Node:
-        if x is None or x.key == k:
-            return x
-        if k < x.key:
-            return self.__search(x.left, k)
-        else:
-            return self.__search(x.right, k)
+        while x is not None and x.key != k:
+            x = x.left if k < x.key else x.right
+        return x
 
     def minimum(self) -> T:
         return self.__minimum(self.root).key
@@ -125,10 +199,10 @@ class BST:  # (Binary Search Tree) -> ABB (Árbol Binario de Búsqueda)
         x = self.root
         while x is not None:
             y = x
-        if z.key < x.key:
-            x = x.left
-        else:
-            x = x.right
+            if z.key < x.key:
+                x = x.left
+            else:
+                x = x.right
         z.parent = y
         if y is None:
             self.root = z
@@ -187,6 +261,12 @@ if __name__ == "__main__":
     #                 Node(8)
     print(t.in_order_walk())
     # [0, 1, 2, 3, 4, 5, 6, 7, 8, 9]
+    print(list(t.pre_order()))
+    # [9, 5, 1, 0, 3, 2, 4, 6, 7, 8]
+    print(list(t.post_order()))
+    # [0, 2, 4, 3, 1, 8, 7, 6, 5, 9]
+    print(list(t.level_order()))
+    # [9, 5, 1, 6, 0, 3, 7, 2, 4, 8]
     print(t.assert_bst_property())
     # True
     print(t.search(10), t.search(9))
@@ -222,3 +302,18 @@ if __name__ == "__main__":
     #         Node(7)
     #             Node(8)
     #     Node(10)
+
+    t = BST.from_iterable([9, 5, 1, 0, 6, 3, 2, 4, 7, 8])
+    print(t)
+    # Node(5)
+    #     Node(2)
+    #         Node(1)
+    #             Node(0)
+    #         Node(4)
+    #             Node(3)
+    #     Node(8)
+    #         Node(7)
+    #             Node(6)
+    #         Node(9)
+    print(t.assert_bst_property(), t.predecessor(5), t.successor(5))
+    # True 4 6
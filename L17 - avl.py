@@ -1,4 +1,4 @@
-from typing import TypeVar
+from typing import TypeVar, Iterator
 
 T = TypeVar("T")
 
@@ -9,6 +9,8 @@ class Node:
         self.left: Node = left
         self.right: Node = right
         self.key: T = key
+        self.size: int = 1  # Number of nodes in the subtree rooted here
+        self.h: int = 1  # Height of the subtree, kept up to date by the tree
 
     # DFS
     def __repr__(self, level=0):
@@ -25,22 +27,23 @@ class Node:
         return repr_str
 
     def height(self) -> int:
-        if self.left is None and self.right is None:
-            return 1
-        if self.left is None:
-            return self.right.height() + 1
-        if self.right is None:
-            return self.left.height() + 1
-        return max(self.right.height(), self.left.height()) + 1
+        return self.h
 
     def bf(self) -> int:
-        if self.left is None and self.right is None:
-            return 0
-        if self.left is None:
-            return self.right.height()
-        if self.right is None:
-            return -self.left.height()
-        return self.right.height() - self.left.height()
+        return _height(self.right) - _height(self.left)
+
+
+def _size(x: Node) -> int:
+    return x.size if x is not None else 0
+
+
+def _height(x: Node) -> int:
+    return x.h if x is not None else 0
+
+
+def _update_height(x: Node) -> None:
+    lh, rh = _height(x.left), _height(x.right)
+    x.h = (lh if lh > rh else rh) + 1
 
 
 class AVL:
@@ -75,6 +78,9 @@ class AVL:
         return True
 
     def __assert_avl_property(self, x: Node) -> bool:
+        # Also checks the cached heights, which bf() relies on
+        if x.h != max(_height(x.left), _height(x.right)) + 1:
+            return False
         if x.left and x.right:
             return (
                 x.bf() in [-1, 0, 1]
@@ -97,6 +103,54 @@ class AVL:
             )
         return []
 
+    def __len__(self) -> int:
+        return _size(self.root)
+
+    # Order statistics: every node stores the size of its subtree, so these
+    # queries follow a single root-to-leaf path, O(log n).
+
+    def select(self, i: int) -> T:
+        """Returns the i-th smallest key, counting from 0."""
+        if not 0 <= i < len(self):
+            raise IndexError("Index out of range")
+        x = self.root
+        while True:
+            left = _size(x.left)
+            if i < left:
+                x = x.left
+            elif i == left:
+                return x.key
+            else:
+                i -= left + 1
+                x = x.right
+
+    def rank(self, k: T) -> int:
+        """Returns the number of keys smaller than k (the index of k if present)."""
+        return self.__count_below(k, False)
+
+    def count_range(self, lo: T, hi: T) -> int:
+        """Returns the number of keys k with lo <= k <= hi."""
+        if hi < lo:
+            return 0
+        return self.__count_below(hi, True) - self.__count_below(lo, False)
+
+    def __count_below(self, k: T, inclusive: bool) -> int:
+        r = 0
+        x = self.root
+        while x is not None:
+            if x.key < k or (inclusive and x.key == k):
+                r += _size(x.left) + 1
+                x = x.right
+            else:
+                x = x.left
+        return r
+
+    def __update_sizes(self, x: Node) -> None:
+        # Recomputes the sizes from x up to the root after a delete
+        while x is not None:
+            x.size = _size(x.left) + _size(x.right) + 1
+            x = x.parent
+
     def search(self, k: T) -> bool:
         return self.__search(self.root, k) is not None
 
@@ -153,6 +207,87 @@ class AVL:
             y = y.parent
         return y
 
+    # Ordered iteration: the next key is reached through the parent pointers
+    # from the current node (amortized O(1) per step) instead of searching
+    # again from the root. Modifying the tree while iterating is not supported.
+
+    def __iter__(self) -> Iterator[T]:
+        return self.irange()
+
+    def __reversed__(self) -> Iterator[T]:
+        return self.irange(reverse=True)
+
+    def floor(self, k: T) -> T:
+        """Returns the largest key <= k, or None if there is none."""
+        x = self.__floor(k, True)
+        return x.key if x is not None else None
+
+    def ceiling(self, k: T) -> T:
+        """Returns the smallest key >= k, or None if there is none."""
+        x = self.__ceiling(k, True)
+        return x.key if x is not None else None
+
+    def range(self, lo: T = None, hi: T = None) -> list[T]:
+        """Returns the keys k with lo <= k <= hi in order, O(log n + k)."""
+        return list(self.irange(lo, hi))
+
+    def irange(
+        self,
+        lo: T = None,
+        hi: T = None,
+        inclusive: tuple[bool, bool] = (True, True),
+        reverse: bool = False,
+    ) -> Iterator[T]:
+        """
+        Lazily yields the keys between lo and hi, in ascending order or in
+        descending order if reverse is True. A bound of None means no bound,
+        and inclusive says whether each bound is part of the range.
+        """
+        if not reverse:
+            x = self.__first() if lo is None else self.__ceiling(lo, inclusive[0])
+            while x is not None and (
+                hi is None or x.key < hi or (inclusive[1] and x.key == hi)
+            ):
+                yield x.key
+                x = self.__successor(x)
+        else:
+            x = self.__last() if hi is None else self.__floor(hi, inclusive[1])
+            while x is not None and (
+                lo is None or x.key > lo or (inclusive[0] and x.key == lo)
+            ):
+                yield x.key
+                x = self.__predecessor(x)
+
+    def __first(self) -> Node:
+        return self.__minimum(self.root) if self.root is not None else None
+
+    def __last(self) -> Node:
+        return self.__maximum(self.root) if self.root is not None else None
+
+    def __ceiling(self, k: T, inclusive: bool) -> Node:
+        # Lowest node with key >= k (> k if not inclusive)
+        y = None
+        x = self.root
+        while x is not None:
+            if x.key > k or (inclusive and x.key == k):
+                y = x
+                x = x.left
+            else:
+                x = x.right
+        return y
+
+    def __floor(self, k: T, inclusive: bool) -> Node:
+        # Highest node with key <= k (< k if not inclusive)
+        y = None
+        x = self.root
+        while x is not None:
+            if x.key < k or (inclusive and x.key == k):
+                y = x
+                x = x.right
+            else:
+                x = x.left
+        return y
+
     def insert(self, k: T) -> bool:
         if self.search(k):
             return False
@@ -164,6 +299,7 @@ class AVL:
         x = self.root
         while x is not None:
             y = x
+            y.size += 1  # z ends up in this subtree (insert rejects duplicates)
             if z.key < x.key:
                 x = x.left
             else:
@@ -175,7 +311,7 @@ class AVL:
             y.left = z
         else:
             y.right = z
-        self.__balance(z)
+        self.__balance(y)
 
     def delete(self, k: T) -> bool:
         z = self.__search(self.root, k)
@@ -185,6 +321,8 @@ class AVL:
         return False
 
     def __delete(self, z: Node) -> None:
+        # q is the lowest node whose subtree changed: sizes and balance
+        # factors are fixed from there up
         q = z.parent
         if z.left is None:
             self.__transplant(z, z.right)
@@ -193,13 +331,18 @@ class AVL:
         else:
             y = self.__minimum(z.right)
             if y.parent != z:
+                q = y.parent
                 self.__transplant(y, y.right)
                 y.right = z.right
                 y.right.parent = y
+            else:
+                q = y
             self.__transplant(z, y)
             y.left = z.left
             y.left.parent = y
-        self.__balance(z.parent)
+            y.h = z.h  # y takes z's place; the walk from q fixes it if needed
+        self.__update_sizes(q)
+        self.__balance(q)
 
     def __transplant(self, u: Node, v: Node) -> None:
         if u.parent is None:
@@ -227,6 +370,10 @@ class AVL:
             x.parent.right = y
         y.left = x
         x.parent = y
+        y.size = x.size
+        x.size = _size(x.left) + _size(x.right) + 1
+        _update_height(x)
+        _update_height(y)
 
     def __right_rotate(self, y: Node) -> Node:
         if y.left is None:
@@ -244,17 +391,30 @@ class AVL:
             y.parent.left = x
         x.right = y
         y.parent = x
+        x.size = y.size
+        y.size = _size(y.left) + _size(y.right) + 1
+        _update_height(y)
+        _update_height(x)
 
     def __balance(self, y: Node):
+        # Walks up from the lowest node whose subtree changed, updating the
+        # cached heights. Once a subtree (after any rotation) has the same
+        # height as before, nothing above it changes and the walk stops.
         while y is not None:
+            old_height = y.h
+            _update_height(y)
             if y.bf() > 1:  # Inserción a la derecha
                 if y.right.bf() < 0:  # Caso derecho-izquierdo
                     self.__right_rotate(y.right)
                 self.__left_rotate(y)  # Caso izquierdo
+                y = y.parent  # Nueva raíz del subárbol
             elif y.bf() < -1:  # Inserción a la izquierda
                 if y.left.bf() > 0:  # Caso izquierdo-derecho
                     self.__left_rotate(y.left)
                 self.__right_rotate(y)  # Caso derecho
+                y = y.parent
+            if y.h == old_height:
+                return
             y = y.parent
 
 
@@ -311,3 +471,36 @@ if __name__ == "__main__":
     #         Node(k=7, h=2, bf=1)
     #             Node(k=8, h=1, bf=0)
     #         Node(k=10, h=1, bf=0)
+
+    print(len(t), t.select(0), t.select(4), t.rank(7), t.count_range(2, 8))
+    # 10 0 4 6 6
+    print(t.floor(5), t.ceiling(5), t.range(3, 7), list(t.irange(8)))
+    # 4 6 [3, 4, 6, 7] [8, 9, 10]
+    print(list(t.irange(hi=4, inclusive=(True, False), reverse=True)), list(reversed(t))[:3])
+    # [3, 2, 1, 0] [10, 9, 8]
+
+    # Insert throughput and percentile queries while the data changes: with
+    # cached heights both grow with log n (the height), not with n. The last
+    # sizes are also slowed down by cache misses, not only by the height.
+    import random
+    from time import perf_counter
+
+    for n in (1_000, 10_000, 100_000, 1_000_000):
+        t = AVL()
+        keys = random.sample(range(10 * n), n)
+        start = perf_counter()
+        for k in keys:
+            t.insert(k)
+        elapsed = perf_counter() - start
+        print(f"n={n}: {elapsed / n * 1e6:.1f}us per insert, height {t.root.height()}")
+        elapsed = 0
+        for _ in range(1000):
+            t.insert(random.randrange(10 * n))
+            t.delete(t.select(random.randrange(len(t))))
+            start = perf_counter()
+            t.select(len(t) // 2)
+            t.select(len(t) * 99 // 100)
+            t.rank(random.randrange(10 * n))
+            t.count_range(n, 5 * n)
+            elapsed += perf_counter() - start
+        print(f"n={n}: {elapsed / 4000 * 1e6:.1f}us per query")
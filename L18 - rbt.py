@@ -1,6 +1,6 @@
 from enum import Enum
 from typing_extensions import Self
-from typing import TypeVar
+from typing import TypeVar, Iterator
 
 T = TypeVar("T")
 
@@ -19,6 +19,7 @@ class Node:
         self.right: Node = right
         self.key: T = key
         self.color: Color = color
+        self.size: int = 1  # Number of nodes in the subtree rooted here
 
     # DFS
     def __repr__(self, nil: Self, level=0):
@@ -41,9 +42,15 @@ class Node:
         return bh
 
 
+# Hojas nulas. A single sentinel is shared by every tree, so join and split
+# can move whole subtrees from one tree to another without relinking leaves.
+NIL = Node(None, Color.BLACK)
+NIL.size = 0
+
+
 class RBT:  # (Red Black Tree)
     def __init__(self) -> None:
-        self.nil = Node(None, Color.BLACK)  # hojas nulas
+        self.nil = NIL
         self.root = self.nil
 
     def __repr__(self) -> str:
@@ -101,6 +108,54 @@ class RBT:  # (Red Black Tree)
             )
         return []
 
+    def __len__(self) -> int:
+        return self.root.size
+
+    # Order statistics: every node stores the size of its subtree, so these
+    # queries follow a single root-to-leaf path, O(log n).
+
+    def select(self, i: int) -> T:
+        """Returns the i-th smallest key, counting from 0."""
+        if not 0 <= i < len(self):
+            raise IndexError("Index out of range")
+        x = self.root
+        while True:
+            left = x.left.size
+            if i < left:
+                x = x.left
+            elif i == left:
+                return x.key
+            else:
+                i -= left + 1
+                x = x.right
+
+    def rank(self, k: T) -> int:
+        """Returns the number of keys smaller than k (the index of k if present)."""
+        return self.__count_below(k, False)
+
+    def count_range(self, lo: T, hi: T) -> int:
+        """Returns the number of keys k with lo <= k <= hi."""
+        if hi < lo:
+            return 0
+        return self.__count_below(hi, True) - self.__count_below(lo, False)
+
+    def __count_below(self, k: T, inclusive: bool) -> int:
+        r = 0
+        x = self.root
+        while x != self.nil:
+            if x.key < k or (inclusive and x.key == k):
+                r += x.left.size + 1
+                x = x.right
+            else:
+                x = x.left
+        return r
+
+    def __update_sizes(self, x: Node) -> None:
+        # Recomputes the sizes from x up to the root after a delete
+        while x != self.nil:
+            x.size = x.left.size + x.right.size + 1
+            x = x.parent
+
     def search(self, k: T) -> bool:
         return self.__search(self.root, k) != self.nil
 
@@ -157,6 +212,87 @@ class RBT:  # (Red Black Tree)
             y = y.parent
         return y
 
+    # Ordered iteration: the next key is reached through the parent pointers
+    # from the current node (amortized O(1) per step) instead of searching
+    # again from the root. Modifying the tree while iterating is not supported.
+
+    def __iter__(self) -> Iterator[T]:
+        return self.irange()
+
+    def __reversed__(self) -> Iterator[T]:
+        return self.irange(reverse=True)
+
+    def floor(self, k: T) -> T:
+        """Returns the largest key <= k, or None if there is none."""
+        x = self.__floor(k, True)
+        return x.key if x is not self.nil else None
+
+    def ceiling(self, k: T) -> T:
+        """Returns the smallest key >= k, or None if there is none."""
+        x = self.__ceiling(k, True)
+        return x.key if x is not self.nil else None
+
+    def range(self, lo: T = None, hi: T = None) -> list[T]:
+        """Returns the keys k with lo <= k <= hi in order, O(log n + k)."""
+        return list(self.irange(lo, hi))
+
+    def irange(
+        self,
+        lo: T = None,
+        hi: T = None,
+        inclusive: tuple[bool, bool] = (True, True),
+        reverse: bool = False,
+    ) -> Iterator[T]:
+        """
+        Lazily yields the keys between lo and hi, in ascending order or in
+        descending order if reverse is True. A bound of None means no bound,
+        and inclusive says whether each bound is part of the range.
+        """
+        if not reverse:
+            x = self.__first() if lo is None else self.__ceiling(lo, inclusive[0])
+            while x is not self.nil and (
+                hi is None or x.key < hi or (inclusive[1] and x.key == hi)
+            ):
+                yield x.key
+                x = self.__successor(x)
+        else:
+            x = self.__last() if hi is None else self.__floor(hi, inclusive[1])
+            while x is not self.nil and (
+                lo is None or x.key > lo or (inclusive[0] and x.key == lo)
+            ):
+                yield x.key
+                x = self.__predecessor(x)
+
+    def __first(self) -> Node:
+        return self.__minimum(self.root) if self.root is not self.nil else self.nil
+
+    def __last(self) -> Node:
+        return self.__maximum(self.root) if self.root is not self.nil else self.nil
+
+    def __ceiling(self, k: T, inclusive: bool) -> Node:
+        # Lowest node with key >= k (> k if not inclusive)
+        y = self.nil
+        x = self.root
+        while x is not self.nil:
+            if x.key > k or (inclusive and x.key == k):
+                y = x
+                x = x.left
+            else:
+                x = x.right
+        return y
+
+    def __floor(self, k: T, inclusive: bool) -> Node:
+        # Highest node with key <= k (< k if not inclusive)
+        y = self.nil
+        x = self.root
+        while x is not self.nil:
+            if x.key < k or (inclusive and x.key == k):
+                y = x
+                x = x.right
+            else:
+                x = x.left
+        return y
+
     def insert(self, k: T) -> bool:
         if self.search(k):
             return False
@@ -171,6 +307,7 @@ class RBT:  # (Red Black Tree)
         # Find the position to insert the new node
         while x != self.nil:
             y = x
+            y.size += 1  # z ends up in this subtree (insert rejects duplicates)
             if z.key < x.key:
                 x = x.left
             else:
@@ -197,7 +334,7 @@ class RBT:  # (Red Black Tree)
         # Fix the RB tree properties that might have been violated
         self.__insert_fixup(z)
 
-    def __insert_fixup(self, z: Node):
+    def __insert_fixup(self, z: Node) -> bool:
         while z.parent.color == Color.RED:
             if z.parent == z.parent.parent.left:  # z's parent is a left child
                 y = z.parent.parent.right  # y is z's uncle
@@ -235,7 +372,10 @@ class RBT:  # (Red Black Tree)
                     z.parent.color = Color.BLACK
                     z.parent.parent.color = Color.RED
                     self.__left_rotate(z.parent.parent)
+        # Case 1 may have reached the root: the black height grows by one
+        grew = self.root.color == Color.RED
         self.root.color = Color.BLACK
+        return grew
 
     def delete(self, k: T) -> bool:
         z = self.__search(self.root, k)
@@ -270,7 +410,11 @@ class RBT:  # (Red Black Tree)
             y.left = z.left
             y.left.parent = y
             y.color = z.color
-            
+
+        # Every subtree that lost a node is on the path from x up to the
+        # root (x.parent is set even when x is nil)
+        self.__update_sizes(x.parent)
+
         if y_original_color == Color.BLACK:
             self.__delete_fixup(x)
         del z
@@ -368,6 +512,10 @@ class RBT:  # (Red Black Tree)
         # Put x on y's left
         y.left = x
         x.parent = y
+
+        # y takes x's place, x keeps its left subtree and y's old left one
+        y.size = x.size
+        x.size = x.left.size + x.right.size + 1
         
         return y
 
@@ -394,9 +542,200 @@ class RBT:  # (Red Black Tree)
         # Put y on x's right
         x.right = y
         y.parent = x
+
+        x.size = y.size
+        y.size = y.left.size + y.right.size + 1
         
         return x
 
+    # Bulk operations, join-based (Blelloch, Ferizovic and Sun, "Just Join
+    # for Parallel Ordered Sets"). join is the only operation that rebalances;
+    # split, union, intersection and difference are written on top of it.
+    # union/intersection/difference of trees with m <= n keys take
+    # O(m log(n/m + 1)) instead of the O(m log n) of m single operations.
+    # They move the nodes of their operands into the result, so the operands
+    # are left empty.
+
+    @classmethod
+    def join(cls, t1: "RBT", k: T, t2: "RBT") -> "RBT":
+        """
+        Returns a tree with the keys of t1, k and the keys of t2, in
+        O(log n). Every key of t1 must be smaller than k and every key of t2
+        greater than k.
+        """
+        if (t1.root != t1.nil and not t1.maximum() < k) or (
+            t2.root != t2.nil and not k < t2.minimum()
+        ):
+            raise ValueError("Keys are not ordered: t1 < k < t2")
+        t = cls()
+        root, _ = t.__join(*t1.__tree(), Node(k), *t2.__tree())
+        t.__set_root(root)
+        t1.root = t2.root = t1.nil
+        return t
+
+    def split(self, k: T) -> tuple["RBT", bool, "RBT"]:
+        """
+        Splits the tree into the keys smaller than k and the keys greater
+        than k, in O(log n). Returns (smaller, k was in the tree, greater).
+        """
+        a, _, b, _, found = self.__split(*self.__tree(), k)
+        self.root = self.nil
+        return self.__wrap(a), found != self.nil, self.__wrap(b)
+
+    def union(self, other: "RBT") -> "RBT":
+        """Returns a tree with the keys of both trees."""
+        root, _ = self.__union(*self.__tree(), *other.__tree())
+        self.root = other.root = self.nil
+        return self.__wrap(root)
+
+    def intersection(self, other: "RBT") -> "RBT":
+        """Returns a tree with the keys that are in both trees."""
+        root, _ = self.__intersection(*self.__tree(), *other.__tree())
+        self.root = other.root = self.nil
+        return self.__wrap(root)
+
+    def difference(self, other: "RBT") -> "RBT":
+        """Returns a tree with the keys of this tree that are not in other."""
+        root, _ = self.__difference(*self.__tree(), *other.__tree())
+        self.root = other.root = self.nil
+        return self.__wrap(root)
+
+    # The helpers work on (subtree root, black height) pairs. The black
+    # height counts the black nodes on any path from the root down to the
+    # leaves, nil excluded; it is passed along instead of being recomputed,
+    # so that a join costs O(difference of black heights) and not O(log n).
+
+    def __tree(self) -> tuple[Node, int]:
+        h = 0
+        x = self.root
+        while x != self.nil:
+            if x.color == Color.BLACK:
+                h += 1
+            x = x.left
+        return self.root, h
+
+    def __wrap(self, root: Node) -> "RBT":
+        t = type(self)()
+        t.__set_root(root)
+        return t
+
+    def __set_root(self, root: Node) -> None:
+        # Subtrees taken from another tree may have a red root
+        root.parent = self.nil
+        root.color = Color.BLACK
+        self.root = root
+
+    def __join(self, a: Node, ha: int, z: Node, b: Node, hb: int) -> tuple[Node, int]:
+        # Links the subtrees a and b (keys of a < z.key < keys of b) with
+        # the detached node z. self only provides the root that the
+        # rotations of the fixup update.
+        a.parent = b.parent = self.nil
+        if a.color == Color.RED:  # A red root can always be made black
+            a.color = Color.BLACK
+            ha += 1
+        if b.color == Color.RED:
+            b.color = Color.BLACK
+            hb += 1
+        if ha == hb:
+            z.left, z.right = a, b
+            a.parent = b.parent = z
+            z.size = a.size + b.size + 1
+            z.parent = self.nil
+            z.color = Color.BLACK
+            return z, ha + 1
+
+        # z (red) hangs from the side of the taller tree that faces the
+        # shorter one, above a black node with the same black height as the
+        # shorter tree, so the black property holds and only a red-red
+        # violation with z's parent needs fixing
+        if ha > hb:
+            self.root, h, low, added = a, ha, hb, b.size + 1
+        else:
+            self.root, h, low, added = b, hb, ha, a.size + 1
+        p = self.nil
+        x = self.root
+        while not (x.color == Color.BLACK and h == low):
+            if x.color == Color.BLACK:
+                h -= 1
+            x.size += added
+            p = x
+            x = x.right if ha > hb else x.left
+        if ha > hb:
+            z.left, z.right = x, b
+            p.right = z
+        else:
+            z.left, z.right = a, x
+            p.left = z
+        z.parent = p
+        z.left.parent = z.right.parent = z
+        z.size = z.left.size + z.right.size + 1
+        z.color = Color.RED
+        grew = self.__insert_fixup(z)
+        return self.root, max(ha, hb) + grew
+
+    def __join2(self, a: Node, ha: int, b: Node, hb: int) -> tuple[Node, int]:
+        # join without a middle key: the maximum of a takes that role
+        if a == self.nil:
+            return b, hb
+        a, ha, m = self.__split_last(a, ha)
+        return self.__join(a, ha, m, b, hb)
+
+    def __split_last(self, x: Node, h: int) -> tuple[Node, int, Node]:
+        # Returns x without its maximum and the maximum node
+        hc = h - (x.color == Color.BLACK)
+        if x.right == self.nil:
+            return x.left, hc, x
+        a, ha, m = self.__split_last(x.right, hc)
+        return (*self.__join(x.left, hc, x, a, ha), m)
+
+    def __split(self, x: Node, h: int, k: T) -> tuple[Node, int, Node, int, Node]:
+        # Returns the keys < k, the keys > k and the node with k (or nil).
+        # The nodes on the search path are reused as the joins' middle keys.
+        if x == self.nil:
+            return self.nil, 0, self.nil, 0, self.nil
+        hc = h - (x.color == Color.BLACK)
+        left, right = x.left, x.right
+        if k < x.key:
+            a, ha, b, hb, found = self.__split(left, hc, k)
+            return (a, ha, *self.__join(b, hb, x, right, hc), found)
+        if x.key < k:
+            a, ha, b, hb, found = self.__split(right, hc, k)
+            return (*self.__join(left, hc, x, a, ha), b, hb, found)
+        return left, hc, right, hc, x
+
+    def __union(self, a: Node, ha: int, b: Node, hb: int) -> tuple[Node, int]:
+        if a == self.nil:
+            return b, hb
+        if b == self.nil:
+            return a, ha
+        hc = ha - (a.color == Color.BLACK)
+        left, right = a.left, a.right
+        bl, hbl, br, hbr, _ = self.__split(b, hb, a.key)
+        left, hl = self.__union(left, hc, bl, hbl)
+        right, hr = self.__union(right, hc, br, hbr)
+        return self.__join(left, hl, a, right, hr)
+
+    def __intersection(self, a: Node, ha: int, b: Node, hb: int) -> tuple[Node, int]:
+        if a == self.nil or b == self.nil:
+            return self.nil, 0
+        hc = ha - (a.color == Color.BLACK)
+        left, right = a.left, a.right
+        bl, hbl, br, hbr, found = self.__split(b, hb, a.key)
+        left, hl = self.__intersection(left, hc, bl, hbl)
+        right, hr = self.__intersection(right, hc, br, hbr)
+        if found != self.nil:
+            return self.__join(left, hl, a, right, hr)
+        return self.__join2(left, hl, right, hr)
+
+    def __difference(self, a: Node, ha: int, b: Node, hb: int) -> tuple[Node, int]:
+        if a == self.nil or b == self.nil:
+            return a, ha
+        hc = hb - (b.color == Color.BLACK)
+        left, right = b.left, b.right
+        al, hal, ar, har, _ = self.__split(a, ha, b.key)
+        left, hl = self.__difference(al, hal, left, hc)
+        right, hr = self.__difference(ar, har, right, hc)
+        return self.__join2(left, hl, right, hr)
 
 if __name__ == "__main__":
 
@@ -450,4 +789,85 @@ if __name__ == "__main__":
     #     Node(k=9, c=Color.RED, bh=2)
     #         Node(k=7, c=Color.BLACK, bh=2)
     #             Node(k=8, c=Color.RED, bh=1)
-    #         Node(k=10, c=Color.BLACK, bh=2)
\ No newline at end of file
+    #         Node(k=10, c=Color.BLACK, bh=2)
+
+    print(len(t), t.select(0), t.select(4), t.rank(7), t.count_range(2, 8))
+    # 10 0 4 6 6
+    print(t.floor(5), t.ceiling(5), t.range(3, 7), list(t.irange(8)))
+    # 4 6 [3, 4, 6, 7] [8, 9, 10]
+    print(list(t.irange(hi=4, inclusive=(True, False), reverse=True)), list(reversed(t))[:3])
+    # [3, 2, 1, 0] [10, 9, 8]
+
+    # split, join and the set operations move the nodes of their operands
+    # into the result, the operands are left empty
+    a, found, b = t.split(6)
+    print(a.in_order_walk(), found, b.in_order_walk(), t.in_order_walk())
+    # [0, 1, 2, 3, 4] True [7, 8, 9, 10] []
+    t = RBT.join(a, 5, b)
+    print(t.in_order_walk(), t.assert_rbt_property(), len(t))
+    # [0, 1, 2, 3, 4, 5, 7, 8, 9, 10] True 10
+
+    def rbt(keys) -> RBT:
+        t = RBT()
+        for k in keys:
+            t.insert(k)
+        return t
+
+    evens, small = [0, 2, 4, 6, 8, 10], [0, 1, 2, 3, 4, 5]
+    print(rbt(evens).union(rbt(small)).in_order_walk())
+    # [0, 1, 2, 3, 4, 5, 6, 8, 10]
+    print(rbt(evens).intersection(rbt(small)).in_order_walk())
+    # [0, 2, 4]
+    print(rbt(evens).difference(rbt(small)).in_order_walk())
+    # [6, 8, 10]
+
+    # Percentile queries while the data changes: the time per query grows
+    # with log n, not with n
+    import random
+    from time import perf_counter
+
+    for n in (1_000, 10_000, 100_000):
+        t = RBT()
+        for k in random.sample(range(10 * n), n):
+            t.insert(k)
+        elapsed = 0
+        for _ in range(1000):
+            t.insert(random.randrange(10 * n))
+            t.delete(t.select(random.randrange(len(t))))
+            start = perf_counter()
+            t.select(len(t) // 2)
+            t.select(len(t) * 99 // 100)
+            t.rank(random.randrange(10 * n))
+            t.count_range(n, 5 * n)
+            elapsed += perf_counter() - start
+        print(f"n={n}: {elapsed / 4000 * 1e6:.1f}us per query")
+
+        # Scanning 100 keys: irange walks the parent pointers, calling
+        # successor() re-searches the tree from the root on every step
+        lo = t.select(len(t) // 2)
+        start = perf_counter()
+        for _ in range(100):
+            for i, k in enumerate(t.irange(lo)):
+                if i == 99:
+                    break
+        walk = perf_counter() - start
+        start = perf_counter()
+        for _ in range(100):
+            k = lo
+            for _ in range(99):
+                k = t.successor(k)
+        restart = perf_counter() - start
+        print(f"n={n}: 100 keys with irange {walk * 1e4:.1f}us, with successor {restart * 1e4:.1f}us")
+
+    # Merging two trees of n keys: union against n single inserts
+    for n in (100_000, 1_000_000):
+        keys = random.sample(range(4 * n), 2 * n)
+        t1, t2, t3 = rbt(keys[:n]), rbt(keys[n:]), rbt(keys[:n])
+        start = perf_counter()
+        t = t1.union(t2)
+        merge = perf_counter() - start
+        start = perf_counter()
+        for k in keys[n:]:
+            t3.insert(k)
+        inserts = perf_counter() - start
+        print(f"n={n}: union {merge:.2f}s, {n} inserts {inserts:.2f}s")
@@ -0,0 +1,440 @@
+from bisect import bisect_left, bisect_right
+from typing import Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+# A B+-tree keeps up to `order` keys per node in a Python list, so a search
+# makes log_order(n) hops between objects and does the rest with bisect (in
+# C) instead of one hop per key comparison as in the BST, AVL and RBT. All
+# the keys are in the leaves, which are linked in order: a range scan finds
+# its first leaf and then only follows the links.
+
+
+class _Leaf:
+    __slots__ = ("keys", "prev", "next")
+
+    def __init__(self, keys: list) -> None:
+        self.keys: list = keys
+        self.prev: _Leaf = None
+        self.next: _Leaf = None
+
+
+class _Internal:
+    __slots__ = ("keys", "children")
+
+    def __init__(self, keys: list, children: list) -> None:
+        # children[i] holds the keys k with keys[i - 1] <= k < keys[i]
+        self.keys: list = keys
+        self.children: list = children
+
+
+class BPlusTree:
+    """
+    B+-tree over unique keys, with the same API as the AVL and RBT trees.
+
+    Parameters
+    ----------
+    order: int
+        Fanout: maximum number of children of an internal node and of keys
+        in a leaf. Every node but the root is at least half full.
+    """
+
+    def __init__(self, order: int = 64) -> None:
+        if order < 3:
+            raise ValueError("order must be at least 3")
+        self.order = order
+        self.root = _Leaf([])
+        self.n = 0
+
+    @classmethod
+    def from_sorted(cls, keys: Iterable[T], order: int = 64, fill: float = 1.0) -> "BPlusTree":
+        """
+        Bulk loads strictly increasing keys in O(n), level by level, instead
+        of n inserts of O(log n) each.
+
+        Parameters
+        ----------
+        keys: Iterable[T]
+            Keys in strictly increasing order.
+        order: int
+            Fanout of the tree.
+        fill: float
+            Fraction of each node to fill, in (0, 1]. Leaving room (for
+            example 0.7) avoids splits on the first inserts after the load.
+        """
+        keys = list(keys)
+        if any(not keys[i] < keys[i + 1] for i in range(len(keys) - 1)):
+            raise ValueError("Keys are not sorted")
+        if not 0 < fill <= 1:
+            raise ValueError("fill must be in (0, 1]")
+        t = cls(order)
+        if not keys:
+            return t
+        t.n = len(keys)
+
+        leaves = [_Leaf(chunk) for chunk in t.__chunks(keys, order // 2, fill)]
+        for a, b in zip(leaves, leaves[1:]):
+            a.next = b
+            b.prev = a
+        # Each level is a list of (node, smallest key in its subtree)
+        level = [(leaf, leaf.keys[0]) for leaf in leaves]
+        while len(level) > 1:
+            level = [
+                (_Internal([low for _, low in group[1:]], [x for x, _ in group]), group[0][1])
+                for group in t.__chunks(level, (order + 1) // 2, fill)
+            ]
+        t.root = level[0][0]
+        return t
+
+    def __chunks(self, items: list, minimum: int, fill: float) -> list[list]:
+        # Splits items into nodes of about order * fill items, none smaller
+        # than minimum (the root may be)
+        size = max(minimum, min(self.order, int(self.order * fill)), 2)
+        chunks = [items[i : i + size] for i in range(0, len(items), size)]
+        if len(chunks) > 1 and len(chunks[-1]) < minimum:
+            # Joins the last two chunks, or shares them evenly if they do not
+            # fit in one node (then each half has at least minimum items)
+            last = chunks.pop()
+            last = chunks.pop() + last
+            if len(last) <= self.order:
+                chunks.append(last)
+            else:
+                half = len(last) // 2
+                chunks += [last[:half], last[half:]]
+        return chunks
+
+    def __len__(self) -> int:
+        return self.n
+
+    def height(self) -> int:
+        h = 1
+        x = self.root
+        while isinstance(x, _Internal):
+            x = x.children[0]
+            h += 1
+        return h
+
+    def assert_bplus_property(self) -> bool:
+        """Checks the order of the keys, the node sizes, the depth of the leaves and the links."""
+        leaves = []
+        if not self.__assert_node(self.root, None, None, 1, self.height(), leaves):
+            return False
+        keys = [k for leaf in leaves for k in leaf.keys]
+        return (
+            len(keys) == self.n
+            and all(keys[i] < keys[i + 1] for i in range(len(keys) - 1))
+            and all(a.next is b and b.prev is a for a, b in zip(leaves, leaves[1:]))
+            and leaves[0].prev is None
+            and leaves[-1].next is None
+        )
+
+    def __assert_node(self, x, lo, hi, depth: int, height: int, leaves: list) -> bool:
+        # Every key k of the subtree must satisfy lo <= k < hi
+        if any(lo is not None and k < lo or hi is not None and not k < hi for k in x.keys):
+            return False
+        if any(not x.keys[i] < x.keys[i + 1] for i in range(len(x.keys) - 1)):
+            return False
+        if isinstance(x, _Leaf):
+            leaves.append(x)
+            return depth == height and (
+                x is self.root or self.order // 2 <= len(x.keys) <= self.order
+            )
+        if len(x.children) != len(x.keys) + 1 or len(x.children) > self.order:
+            return False
+        if x is not self.root and len(x.children) < (self.order + 1) // 2:
+            return False
+        if x is self.root and len(x.children) < 2:
+            return False
+        bounds = [lo] + x.keys + [hi]
+        return all(
+            self.__assert_node(c, bounds[i], bounds[i + 1], depth + 1, height, leaves)
+            for i, c in enumerate(x.children)
+        )
+
+    def __find_leaf(self, k: T) -> _Leaf:
+        x = self.root
+        while isinstance(x, _Internal):
+            x = x.children[bisect_right(x.keys, k)]
+        return x
+
+    def __first_leaf(self) -> _Leaf:
+        x = self.root
+        while isinstance(x, _Internal):
+            x = x.children[0]
+        return x
+
+    def __last_leaf(self) -> _Leaf:
+        x = self.root
+        while isinstance(x, _Internal):
+            x = x.children[-1]
+        return x
+
+    def search(self, k: T) -> bool:
+        keys = self.__find_leaf(k).keys
+        i = bisect_left(keys, k)
+        return i < len(keys) and keys[i] == k
+
+    def minimum(self) -> T:
+        if self.n == 0:
+            raise ValueError("Empty tree")
+        return self.__first_leaf().keys[0]
+
+    def maximum(self) -> T:
+        if self.n == 0:
+            raise ValueError("Empty tree")
+        return self.__last_leaf().keys[-1]
+
+    def successor(self, k: T) -> T:
+        leaf = self.__find_leaf(k)
+        i = bisect_left(leaf.keys, k)
+        if i == len(leaf.keys) or leaf.keys[i] != k:
+            raise ValueError("Key not found")
+        if i + 1 < len(leaf.keys):
+            return leaf.keys[i + 1]
+        return leaf.next.keys[0] if leaf.next is not None else None
+
+    def predecessor(self, k: T) -> T:
+        leaf = self.__find_leaf(k)
+        i = bisect_left(leaf.keys, k)
+        if i == len(leaf.keys) or leaf.keys[i] != k:
+            raise ValueError("Key not found")
+        if i > 0:
+            return leaf.keys[i - 1]
+        return leaf.prev.keys[-1] if leaf.prev is not None else None
+
+    # Ordered iteration and range scans follow the leaf links
+
+    def __iter__(self) -> Iterator[T]:
+        return self.irange()
+
+    def __reversed__(self) -> Iterator[T]:
+        return self.irange(reverse=True)
+
+    def range(self, lo: T = None, hi: T = None) -> list[T]:
+        """Returns the keys k with lo <= k <= hi in order, O(log n + k)."""
+        return list(self.irange(lo, hi))
+
+    def irange(
+        self,
+        lo: T = None,
+        hi: T = None,
+        inclusive: tuple[bool, bool] = (True, True),
+        reverse: bool = False,
+    ) -> Iterator[T]:
+        """
+        Lazily yields the keys between lo and hi, in ascending order or in
+        descending order if reverse is True. A bound of None means no bound,
+        and inclusive says whether each bound is part of the range.
+        """
+        if not reverse:
+            if lo is None:
+                leaf, i = self.__first_leaf(), 0
+            else:
+                leaf = self.__find_leaf(lo)
+                i = (bisect_left if inclusive[0] else bisect_right)(leaf.keys, lo)
+            while leaf is not None:
+                keys = leaf.keys
+                if hi is not None and i < len(keys) and not keys[-1] < hi:
+                    # Last leaf of the range
+                    j = (bisect_right if inclusive[1] else bisect_left)(keys, hi, i)
+                    yield from keys[i:j]
+                    return
+                yield from keys[i:]
+                leaf, i = leaf.next, 0
+        else:
+            if hi is None:
+                leaf = self.__last_leaf()
+                j = len(leaf.keys)
+            else:
+                leaf = self.__find_leaf(hi)
+                j = (bisect_right if inclusive[1] else bisect_left)(leaf.keys, hi)
+            while leaf is not None:
+                keys = leaf.keys
+                if lo is not None and j > 0 and not lo < keys[0]:
+                    i = (bisect_left if inclusive[0] else bisect_right)(keys, lo, 0, j)
+                    yield from reversed(keys[i:j])
+                    return
+                yield from reversed(keys[:j])
+                leaf = leaf.prev
+                j = len(leaf.keys) if leaf is not None else 0
+
+    def insert(self, k: T) -> bool:
+        path = []  # (internal node, index of the child taken)
+        x = self.root
+        while isinstance(x, _Internal):
+            i = bisect_right(x.keys, k)
+            path.append((x, i))
+            x = x.children[i]
+        keys = x.keys
+        i = bisect_left(keys, k)
+        if i < len(keys) and keys[i] == k:
+            return False
+        keys.insert(i, k)
+        self.n += 1
+        if len(keys) > self.order:
+            self.__split(x, path)
+        return True
+
+    def __split(self, x, path: list) -> None:
+        # Splits the overfull node x in two and inserts the separator in the
+        # parent, which may split in turn
+        while True:
+            mid = len(x.keys) // 2
+            if isinstance(x, _Leaf):
+                right = _Leaf(x.keys[mid:])
+                del x.keys[mid:]
+                right.prev, right.next = x, x.next
+                if x.next is not None:
+                    x.next.prev = right
+                x.next = right
+                separator = right.keys[0]
+            else:
+                # The middle key moves up instead of being copied
+                separator = x.keys[mid]
+                right = _Internal(x.keys[mid + 1 :], x.children[mid + 1 :])
+                del x.keys[mid:]
+                del x.children[mid + 1 :]
+            if not path:
+                self.root = _Internal([separator], [x, right])
+                return
+            parent, i = path.pop()
+            parent.keys.insert(i, separator)
+            parent.children.insert(i + 1, right)
+            if len(parent.children) <= self.order:
+                return
+            x = parent
+
+    def delete(self, k: T) -> bool:
+        path = []
+        x = self.root
+        while isinstance(x, _Internal):
+            i = bisect_right(x.keys, k)
+            path.append((x, i))
+            x = x.children[i]
+        keys = x.keys
+        i = bisect_left(keys, k)
+        if i == len(keys) or keys[i] != k:
+            return False
+        del keys[i]
+        self.n -= 1
+        # The separators above may still be k; they remain valid bounds
+        self.__fix_underflow(x, path)
+        return True
+
+    def __fix_underflow(self, x, path: list) -> None:
+        # Refills the node x (which may have lost one entry) by borrowing
+        # from a sibling, or merges it with one and repeats on the parent
+        while path:
+            leaf = isinstance(x, _Leaf)
+            if leaf and len(x.keys) >= self.order // 2:
+                return
+            if not leaf and len(x.children) >= (self.order + 1) // 2:
+                return
+            parent, i = path.pop()
+            left = parent.children[i - 1] if i > 0 else None
+            right = parent.children[i + 1] if i + 1 < len(parent.children) else None
+            if leaf:
+                minimum = self.order // 2
+                if left is not None and len(left.keys) > minimum:
+                    x.keys.insert(0, left.keys.pop())
+                    parent.keys[i - 1] = x.keys[0]
+                    return
+                if right is not None and len(right.keys) > minimum:
+                    x.keys.append(right.keys.pop(0))
+                    parent.keys[i] = right.keys[0]
+                    return
+                if left is not None:
+                    left, x, i = left, x, i - 1
+                else:
+                    left, x = x, right
+                # Merge x into left; parent.keys[i] separated them
+                left.keys += x.keys
+                left.next = x.next
+                if x.next is not None:
+                    x.next.prev = left
+            else:
+                minimum = (self.order + 1) // 2
+                if left is not None and len(left.children) > minimum:
+                    x.keys.insert(0, parent.keys[i - 1])
+                    x.children.insert(0, left.children.pop())
+                    parent.keys[i - 1] = left.keys.pop()
+                    return
+                if right is not None and len(right.children) > minimum:
+                    x.keys.append(parent.keys[i])
+                    x.children.append(right.children.pop(0))
+                    parent.keys[i] = right.keys.pop(0)
+                    return
+                if left is not None:
+                    left, x, i = left, x, i - 1
+                else:
+                    left, x = x, right
+                left.keys += [parent.keys[i]] + x.keys
+                left.children += x.children
+            del parent.keys[i]
+            del parent.children[i + 1]
+            x = parent
+        if isinstance(self.root, _Internal) and len(self.root.children) == 1:
+            self.root = self.root.children[0]
+
+
+if __name__ == "__main__":
+    import random
+    from importlib import import_module
+    from time import perf_counter
+
+    t = BPlusTree(order=4)
+    for i in [9, 5, 1, 0, 6, 3, 2, 4, 7, 8]:
+        t.insert(i)
+    print(list(t), len(t), t.height(), t.assert_bplus_property())
+    # [0, 1, 2, 3, 4, 5, 6, 7, 8, 9] 10 2 True
+    print(t.search(10), t.search(9), t.minimum(), t.maximum())
+    # False True 0 9
+    print(t.predecessor(5), t.successor(5), t.insert(5), t.insert(10))
+    # 4 6 False True
+    print(t.delete(5), t.delete(5), t.range(3, 7), list(t.irange(8, reverse=True)))
+    # True False [3, 4, 6, 7] [10, 9, 8]
+    t = BPlusTree.from_sorted(range(100), order=8, fill=0.75)
+    print(len(t), t.height(), t.assert_bplus_property(), t.range(40, 45))
+    # 100 3 True [40, 41, 42, 43, 44, 45]
+
+    AVL = import_module("L17 - avl").AVL
+    RBT = import_module("L18 - rbt").RBT
+
+    # Random inserts, searches and 100-key range scans. The binary trees
+    # are only run at 10^6 keys: at 10^7 they need several GB of nodes.
+    for n in (1_000_000, 10_000_000):
+        keys = random.sample(range(10 * n), n)
+        probes = random.sample(keys, 100_000)
+        for name, make in (
+            ("AVL", AVL),
+            ("RBT", RBT),
+            ("B+ 16", lambda: BPlusTree(16)),
+            ("B+ 64", lambda: BPlusTree(64)),
+            ("B+ 256", lambda: BPlusTree(256)),
+        ):
+            if n > 1_000_000 and not name.startswith("B+"):
+                continue
+            t = make()
+            start = perf_counter()
+            for k in keys:
+                t.insert(k)
+            inserts = perf_counter() - start
+            start = perf_counter()
+            for k in probes:
+                t.search(k)
+            searches = perf_counter() - start
+            start = perf_counter()
+            for k in probes[:1000]:
+                for i, _ in enumerate(t.irange(k)):
+                    if i == 99:
+                        break
+            scans = perf_counter() - start
+            print(
+                f"n={n} {name:>6}: {inserts / n * 1e6:.2f}us per insert, "
+                f"{searches / len(probes) * 1e6:.2f}us per search, "
+                f"{scans / 1000 * 1e6:.1f}us per 100-key scan"
+            )
+            del t
+        start = perf_counter()
+        t = BPlusTree.from_sorted(sorted(keys))
+        print(f"n={n} from_sorted: {perf_counter() - start:.2f}s (sort included)")
@@ -0,0 +1,518 @@
+from abc import ABC, abstractmethod
+from enum import Enum
+from functools import partial, wraps
+from importlib import import_module
+from time import monotonic
+from typing import Callable, TypeVar
+
+from hash_functions import builtin_hash
+
+T = TypeVar("T")
+
+HashTable = import_module("L13 - hash_table").HashTable
+
+# Every cache keeps its entries in an L13 HashTable keyed by entry.key, with
+# a fixed number of buckets (the capacity bounds the number of entries), and
+# orders them with doubly linked lists, so get and put are O(1).
+
+
+class _Entry:
+    __slots__ = ("key", "value", "expires", "prev", "next", "owner")
+
+    def __init__(self, key, value=None, expires=None) -> None:
+        self.key = key
+        self.value = value
+        self.expires = expires  # Time after which the value is stale, or None
+        self.prev: _Entry = None
+        self.next: _Entry = None
+        self.owner = None  # List (or frequency node) holding the entry
+
+
+class _LinkedList:
+    """Circular doubly linked list with a sentinel. The front is the most recent."""
+
+    def __init__(self) -> None:
+        self._head = _Entry(None)
+        self._head.prev = self._head.next = self._head
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def push_front(self, e: _Entry) -> None:
+        e.prev, e.next = self._head, self._head.next
+        self._head.next.prev = e
+        self._head.next = e
+        e.owner = self
+        self.size += 1
+
+    def remove(self, e: _Entry) -> _Entry:
+        e.prev.next = e.next
+        e.next.prev = e.prev
+        e.prev = e.next = e.owner = None
+        self.size -= 1
+        return e
+
+    def back(self) -> _Entry:
+        return self._head.prev if self.size else None
+
+    def pop_back(self) -> _Entry:
+        return self.remove(self._head.prev)
+
+
+class Cache(ABC):
+    """
+    Base of the caches: hash index, TTL and counters. Subclasses decide
+    the order of the entries and which one to evict.
+
+    Parameters
+    ----------
+    capacity: int
+        Maximum number of values kept.
+    ttl: float
+        Seconds a value stays valid. None keeps values until they are evicted.
+    clock: Callable
+        Function returning the current time in seconds.
+    """
+
+    def __init__(self, capacity: int, ttl: float = None, clock: Callable = monotonic) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = self.misses = self.evictions = self.expirations = 0
+        self._index = self._new_index(capacity)
+
+    @staticmethod
+    def _new_index(m: int) -> HashTable:
+        return HashTable([], partial(builtin_hash, m=m), key=lambda e: e.key)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.stats()})"
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key) -> bool:
+        e = self._index.get(key)
+        return e is not None and not self._expired(e)
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def _expires(self, ttl: float):
+        ttl = self.ttl if ttl is None else ttl
+        return None if ttl is None else self.clock() + ttl
+
+    def _expired(self, e: _Entry) -> bool:
+        return e.expires is not None and self.clock() >= e.expires
+
+    def get(self, key, default=None):
+        """
+        Returns the value stored for key, or default if it is not in the
+        cache or has expired.
+        """
+        e = self._index.get(key)
+        if e is None:
+            self.misses += 1
+            return default
+        if self._expired(e):
+            self._discard(e)
+            self.expirations += 1
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._touch(e)
+        return e.value
+
+    def put(self, key, value, ttl: float = None) -> None:
+        """
+        Stores value for key, evicting an entry if the cache is full.
+
+        Parameters
+        ----------
+        ttl: float
+            Seconds this value stays valid. Defaults to the ttl of the cache.
+        """
+        e = self._index.get(key)
+        if e is not None:
+            e.value = value
+            e.expires = self._expires(ttl)
+            self._touch(e)
+            return
+        if len(self) >= self.capacity:
+            self._evict()
+            self.evictions += 1
+        e = _Entry(key, value, self._expires(ttl))
+        self._index.insert(e)
+        self._add(e)
+
+    def delete(self, key) -> bool:
+        e = self._index.get(key)
+        if e is None:
+            return False
+        self._discard(e)
+        return True
+
+    def clear(self) -> None:
+        self.__init__(self.capacity, self.ttl, self.clock)
+
+    def _discard(self, e: _Entry) -> None:
+        self._unlink(e)
+        self._index.delete(e)
+
+    # Order of the entries, implemented by each policy
+
+    @abstractmethod
+    def _add(self, e: _Entry) -> None:
+        pass
+
+    @abstractmethod
+    def _touch(self, e: _Entry) -> None:
+        pass
+
+    @abstractmethod
+    def _unlink(self, e: _Entry) -> None:
+        pass
+
+    @abstractmethod
+    def _evict(self) -> None:
+        pass
+
+
+class LRUCache(Cache):
+    """Evicts the least recently used entry."""
+
+    def __init__(self, capacity: int, ttl: float = None, clock: Callable = monotonic) -> None:
+        super().__init__(capacity, ttl, clock)
+        self._order = _LinkedList()
+
+    def _add(self, e: _Entry) -> None:
+        self._order.push_front(e)
+
+    def _touch(self, e: _Entry) -> None:
+        self._order.remove(e)
+        self._order.push_front(e)
+
+    def _unlink(self, e: _Entry) -> None:
+        self._order.remove(e)
+
+    def _evict(self) -> None:
+        self._index.delete(self._order.pop_back())
+
+
+class _Frequency(_LinkedList):
+    # Entries used exactly `count` times, itself a node in the list of
+    # frequencies (ordered from the lowest count)
+    def __init__(self, count: int) -> None:
+        super().__init__()
+        self.count = count
+        self.lower: _Frequency = None
+        self.higher: _Frequency = None
+
+
+class LFUCache(Cache):
+    """
+    Evicts the least frequently used entry, and among those the least
+    recently used. O(1) LFU: the entries with the same use count share a
+    list, and the lists form a linked list ordered by count, so a use moves
+    an entry to the next list and the victim is at the back of the first.
+    """
+
+    def __init__(self, capacity: int, ttl: float = None, clock: Callable = monotonic) -> None:
+        super().__init__(capacity, ttl, clock)
+        self._lowest: _Frequency = None
+
+    def _frequency_after(self, node: _Frequency, count: int) -> _Frequency:
+        # The list for count right after node (None: at the start), created if needed
+        following = self._lowest if node is None else node.higher
+        if following is not None and following.count == count:
+            return following
+        new = _Frequency(count)
+        new.lower, new.higher = node, following
+        if following is not None:
+            following.lower = new
+        if node is None:
+            self._lowest = new
+        else:
+            node.higher = new
+        return new
+
+    def _drop_if_empty(self, node: _Frequency) -> None:
+        if len(node):
+            return
+        if node.lower is None:
+            self._lowest = node.higher
+        else:
+            node.lower.higher = node.higher
+        if node.higher is not None:
+            node.higher.lower = node.lower
+
+    def _add(self, e: _Entry) -> None:
+        self._frequency_after(None, 1).push_front(e)
+
+    def _touch(self, e: _Entry) -> None:
+        node = e.owner
+        node.remove(e)
+        self._frequency_after(node, node.count + 1).push_front(e)
+        self._drop_if_empty(node)
+
+    def _unlink(self, e: _Entry) -> None:
+        node = e.owner
+        node.remove(e)
+        self._drop_if_empty(node)
+
+    def _evict(self) -> None:
+        node = self._lowest
+        self._index.delete(node.pop_back())
+        self._drop_if_empty(node)
+
+
+class ARCCache(Cache):
+    """
+    Adaptive Replacement Cache (Megiddo and Modha). Keeps two LRU lists of
+    values, T1 (used once recently) and T2 (used at least twice), and two
+    ghost lists B1 and B2 with only the keys recently evicted from each.
+    A put of a key found in B1 means T1 was too small, and one in B2 that
+    T2 was, so the target size p of T1 moves towards the list that would
+    have hit. This resists scans (they stay in T1) while still adapting to
+    recency-heavy workloads.
+
+    The index holds up to 2 * capacity entries, counting the ghosts.
+    """
+
+    def __init__(self, capacity: int, ttl: float = None, clock: Callable = monotonic) -> None:
+        super().__init__(capacity, ttl, clock)
+        self._index = self._new_index(2 * capacity)
+        self.p = 0  # Target size of T1
+        self._t1, self._t2 = _LinkedList(), _LinkedList()
+        self._b1, self._b2 = _LinkedList(), _LinkedList()
+
+    def __len__(self) -> int:
+        return len(self._t1) + len(self._t2)
+
+    def __contains__(self, key) -> bool:
+        e = self._index.get(key)
+        return e is not None and e.owner in (self._t1, self._t2) and not self._expired(e)
+
+    def get(self, key, default=None):
+        e = self._index.get(key)
+        if e is not None and e.owner not in (self._t1, self._t2):
+            self.misses += 1  # Only a ghost: the value is not here
+            return default
+        return super().get(key, default)
+
+    def put(self, key, value, ttl: float = None) -> None:
+        e = self._index.get(key)
+        if e is None:
+            # Not seen recently: make room, keeping |T1| + |B1| <= c and
+            # the total (ghosts included) <= 2c
+            c = self.capacity
+            if len(self._t1) + len(self._b1) == c:
+                if len(self._t1) < c:
+                    self._index.delete(self._b1.pop_back())
+                    if len(self) == c:
+                        self._evict()
+                else:
+                    self._index.delete(self._t1.pop_back())
+                    self.evictions += 1
+            elif len(self) + len(self._b1) + len(self._b2) >= c:
+                if len(self) + len(self._b1) + len(self._b2) == 2 * c:
+                    self._index.delete(self._b2.pop_back())
+                if len(self) == c:
+                    self._evict()
+            e = _Entry(key, value, self._expires(ttl))
+            self._index.insert(e)
+            self._add(e)
+            return
+        if e.owner is self._b1 or e.owner is self._b2:
+            # Ghost hit: adapt p towards the list that would have kept the key
+            in_b2 = e.owner is self._b2
+            if in_b2:
+                self.p = max(self.p - max(len(self._b1) // len(self._b2), 1), 0)
+            else:
+                self.p = min(self.p + max(len(self._b2) // len(self._b1), 1), self.capacity)
+            e.owner.remove(e)
+            if len(self) == self.capacity:
+                self._replace(in_b2)
+            e.value = value
+            e.expires = self._expires(ttl)
+            self._t2.push_front(e)
+            return
+        e.value = value
+        e.expires = self._expires(ttl)
+        self._touch(e)
+
+    def _replace(self, in_b2: bool) -> None:
+        # Moves the LRU value of T1 or T2 to its ghost list, according to p
+        t1 = len(self._t1)
+        if t1 and (t1 > self.p or (in_b2 and t1 == self.p) or not len(self._t2)):
+            e = self._t1.pop_back()
+            self._b1.push_front(e)
+        else:
+            e = self._t2.pop_back()
+            self._b2.push_front(e)
+        e.value = None
+        self.evictions += 1
+
+    def _add(self, e: _Entry) -> None:
+        self._t1.push_front(e)  # New keys start in T1
+
+    def _touch(self, e: _Entry) -> None:
+        e.owner.remove(e)
+        self._t2.push_front(e)
+
+    def _unlink(self, e: _Entry) -> None:
+        e.owner.remove(e)
+
+    def _evict(self) -> None:
+        # A value is not dropped but moved to its ghost list
+        self._replace(False)
+
+
+class Policy(Enum):
+    LRU = LRUCache
+    LFU = LFUCache
+    ARC = ARCCache
+
+
+_KWD_MARK = object()  # Separates the positional from the keyword arguments
+
+
+def _freeze(x):
+    # Hashable version of an argument, so lists (e.g. cut_rod prices) can be
+    # keys. The type is kept, as in lru_cache(typed=True), so that [1], (1,),
+    # 1 and 1.0 give different keys.
+    if isinstance(x, (list, tuple)):
+        return type(x), tuple(_freeze(v) for v in x)
+    if isinstance(x, dict):
+        return type(x), tuple(sorted(((k, _freeze(v)) for k, v in x.items()), key=lambda kv: kv[0]))
+    if isinstance(x, (set, frozenset)):
+        return type(x), frozenset(_freeze(v) for v in x)
+    return type(x), x
+
+
+def _make_key(args: tuple, kwargs: dict) -> tuple:
+    key = tuple(_freeze(a) for a in args)
+    if kwargs:
+        key += (_KWD_MARK,) + tuple((k, _freeze(v)) for k, v in sorted(kwargs.items(), key=lambda kv: kv[0]))
+    return key
+
+
+def cached(capacity: int = 128, policy: Policy = Policy.LRU, ttl: float = None):
+    """
+    Used as a decorator. Stores the results of the decorated function in a
+    bounded cache, keyed by its arguments and their types (lists, dicts and
+    sets are turned into tuples and frozensets to be hashed). The cache is available as
+    the attribute cache of the decorated function, e.g. f.cache.stats().
+
+    Results are returned as stored, so do not modify a returned list.
+
+    Parameters
+    ----------
+    capacity: int
+        Maximum number of results kept.
+    policy: Policy
+        Eviction policy: Policy.LRU, Policy.LFU or Policy.ARC.
+    ttl: float
+        Seconds a result stays valid. None keeps results until evicted.
+    """
+
+    def decorator(f):
+        cache = policy.value(capacity, ttl)
+        missing = object()
+
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            key = _make_key(args, kwargs)
+            value = cache.get(key, missing)
+            if value is missing:
+                value = f(*args, **kwargs)
+                cache.put(key, value)
+            return value
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
+
+
+if __name__ == "__main__":
+    import random
+    from itertools import combinations
+    from time import perf_counter
+
+    dp = import_module("L21 - dynamic_programming")
+    sp = import_module("L24 - graphs_shortest_paths")
+
+    lcs = cached(64)(dp.lcs)
+    words = ["".join(random.choice("ACGT") for _ in range(200)) for _ in range(20)]
+    start = perf_counter()
+    for _ in range(200):
+        lcs(*random.sample(words, 2))
+    print(f"lcs: {perf_counter() - start:.2f}s {lcs.cache.stats()}")
+
+    cut_rod = cached(16, Policy.LFU)(dp.cut_rod)
+    prices = [1, 5, 8, 9, 10, 17, 17, 20, 24, 30]
+    print(cut_rod(prices, 10)[0] is cut_rod(prices, 10)[0])
+    # True
+    print(cut_rod.cache.stats()["hits"])
+    # 1
+
+    G = sp.Graph(sp.GraphType.DIRECTED)
+    nodes = range(100)
+    G.add_nodes(nodes)
+    edges = [(i, j, random.random()) for i, j in combinations(nodes, 2)]
+    G.add_edges(random.sample(edges, 1000))
+    # The graph must not change while the cache is in use
+    shortest_path = cached(256, Policy.ARC, ttl=60)(G.dijkstra_shortest_paths)
+    queries = [(0, random.randrange(100)) for _ in range(300)]
+    start = perf_counter()
+    paths = [shortest_path(s, v) for s, v in queries]
+    print(f"dijkstra: {perf_counter() - start:.2f}s {shortest_path.cache.stats()}")
+
+    # TTL with a manual clock
+    now = [0.0]
+    c = LRUCache(2, ttl=10, clock=lambda: now[0])
+    c.put("a", 1)
+    now[0] = 11
+    print(c.get("a"), c.stats()["expirations"])
+    # None 1
+
+    # Hit rates: skewed (Zipf-like) accesses with a periodic scan of cold keys
+    def workload(n: int) -> list[int]:
+        keys = []
+        for i in range(n):
+            if i % 5000 < 1000:
+                keys.append(10_000 + i)  # Scan: each key used once
+            else:
+                keys.append(int(random.paretovariate(1.2)) % 2000)
+        return keys
+
+    requests = workload(100_000)
+    for p in Policy:
+        c = p.value(200)
+        for k in requests:
+            if c.get(k) is None:
+                c.put(k, k)
+        print(f"{p.name}: hit rate {c.hits / len(requests):.2%}")
+
+    # O(1): the time per operation does not grow with the capacity
+    for capacity in (100, 10_000, 1_000_000):
+        for p in Policy:
+            c = p.value(capacity)
+            keys = [random.randrange(2 * capacity) for _ in range(200_000)]
+            start = perf_counter()
+            for k in keys:
+                if c.get(k) is None:
+                    c.put(k, k)
+            elapsed = perf_counter() - start
+            print(f"{p.name} capacity={capacity}: {elapsed / len(keys) * 1e9:.0f} ns per access")
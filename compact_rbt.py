@@ -0,0 +1,709 @@
+from array import array
+from typing import Iterator, TypeVar
+
+T = TypeVar("T")
+
+# Compact versions of the red-black tree of L18, with the same CLRS
+# algorithms. The colors are booleans and every test against the sentinel is
+# an identity check (is / index 0), so the hot loops do not go through
+# Enum or generic == comparisons. They keep no subtree sizes, so they have no
+# order statistics, join or split; use the RBT of L18 for those.
+
+RED = True
+BLACK = False
+
+
+class Node:
+    __slots__ = ("key", "red", "parent", "left", "right")
+
+    def __init__(self, key: T, red: bool = RED, parent=None, left=None, right=None) -> None:
+        self.key: T = key
+        self.red: bool = red
+        self.parent: Node = parent
+        self.left: Node = left
+        self.right: Node = right
+
+
+NIL = Node(None, BLACK)  # Shared sentinel, as in L18
+
+
+class CompactRBT:
+    """
+    Red-black tree with slotted nodes (no per-node __dict__) and boolean
+    colors.
+    """
+
+    def __init__(self) -> None:
+        self.nil = NIL
+        self.root = NIL
+        self.n = 0
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __iter__(self) -> Iterator[T]:
+        if self.root is NIL:
+            return
+        x = self.__minimum(self.root)
+        while x is not NIL:
+            yield x.key
+            x = self.__successor(x)
+
+    def in_order_walk(self) -> list[T]:
+        return list(self)
+
+    def assert_rbt_property(self) -> bool:
+        if self.root is NIL:
+            return True
+        return not self.root.red and self.__black_height(self.root) > 0
+
+    def __black_height(self, x: Node) -> int:
+        # Black height of x, or -1 if the subtree breaks a property
+        if x is NIL:
+            return 1
+        if x.red and (x.left.red or x.right.red):
+            return -1
+        if x.left is not NIL and not x.left.key < x.key:
+            return -1
+        if x.right is not NIL and not x.key < x.right.key:
+            return -1
+        left = self.__black_height(x.left)
+        right = self.__black_height(x.right)
+        if left < 0 or left != right:
+            return -1
+        return left + (not x.red)
+
+    def search(self, k: T) -> bool:
+        return self.__search(k) is not NIL
+
+    def __search(self, k: T) -> Node:
+        x = self.root
+        while x is not NIL:
+            key = x.key
+            if k < key:
+                x = x.left
+            elif key < k:
+                x = x.right
+            else:
+                return x
+        return NIL
+
+    def minimum(self) -> T:
+        return self.__minimum(self.root).key
+
+    def __minimum(self, x: Node) -> Node:
+        while x.left is not NIL:
+            x = x.left
+        return x
+
+    def maximum(self) -> T:
+        return self.__maximum(self.root).key
+
+    def __maximum(self, x: Node) -> Node:
+        while x.right is not NIL:
+            x = x.right
+        return x
+
+    def successor(self, k: T) -> T:
+        x = self.__search(k)
+        if x is NIL:
+            raise ValueError("Key not found")
+        return self.__successor(x).key
+
+    def __successor(self, x: Node) -> Node:
+        if x.right is not NIL:
+            return self.__minimum(x.right)
+        y = x.parent
+        while y is not NIL and x is y.right:
+            x = y
+            y = y.parent
+        return y
+
+    def predecessor(self, k: T) -> T:
+        x = self.__search(k)
+        if x is NIL:
+            raise ValueError("Key not found")
+        return self.__predecessor(x).key
+
+    def __predecessor(self, x: Node) -> Node:
+        if x.left is not NIL:
+            return self.__maximum(x.left)
+        y = x.parent
+        while y is not NIL and x is y.left:
+            x = y
+            y = y.parent
+        return y
+
+    def insert(self, k: T) -> bool:
+        y = NIL
+        x = self.root
+        while x is not NIL:
+            y = x
+            if k < x.key:
+                x = x.left
+            elif x.key < k:
+                x = x.right
+            else:
+                return False
+        z = Node(k, RED, y, NIL, NIL)
+        if y is NIL:
+            self.root = z
+        elif k < y.key:
+            y.left = z
+        else:
+            y.right = z
+        self.n += 1
+        self.__insert_fixup(z)
+        return True
+
+    def __insert_fixup(self, z: Node) -> None:
+        while z.parent.red:
+            p = z.parent
+            g = p.parent
+            if p is g.left:
+                y = g.right
+                if y.red:
+                    p.red = y.red = BLACK
+                    g.red = RED
+                    z = g
+                else:
+                    if z is p.right:
+                        z = p
+                        self.__left_rotate(z)
+                        p = z.parent
+                    p.red = BLACK
+                    g.red = RED
+                    self.__right_rotate(g)
+            else:
+                y = g.left
+                if y.red:
+                    p.red = y.red = BLACK
+                    g.red = RED
+                    z = g
+                else:
+                    if z is p.left:
+                        z = p
+                        self.__right_rotate(z)
+                        p = z.parent
+                    p.red = BLACK
+                    g.red = RED
+                    self.__left_rotate(g)
+        self.root.red = BLACK
+
+    def delete(self, k: T) -> bool:
+        z = self.__search(k)
+        if z is NIL:
+            return False
+        self.__delete(z)
+        self.n -= 1
+        return True
+
+    def __delete(self, z: Node) -> None:
+        y = z
+        y_was_red = y.red
+        if z.left is NIL:
+            x = z.right
+            self.__transplant(z, z.right)
+        elif z.right is NIL:
+            x = z.left
+            self.__transplant(z, z.left)
+        else:
+            y = self.__minimum(z.right)
+            y_was_red = y.red
+            x = y.right
+            if y.parent is z:
+                x.parent = y  # in case x is NIL
+            else:
+                self.__transplant(y, y.right)
+                y.right = z.right
+                y.right.parent = y
+            self.__transplant(z, y)
+            y.left = z.left
+            y.left.parent = y
+            y.red = z.red
+        if not y_was_red:
+            self.__delete_fixup(x)
+
+    def __delete_fixup(self, x: Node) -> None:
+        while x is not self.root and not x.red:
+            p = x.parent
+            if x is p.left:
+                w = p.right
+                if w.red:
+                    w.red = BLACK
+                    p.red = RED
+                    self.__left_rotate(p)
+                    w = p.right
+                if not w.left.red and not w.right.red:
+                    w.red = RED
+                    x = p
+                else:
+                    if not w.right.red:
+                        w.left.red = BLACK
+                        w.red = RED
+                        self.__right_rotate(w)
+                        w = p.right
+                    w.red = p.red
+                    p.red = BLACK
+                    w.right.red = BLACK
+                    self.__left_rotate(p)
+                    x = self.root
+            else:
+                w = p.left
+                if w.red:
+                    w.red = BLACK
+                    p.red = RED
+                    self.__right_rotate(p)
+                    w = p.left
+                if not w.right.red and not w.left.red:
+                    w.red = RED
+                    x = p
+                else:
+                    if not w.left.red:
+                        w.right.red = BLACK
+                        w.red = RED
+                        self.__left_rotate(w)
+                        w = p.left
+                    w.red = p.red
+                    p.red = BLACK
+                    w.left.red = BLACK
+                    self.__right_rotate(p)
+                    x = self.root
+        x.red = BLACK
+
+    def __transplant(self, u: Node, v: Node) -> None:
+        p = u.parent
+        if p is NIL:
+            self.root = v
+        elif u is p.left:
+            p.left = v
+        else:
+            p.right = v
+        v.parent = p
+
+    def __left_rotate(self, x: Node) -> None:
+        y = x.right
+        x.right = b = y.left
+        if b is not NIL:
+            b.parent = x
+        y.parent = p = x.parent
+        if p is NIL:
+            self.root = y
+        elif x is p.left:
+            p.left = y
+        else:
+            p.right = y
+        y.left = x
+        x.parent = y
+
+    def __right_rotate(self, y: Node) -> None:
+        x = y.left
+        y.left = b = x.right
+        if b is not NIL:
+            b.parent = y
+        x.parent = p = y.parent
+        if p is NIL:
+            self.root = x
+        elif y is p.left:
+            p.left = x
+        else:
+            p.right = x
+        x.right = y
+        y.parent = x
+
+
+class PooledRBT:
+    """
+    Red-black tree whose nodes live in an array-backed pool instead of being
+    objects: node i is (key[i], red[i], parent[i], left[i], right[i]). The
+    links are 32-bit indices in array("i") and the colors one byte each in a
+    bytearray, so a node costs about 21 bytes plus its key, against a
+    Python object per node. Index 0 is the nil sentinel. Deleted slots are
+    chained through left[] and reused by the next inserts.
+
+    Parameters
+    ----------
+    capacity: int
+        Number of nodes to reserve up front. The pool grows when it runs out.
+    """
+
+    def __init__(self, capacity: int = 0) -> None:
+        size = capacity + 1
+        self.key: list = [None] * size
+        self.red = bytearray(size)
+        self.parent = array("i", bytes(4 * size))
+        self.left = array("i", bytes(4 * size))
+        self.right = array("i", bytes(4 * size))
+        self.root = 0
+        self.top = 1  # First slot never used
+        self.free = 0  # Head of the list of deleted slots
+        self.n = 0
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __iter__(self) -> Iterator[T]:
+        if self.root == 0:
+            return
+        x = self.__minimum(self.root)
+        while x:
+            yield self.key[x]
+            x = self.__successor(x)
+
+    def in_order_walk(self) -> list[T]:
+        return list(self)
+
+    def assert_rbt_property(self) -> bool:
+        if self.root == 0:
+            return True
+        return not self.red[self.root] and self.__black_height(self.root) > 0
+
+    def __black_height(self, x: int) -> int:
+        if x == 0:
+            return 1
+        key, red, left, right = self.key, self.red, self.left[x], self.right[x]
+        if red[x] and (red[left] or red[right]):
+            return -1
+        if left and not key[left] < key[x]:
+            return -1
+        if right and not key[x] < key[right]:
+            return -1
+        if self.parent[left] != x and left or self.parent[right] != x and right:
+            return -1
+        hl = self.__black_height(left)
+        hr = self.__black_height(right)
+        if hl < 0 or hl != hr:
+            return -1
+        return hl + (not red[x])
+
+    def search(self, k: T) -> bool:
+        return self.__search(k) != 0
+
+    def __search(self, k: T) -> int:
+        key, left, right = self.key, self.left, self.right
+        x = self.root
+        while x:
+            kx = key[x]
+            if k < kx:
+                x = left[x]
+            elif kx < k:
+                x = right[x]
+            else:
+                return x
+        return 0
+
+    def minimum(self) -> T:
+        return self.key[self.__minimum(self.root)]
+
+    def __minimum(self, x: int) -> int:
+        left = self.left
+        while left[x]:
+            x = left[x]
+        return x
+
+    def maximum(self) -> T:
+        return self.key[self.__maximum(self.root)]
+
+    def __maximum(self, x: int) -> int:
+        right = self.right
+        while right[x]:
+            x = right[x]
+        return x
+
+    def successor(self, k: T) -> T:
+        x = self.__search(k)
+        if x == 0:
+            raise ValueError("Key not found")
+        return self.key[self.__successor(x)]
+
+    def __successor(self, x: int) -> int:
+        if self.right[x]:
+            return self.__minimum(self.right[x])
+        parent, right = self.parent, self.right
+        y = parent[x]
+        while y and x == right[y]:
+            x = y
+            y = parent[y]
+        return y
+
+    def predecessor(self, k: T) -> T:
+        x = self.__search(k)
+        if x == 0:
+            raise ValueError("Key not found")
+        return self.key[self.__predecessor(x)]
+
+    def __predecessor(self, x: int) -> int:
+        if self.left[x]:
+            return self.__maximum(self.left[x])
+        parent, left = self.parent, self.left
+        y = parent[x]
+        while y and x == left[y]:
+            x = y
+            y = parent[y]
+        return y
+
+    def __new_node(self, k: T, parent: int) -> int:
+        if self.free:
+            z = self.free
+            self.free = self.left[z]
+        else:
+            if self.top == len(self.key):
+                self.__grow()
+            z = self.top
+            self.top += 1
+        self.key[z] = k
+        self.red[z] = RED
+        self.parent[z] = parent
+        self.left[z] = self.right[z] = 0
+        return z
+
+    def __grow(self) -> None:
+        # Doubles the pool, amortized O(1) per insert like a list
+        extra = len(self.key)
+        self.key.extend([None] * extra)
+        self.red.extend(bytes(extra))
+        zeros = bytes(4 * extra)
+        self.parent.frombytes(zeros)
+        self.left.frombytes(zeros)
+        self.right.frombytes(zeros)
+
+    def insert(self, k: T) -> bool:
+        key, left, right = self.key, self.left, self.right
+        y = 0
+        x = self.root
+        while x:
+            y = x
+            kx = key[x]
+            if k < kx:
+                x = left[x]
+            elif kx < k:
+                x = right[x]
+            else:
+                return False
+        z = self.__new_node(k, y)
+        if y == 0:
+            self.root = z
+        elif k < self.key[y]:
+            self.left[y] = z
+        else:
+            self.right[y] = z
+        self.n += 1
+        self.__insert_fixup(z)
+        return True
+
+    def __insert_fixup(self, z: int) -> None:
+        red, parent, left, right = self.red, self.parent, self.left, self.right
+        while red[parent[z]]:
+            p = parent[z]
+            g = parent[p]
+            if p == left[g]:
+                y = right[g]
+                if red[y]:
+                    red[p] = red[y] = BLACK
+                    red[g] = RED
+                    z = g
+                else:
+                    if z == right[p]:
+                        z = p
+                        self.__left_rotate(z)
+                        p = parent[z]
+                    red[p] = BLACK
+                    red[g] = RED
+                    self.__right_rotate(g)
+            else:
+                y = left[g]
+                if red[y]:
+                    red[p] = red[y] = BLACK
+                    red[g] = RED
+                    z = g
+                else:
+                    if z == left[p]:
+                        z = p
+                        self.__right_rotate(z)
+                        p = parent[z]
+                    red[p] = BLACK
+                    red[g] = RED
+                    self.__left_rotate(g)
+        red[self.root] = BLACK
+
+    def delete(self, k: T) -> bool:
+        z = self.__search(k)
+        if z == 0:
+            return False
+        self.__delete(z)
+        # Free the slot
+        self.key[z] = None
+        self.left[z] = self.free
+        self.free = z
+        self.n -= 1
+        return True
+
+    def __delete(self, z: int) -> None:
+        red, parent, left, right = self.red, self.parent, self.left, self.right
+        y = z
+        y_was_red = red[y]
+        if left[z] == 0:
+            x = right[z]
+            self.__transplant(z, right[z])
+        elif right[z] == 0:
+            x = left[z]
+            self.__transplant(z, left[z])
+        else:
+            y = self.__minimum(right[z])
+            y_was_red = red[y]
+            x = right[y]
+            if parent[y] == z:
+                parent[x] = y  # in case x is nil
+            else:
+                self.__transplant(y, right[y])
+                right[y] = right[z]
+                parent[right[y]] = y
+            self.__transplant(z, y)
+            left[y] = left[z]
+            parent[left[y]] = y
+            red[y] = red[z]
+        if not y_was_red:
+            self.__delete_fixup(x)
+
+    def __delete_fixup(self, x: int) -> None:
+        red, parent, left, right = self.red, self.parent, self.left, self.right
+        while x != self.root and not red[x]:
+            p = parent[x]
+            if x == left[p]:
+                w = right[p]
+                if red[w]:
+                    red[w] = BLACK
+                    red[p] = RED
+                    self.__left_rotate(p)
+                    w = right[p]
+                if not red[left[w]] and not red[right[w]]:
+                    red[w] = RED
+                    x = p
+                else:
+                    if not red[right[w]]:
+                        red[left[w]] = BLACK
+                        red[w] = RED
+                        self.__right_rotate(w)
+                        w = right[p]
+                    red[w] = red[p]
+                    red[p] = BLACK
+                    red[right[w]] = BLACK
+                    self.__left_rotate(p)
+                    x = self.root
+            else:
+                w = left[p]
+                if red[w]:
+                    red[w] = BLACK
+                    red[p] = RED
+                    self.__right_rotate(p)
+                    w = left[p]
+                if not red[right[w]] and not red[left[w]]:
+                    red[w] = RED
+                    x = p
+                else:
+                    if not red[left[w]]:
+                        red[right[w]] = BLACK
+                        red[w] = RED
+                        self.__left_rotate(w)
+                        w = left[p]
+                    red[w] = red[p]
+                    red[p] = BLACK
+                    red[left[w]] = BLACK
+                    self.__right_rotate(p)
+                    x = self.root
+        red[x] = BLACK
+
+    def __transplant(self, u: int, v: int) -> None:
+        p = self.parent[u]
+        if p == 0:
+            self.root = v
+        elif u == self.left[p]:
+            self.left[p] = v
+        else:
+            self.right[p] = v
+        self.parent[v] = p
+
+    def __left_rotate(self, x: int) -> None:
+        parent, left, right = self.parent, self.left, self.right
+        y = right[x]
+        right[x] = b = left[y]
+        if b:
+            parent[b] = x
+        parent[y] = p = parent[x]
+        if p == 0:
+            self.root = y
+        elif x == left[p]:
+            left[p] = y
+        else:
+            right[p] = y
+        left[y] = x
+        parent[x] = y
+
+    def __right_rotate(self, y: int) -> None:
+        parent, left, right = self.parent, self.left, self.right
+        x = left[y]
+        left[y] = b = right[x]
+        if b:
+            parent[b] = y
+        parent[x] = p = parent[y]
+        if p == 0:
+            self.root = x
+        elif y == left[p]:
+            left[p] = x
+        else:
+            right[p] = x
+        right[x] = y
+        parent[y] = x
+
+
+if __name__ == "__main__":
+    import gc
+    import random
+    import tracemalloc
+    from importlib import import_module
+    from time import perf_counter
+
+    RBT = import_module("L18 - rbt").RBT
+
+    for cls in (CompactRBT, PooledRBT):
+        t = cls()
+        for i in [9, 5, 1, 0, 6, 3, 2, 4, 7, 8]:
+            t.insert(i)
+        print(t.in_order_walk(), t.assert_rbt_property())
+        # [0, 1, 2, 3, 4, 5, 6, 7, 8, 9] True
+        print(t.search(10), t.search(9), t.minimum(), t.maximum())
+        # False True 0 9
+        print(t.predecessor(5), t.successor(5), t.delete(5), t.delete(5), len(t))
+        # 4 6 True False 9
+
+    # Memory per node (the keys are shared by the three trees and not
+    # counted) and insert/search throughput. The RBT of L18 also keeps the
+    # subtree sizes up to date, which accounts for part of its insert time.
+    #        RBT: 128 bytes/node, 10.88us per insert, 3.08us per search
+    # CompactRBT: 72 bytes/node, 5.81us per insert, 1.91us per search
+    #  PooledRBT: 29 bytes/node, 3.71us per insert, 2.20us per search
+    n = 200_000
+    keys = random.sample(range(10 * n), n)
+    for cls in (RBT, CompactRBT, PooledRBT):
+        gc.collect()
+        tracemalloc.start()
+        t = cls()
+        for k in keys:
+            t.insert(k)
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del t
+        # Timed again without tracemalloc, which slows allocations down
+        start = perf_counter()
+        t = cls()
+        for k in keys:
+            t.insert(k)
+        inserts = perf_counter() - start
+        start = perf_counter()
+        for k in keys:
+            t.search(k)
+        searches = perf_counter() - start
+        print(
+            f"{cls.__name__:>10}: {memory / n:.0f} bytes/node, "
+            f"{inserts / n * 1e6:.2f}us per insert, {searches / n * 1e6:.2f}us per search"
+        )
@@ -0,0 +1,223 @@
+import hashlib
+import random
+
+MASK64 = (1 << 64) - 1
+GOLDEN_RATIO_64 = 0x9E3779B97F4A7C15  # 2**64 / golden ratio, odd
+
+
+# All hash functions share the signature f(key, m) -> int in [0, m - 1], the
+# same one as hash_code in L13, so any of them can be passed to a table.
+
+
+def _to_int(key) -> int:
+    # Integers are used as they are, anything else goes through hash()
+    return (key if isinstance(key, int) else hash(key)) & MASK64
+
+
+def multiplicative_hash(key, m: int, A: float = None) -> int:
+    """
+    Knuth's multiplication method: floor(m * frac(k * A)), computed in 64-bit
+    fixed point so that large keys do not lose precision.
+
+    Parameters
+    ----------
+    key:
+        Key to hash. Integers are used directly, other keys through hash().
+    m: int
+        Size of the table.
+    A: float
+        Constant in (0, 1). None uses GOLDEN_RATIO_64 / 2**64, the inverse of
+        the golden ratio with all 64 bits, which makes it the same as
+        fibonacci_hash. A float only has 53 significant bits, so its fixed
+        point multiplier ends in zero bits and the highest bits of the key
+        do not reach the result.
+    """
+    multiplier = GOLDEN_RATIO_64 if A is None else int(A * (1 << 64))
+    fraction = _to_int(key) * multiplier & MASK64
+    return (fraction * m) >> 64
+
+
+def fibonacci_hash(key, m: int) -> int:
+    """
+    Fibonacci hashing: multiplies the 64-bit key by 2**64 / golden ratio and
+    keeps the high bits, mapped to [0, m) with a multiply-shift instead of a
+    modulo. Keys with a regular structure (multiples of a power of two,
+    consecutive ids) spread evenly for any m, including powers of two.
+    """
+    return ((_to_int(key) * GOLDEN_RATIO_64 & MASK64) * m) >> 64
+
+
+class TabulationHash:
+    """
+    Simple tabulation hashing: the 64-bit key is split into 8 bytes, each
+    byte indexes its own table of random 64-bit words and the words are
+    XOR-ed together. The tables are filled from seed, so the hash is 3-wise
+    independent and, for integer keys, hard to attack without knowing the
+    seed. Other keys are first reduced with the unkeyed hash(), so keys
+    that collide there (easy to build for tuples, or for strings when
+    PYTHONHASHSEED is fixed) still collide; use SeededHash for those.
+
+    Parameters
+    ----------
+    seed: int
+        Seed for the random tables. None uses a random seed.
+    """
+
+    def __init__(self, seed: int = None) -> None:
+        rng = random.Random(seed)
+        self.tables = [[rng.getrandbits(64) for _ in range(256)] for _ in range(8)]
+
+    def hash64(self, key) -> int:
+        x = _to_int(key)
+        h = 0
+        for table in self.tables:
+            h ^= table[x & 0xFF]
+            x >>= 8
+        return h
+
+    def __call__(self, key, m: int) -> int:
+        return (self.hash64(key) * m) >> 64
+
+
+def _rotl(x: int, b: int) -> int:
+    return ((x << b) | (x >> (64 - b))) & MASK64
+
+
+def siphash24(k0: int, k1: int, data: bytes) -> int:
+    """
+    SipHash-2-4 of data with the 128-bit key (k0, k1), written in pure
+    Python. Returns a 64-bit integer.
+    """
+    v0 = k0 ^ 0x736F6D6570736575
+    v1 = k1 ^ 0x646F72616E646F6D
+    v2 = k0 ^ 0x6C7967656E657261
+    v3 = k1 ^ 0x7465646279746573
+
+    def sip_round(v0, v1, v2, v3):
+        v0 = (v0 + v1) & MASK64
+        v1 = _rotl(v1, 13) ^ v0
+        v0 = _rotl(v0, 32)
+        v2 = (v2 + v3) & MASK64
+        v3 = _rotl(v3, 16) ^ v2
+        v0 = (v0 + v3) & MASK64
+        v3 = _rotl(v3, 21) ^ v0
+        v2 = (v2 + v1) & MASK64
+        v1 = _rotl(v1, 17) ^ v2
+        v2 = _rotl(v2, 32)
+        return v0, v1, v2, v3
+
+    n = len(data) - len(data) % 8
+    for i in range(0, n, 8):
+        word = int.from_bytes(data[i : i + 8], "little")
+        v3 ^= word
+        v0, v1, v2, v3 = sip_round(*sip_round(v0, v1, v2, v3))
+        v0 ^= word
+    # Last block: remaining bytes plus the length in the top byte
+    word = int.from_bytes(data[n:], "little") | ((len(data) & 0xFF) << 56)
+    v3 ^= word
+    v0, v1, v2, v3 = sip_round(*sip_round(v0, v1, v2, v3))
+    v0 ^= word
+    v2 ^= 0xFF
+    for _ in range(4):
+        v0, v1, v2, v3 = sip_round(v0, v1, v2, v3)
+    return v0 ^ v1 ^ v2 ^ v3
+
+
+class SeededHash:
+    """
+    Seeded (keyed) string hash. Without the seed an attacker cannot build
+    keys that all collide, and the result does not depend on
+    PYTHONHASHSEED, so it is stable between runs for the same seed.
+
+    Parameters
+    ----------
+    seed: int
+        128-bit seed. None uses a random seed.
+    algorithm: str
+        "siphash" for SipHash-2-4 in pure Python, or "blake2b" for keyed
+        BLAKE2b from hashlib. Both are keyed PRFs, but blake2b runs in C and
+        is several times faster.
+    """
+
+    def __init__(self, seed: int = None, algorithm: str = "siphash") -> None:
+        if algorithm not in ("siphash", "blake2b"):
+            raise ValueError("algorithm must be 'siphash' or 'blake2b'")
+        if seed is None:
+            seed = random.getrandbits(128)
+        self.algorithm = algorithm
+        self._k0 = seed & MASK64
+        self._k1 = (seed >> 64) & MASK64
+        self._key_bytes = seed.to_bytes(16, "little")
+
+    def hash64(self, key) -> int:
+        data = key if isinstance(key, bytes) else str(key).encode()
+        if self.algorithm == "siphash":
+            return siphash24(self._k0, self._k1, data)
+        digest = hashlib.blake2b(data, digest_size=8, key=self._key_bytes).digest()
+        return int.from_bytes(digest, "little")
+
+    def __call__(self, key, m: int) -> int:
+        return (self.hash64(key) * m) >> 64
+
+
+def builtin_hash(key, m: int) -> int:
+    """The scheme the tables use by default: hash(key) % m."""
+    return hash(key) % m
+
+
+if __name__ == "__main__":
+    from collections import Counter
+    from functools import partial
+    from importlib import import_module
+    from string import ascii_uppercase, digits
+    from time import perf_counter
+
+    print(hex(siphash24(0x0706050403020100, 0x0F0E0D0C0B0A0908, bytes(range(15)))))
+    # 0xa129ca6149be45e5 (reference test vector)
+
+    Customer = import_module("L13 - hash_table").Customer
+
+    def generate_rfc() -> str:
+        # 4 letters, birth date YYMMDD and a 3 character homoclave
+        letters = "".join(random.choice(ascii_uppercase) for _ in range(4))
+        date = f"{random.randint(0, 99):02d}{random.randint(1, 12):02d}{random.randint(1, 28):02d}"
+        homoclave = "".join(random.choice(ascii_uppercase + digits) for _ in range(3))
+        return letters + date + homoclave
+
+    try:
+        with open("Clientes.txt", "r") as f:
+            customers = [Customer(*[e.strip() for e in l.split("\t")]) for l in f]
+    except FileNotFoundError:
+        customers = [Customer("", generate_rfc(), "") for _ in range(100_000)]
+
+    functions = {
+        "builtin": builtin_hash,
+        "multiplicative": partial(multiplicative_hash, A=0.7236067977),
+        "fibonacci": fibonacci_hash,
+        "tabulation": TabulationHash(seed=1),
+        "siphash": SeededHash(seed=1),
+        "blake2b": SeededHash(seed=1, algorithm="blake2b"),
+    }
+
+    def report(name: str, keys: list, m: int, f) -> None:
+        start = perf_counter()
+        counts = Counter(f(k, m) for k in keys)
+        elapsed = perf_counter() - start
+        expected = len(keys) / m
+        chi2 = sum((c - expected) ** 2 for c in counts.values()) + (m - len(counts)) * expected**2
+        print(
+            f"{name:>14} m={m:<6} collisions={len(keys) - len(counts):<6} "
+            f"max bucket={max(counts.values()):<3} chi2/m={chi2 / expected / m:.2f} "
+            f"time={elapsed:.3f}s"
+        )
+
+    # chi2/m close to 1 means the buckets look uniformly random
+    rfcs = [c.rfc for c in customers]
+    for m in (len(rfcs), 2**16, 65521):
+        for name, f in functions.items():
+            report(name, rfcs, m, f)
+
+    # Structured integer keys (multiples of 1024) in a power-of-two table
+    ids = [1024 * i for i in range(50_000)]
+    for name, f in functions.items():
+        report(name, ids, 2**16, f)
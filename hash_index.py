@@ -0,0 +1,420 @@
+import mmap
+import os
+import struct
+from importlib import import_module
+from typing import Callable, TypeVar
+
+from hash_functions import SeededHash
+
+T = TypeVar("T")
+
+parse_customer = import_module("L13 - hash_table").parse_customer
+
+# Index file layout (little endian):
+#   header: magic, m, count, used, dead, key_field, records_size, seed
+#   slots:  m pairs of 64-bit words (offset + 1, hash64 of the key)
+# A slot with offset word 0 is empty and _TOMBSTONE marks a deleted entry.
+_MAGIC = b"HIDX0001"
+_HEADER = struct.Struct("<8s6Q16s")
+_TOMBSTONE = (1 << 64) - 1
+MAX_LOAD = 0.7  # Grow when live entries plus tombstones pass this fraction
+
+
+def _slots_for(n: int) -> int:
+    # Smallest power of two that keeps n entries at a load of at most 1/2
+    m = 8
+    while m < 2 * n:
+        m *= 2
+    return m
+
+
+def _record_key(line: bytes, key_field: int) -> bytes:
+    return line.split(b"\t")[key_field].strip()
+
+
+def _format_record(e: tuple) -> bytes:
+    return ("\t".join(str(v) for v in e) + "\n").encode()
+
+
+class DiskHashIndex:
+    """
+    Persistent hash index over a tab-separated record file such as
+    Clientes.txt.
+
+    The index is a separate file with a fixed-size array of slots, opened
+    through mmap: each slot stores the byte offset of a record and the
+    64-bit hash of its key, with linear probing. Opening it costs the same
+    for any size, and a search reads only the slots it probes and the one
+    matching record. The hash is a seeded BLAKE2b stored in the header, so
+    it does not depend on PYTHONHASHSEED and stays valid between runs.
+
+    Appends and updates write the new record at the end of the record file
+    and delete only clears the slot, so replaced and deleted records stay
+    in the file as dead bytes until compact() rewrites it.
+
+    Args:
+        records_path: Path of the record file
+        index_path: Path of an index created with build()
+        parser: Function turning a record line into an element
+    """
+
+    def __init__(
+        self, records_path: str, index_path: str, parser: Callable = parse_customer
+    ) -> None:
+        self.records_path = records_path
+        self.index_path = index_path
+        self.parser = parser
+        self._open()
+        if os.path.getsize(records_path) != self._records_size:
+            self.close()
+            raise ValueError("The record file changed, rebuild the index")
+
+    @classmethod
+    def build(
+        cls,
+        records_path: str,
+        index_path: str,
+        key_field: int = 1,
+        seed: int = None,
+        parser: Callable = parse_customer,
+    ) -> "DiskHashIndex":
+        """
+        Builds the index of a record file in one pass and opens it.
+
+        Args:
+            records_path: Path of the record file, one record per line
+            index_path: Path where the index is written
+            key_field: Column of the key in each line (1 is the RFC)
+            seed: Seed of the hash. None uses a random seed
+            parser: Function turning a record line into an element
+
+        Returns:
+            The opened index
+        """
+        with open(records_path, "rb") as f:
+            n = sum(chunk.count(b"\n") for chunk in iter(lambda: f.read(1 << 20), b""))
+        hasher = SeededHash(seed, algorithm="blake2b")
+        m = _slots_for(n + 1)
+        slots = [0] * (2 * m)
+        count = dead = 0
+        with open(records_path, "rb") as f:
+            offset = 0
+            for line in f:
+                if line.strip():
+                    count, dead = cls._place(
+                        slots, m, _record_key(line, key_field), offset, hasher,
+                        records_path, key_field, count, dead,
+                    )
+                offset += len(line)
+        cls._write(index_path, m, count, count, dead, key_field, offset, hasher, slots)
+        return cls(records_path, index_path, parser)
+
+    @staticmethod
+    def _place(slots, m, k, offset, hasher, records_path, key_field, count, dead):
+        # Used by build: a repeated key replaces the earlier record
+        h = hasher.hash64(k)
+        i = h & (m - 1)
+        while slots[2 * i]:
+            if slots[2 * i + 1] == h:
+                with open(records_path, "rb") as f:
+                    f.seek(slots[2 * i] - 1)
+                    if _record_key(f.readline(), key_field) == k:
+                        slots[2 * i] = offset + 1
+                        return count, dead + 1
+            i = (i + 1) & (m - 1)
+        slots[2 * i] = offset + 1
+        slots[2 * i + 1] = h
+        return count + 1, dead
+
+    @staticmethod
+    def _write(path, m, count, used, dead, key_field, records_size, hasher, slots):
+        # Writes to a temporary file first so a crash never leaves half an index
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(
+                _HEADER.pack(
+                    _MAGIC, m, count, used, dead, key_field, records_size,
+                    hasher._key_bytes,
+                )
+            )
+            f.write(struct.pack(f"<{2 * m}Q", *slots))
+        os.replace(tmp, path)
+
+    def _open(self) -> None:
+        self._index_file = open(self.index_path, "r+b")
+        self._index = mmap.mmap(self._index_file.fileno(), 0)
+        magic, self.m, self.count, self._used, self.dead, self.key_field, \
+            self._records_size, seed = _HEADER.unpack_from(self._index)
+        if magic != _MAGIC:
+            self.close()
+            raise ValueError(f"{self.index_path} is not a hash index")
+        self._hasher = SeededHash(int.from_bytes(seed, "little"), algorithm="blake2b")
+        self._slots = memoryview(self._index)[_HEADER.size :].cast("Q")
+        self._records = None  # Mapped on the first read
+
+    def close(self) -> None:
+        if getattr(self, "_slots", None) is not None:
+            self._slots.release()
+            self._slots = None
+        for name in ("_records", "_index", "_index_file"):
+            if getattr(self, name, None) is not None:
+                getattr(self, name).close()
+                setattr(self, name, None)
+
+    def __enter__(self) -> "DiskHashIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _save_header(self) -> None:
+        _HEADER.pack_into(
+            self._index, 0, _MAGIC, self.m, self.count, self._used, self.dead,
+            self.key_field, self._records_size, self._hasher._key_bytes,
+        )
+
+    def _line(self, offset: int) -> bytes:
+        if self._records is None or offset >= len(self._records):
+            if self._records is not None:
+                self._records.close()
+            with open(self.records_path, "rb") as f:
+                self._records = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        end = self._records.find(b"\n", offset)
+        return self._records[offset : end if end != -1 else len(self._records)]
+
+    def _find(self, k: bytes) -> tuple[int, int]:
+        """
+        Locates the slot of key k.
+
+        Returns:
+            (i, j): slot holding k (-1 if absent) and the first free or
+            deleted slot seen on the way, where k would be inserted
+        """
+        h = self._hasher.hash64(k)
+        slots, mask = self._slots, self.m - 1
+        i = h & mask
+        free = -1
+        while True:
+            offset = slots[2 * i]
+            if offset == 0:
+                return -1, free if free != -1 else i
+            if offset == _TOMBSTONE:
+                if free == -1:
+                    free = i
+            elif slots[2 * i + 1] == h and _record_key(
+                self._line(offset - 1), self.key_field
+            ) == k:
+                return i, free
+            i = (i + 1) & mask
+
+    def search(self, k: str) -> bool:
+        """
+        Searches for a key (e.g. an RFC) without loading the records.
+
+        Args:
+            k: Key to search for
+
+        Returns:
+            True if there is a live record with that key, False otherwise
+        """
+        return self._find(str(k).encode())[0] != -1
+
+    def get(self, k: str) -> T:
+        """
+        Looks up a record by its key.
+
+        Args:
+            k: Key to search for
+
+        Returns:
+            The parsed record, or None if there is none with that key
+        """
+        i, _ = self._find(str(k).encode())
+        if i == -1:
+            return None
+        return self.parser(self._line(self._slots[2 * i] - 1).decode())
+
+    def append(self, e: tuple) -> bool:
+        """
+        Appends a record to the record file and indexes it. If a record with
+        the same key exists it is replaced, and the old one becomes dead.
+
+        Args:
+            e: Record to store, e.g. a Customer
+
+        Returns:
+            True if the key was new, False if it replaced a record
+        """
+        k = str(e[self.key_field]).encode()
+        i, j = self._find(k)
+        with open(self.records_path, "ab") as f:
+            if self._records_size and self._line_end_missing():
+                f.write(b"\n")
+                self._records_size += 1
+            offset = self._records_size
+            record = _format_record(e)
+            f.write(record)
+        self._records_size += len(record)
+        if i != -1:
+            self._slots[2 * i] = offset + 1
+            self.dead += 1
+            self._save_header()
+            return False
+        if self._slots[2 * j] == 0:
+            self._used += 1
+        self._slots[2 * j] = offset + 1
+        self._slots[2 * j + 1] = self._hasher.hash64(k)
+        self.count += 1
+        self._save_header()
+        if self._used > MAX_LOAD * self.m:
+            self._rehash(_slots_for(self.count + 1))
+        return True
+
+    def _line_end_missing(self) -> bool:
+        with open(self.records_path, "rb") as f:
+            f.seek(self._records_size - 1)
+            return f.read(1) != b"\n"
+
+    def delete(self, k: str) -> bool:
+        """
+        Removes a key from the index. Its record stays in the file until
+        compact().
+
+        Args:
+            k: Key to delete
+
+        Returns:
+            True if the key was deleted, False if it wasn't in the index
+        """
+        i, _ = self._find(str(k).encode())
+        if i == -1:
+            return False
+        self._slots[2 * i] = _TOMBSTONE
+        self.count -= 1
+        self.dead += 1
+        self._save_header()
+        return True
+
+    def _live(self) -> list[tuple[int, int]]:
+        # (offset + 1, hash) of every live slot
+        slots = self._slots
+        return [
+            (slots[2 * i], slots[2 * i + 1])
+            for i in range(self.m)
+            if slots[2 * i] not in (0, _TOMBSTONE)
+        ]
+
+    def _rehash(self, m: int, live: list = None, records_size: int = None) -> None:
+        # The hashes are stored, so resizing only moves slots, no record is read
+        live = self._live() if live is None else live
+        slots = [0] * (2 * m)
+        for offset, h in live:
+            i = h & (m - 1)
+            while slots[2 * i]:
+                i = (i + 1) & (m - 1)
+            slots[2 * i] = offset
+            slots[2 * i + 1] = h
+        if records_size is None:
+            records_size = self._records_size
+        hasher, key_field = self._hasher, self.key_field
+        self.close()
+        self._write(
+            self.index_path, m, len(live), len(live), self.dead, key_field,
+            records_size, hasher, slots,
+        )
+        self._open()
+
+    def compact(self) -> int:
+        """
+        Rewrites the record file with only the live records, in their
+        original order, and rebuilds the index for it.
+
+        Returns:
+            Number of bytes reclaimed
+        """
+        live = sorted(self._live())
+        tmp = self.records_path + ".tmp"
+        moved = []
+        with open(tmp, "wb") as f:
+            offset = 0
+            for old, h in live:
+                line = self._line(old - 1).rstrip(b"\n") + b"\n"
+                f.write(line)
+                moved.append((offset + 1, h))
+                offset += len(line)
+        reclaimed = self._records_size - offset
+        self.dead = 0
+        if self._records is not None:
+            self._records.close()
+            self._records = None
+        os.replace(tmp, self.records_path)
+        self._rehash(_slots_for(len(moved) + 1), moved, offset)
+        return reclaimed
+
+
+if __name__ == "__main__":
+    import random
+    import shutil
+    import tempfile
+    from string import ascii_uppercase, digits
+    from time import perf_counter
+
+    Customer = import_module("L13 - hash_table").Customer
+
+    def generate_rfc() -> str:
+        letters = "".join(random.choice(ascii_uppercase) for _ in range(4))
+        date = f"{random.randint(0, 99):02d}{random.randint(1, 12):02d}{random.randint(1, 28):02d}"
+        return letters + date + "".join(random.choice(ascii_uppercase + digits) for _ in range(3))
+
+    # Works on a copy so the demo never modifies Clientes.txt
+    folder = tempfile.mkdtemp()
+    records = os.path.join(folder, "clientes.db")
+    index = os.path.join(folder, "clientes.idx")
+    if os.path.exists("Clientes.txt"):
+        shutil.copy("Clientes.txt", records)
+    else:
+        with open(records, "w") as f:
+            for i in range(200_000):
+                f.write(f"Cliente {i}\t{generate_rfc()}\tCalle {i}\n")
+    with open(records) as f:
+        customers = [parse_customer(l) for l in f if l.strip()]
+
+    start = perf_counter()
+    DiskHashIndex.build(records, index, seed=1).close()
+    print(f"build: {perf_counter() - start:.3f}s")
+
+    start = perf_counter()
+    db = DiskHashIndex(records, index)
+    print(f"open: {(perf_counter() - start) * 1e3:.3f}ms")
+    print(db.search(customers[0].rfc), db.search("XXXX000000XXX"))
+    # True False
+    print(db.get(customers[0].rfc) == customers[0])
+    # True
+
+    queries = [c.rfc for c in random.sample(customers, 10_000)]
+    start = perf_counter()
+    found = sum(db.search(k) for k in queries)
+    print(f"{found} searches: {(perf_counter() - start) / len(queries) * 1e6:.1f}us each")
+
+    print(db.append(Customer("Nuevo Cliente", "NUEV991231AB1", "Calle Nueva")))
+    # True
+    print(db.append(customers[0]._replace(address="Nueva dirección")))
+    # False
+    print(db.get(customers[0].rfc).address)
+    # Nueva dirección
+    print(db.delete(customers[1].rfc), db.search(customers[1].rfc))
+    # True False
+    print(len(db) == len(customers), db.dead)
+    # True 2
+    print(db.compact() > 0, db.dead, len(db) == len(customers))
+    # True 0 True
+    db.close()
+
+    # Reopening costs the same and sees the changes
+    with DiskHashIndex(records, index) as db:
+        print(db.get("NUEV991231AB1"))
+        # Customer(name='Nuevo Cliente', rfc='NUEV991231AB1', address='Calle Nueva')
+    shutil.rmtree(folder)
@@ -0,0 +1,440 @@
+import math
+import random
+from array import array
+
+MASK64 = (1 << 64) - 1
+GOLDEN_RATIO_64 = 0x9E3779B97F4A7C15
+
+
+# Filters answer "k is definitely not in the set" or "k may be in the set".
+# They use hash(key), so like the tables they are valid within one process.
+# hash(key) ^ seed is spread with one Fibonacci multiplication (as in
+# hash_functions.fibonacci_hash) and the filters take their bits from the
+# high half of the product, which depends on all the bits of the key. A
+# full mixer such as splitmix64 would cost more than a table lookup.
+
+
+class BloomFilter:
+    """
+    Classic Bloom filter: k bit positions per key in a bit array of m bits
+    stored in a bytearray. The positions are h1 + i * h2 (double hashing)
+    from one 64-bit hash.
+
+    Parameters
+    ----------
+    capacity: int
+        Number of keys the filter is sized for.
+    fp_rate: float
+        False positive rate at capacity. m = -n ln(p) / ln(2)^2 bits and
+        k = m / n ln(2) hash functions.
+    seed: int
+        Seed mixed into the hash. None uses a random seed.
+    """
+
+    def __init__(self, capacity: int, fp_rate: float = 0.01, seed: int = None) -> None:
+        if not 0 < fp_rate < 1:
+            raise ValueError("fp_rate must be between 0 and 1")
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self.fp_rate = fp_rate
+        self.m = max(math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2), 8)
+        self.k = max(round(self.m / capacity * math.log(2)), 1)
+        self.bits = bytearray((self.m + 7) // 8)
+        self.size = 0
+        self._seed = random.getrandbits(64) if seed is None else seed & MASK64
+
+    def __len__(self) -> int:
+        return self.size
+
+    def nbytes(self) -> int:
+        return len(self.bits)
+
+    def _positions(self, key) -> range:
+        h = (hash(key) ^ self._seed) * GOLDEN_RATIO_64 & MASK64
+        h1, h2 = h >> 32, (h >> 16 & 0xFFFFFFFF) | 1
+        return range(h1, h1 + self.k * h2, h2)
+
+    def add(self, key) -> None:
+        m, bits = self.m, self.bits
+        for p in self._positions(key):
+            p %= m
+            bits[p >> 3] |= 1 << (p & 7)
+        self.size += 1
+
+    def __contains__(self, key) -> bool:
+        m, bits = self.m, self.bits
+        for p in self._positions(key):
+            p %= m
+            if not bits[p >> 3] & (1 << (p & 7)):
+                return False
+        return True
+
+
+def _blocked_fp_rate(bits_per_key: float, k: int, block: int) -> float:
+    # Expected false positives of a blocked filter: the number of keys in
+    # a block is Poisson distributed, so some blocks are much fuller
+    load = block / bits_per_key
+    rate, term = 0.0, math.exp(-load)
+    for j in range(int(load * 4) + 20):
+        rate += term * (1 - (1 - 1 / block) ** (k * j)) ** k
+        term *= load / (j + 1)
+    return rate
+
+
+class BlockedBloomFilter:
+    """
+    Register-blocked Bloom filter: all k bits of a key fall in one 64-bit
+    word, so a lookup reads a single word and compares it against a mask
+    instead of touching k places. The masks are taken from a table of
+    random k-bit patterns, so building one costs a single lookup too.
+
+    The words live in a bytearray viewed as 64-bit integers. Because the
+    number of keys per word varies, the filter needs more bits per key than
+    a classic Bloom filter for the same rate; the size is chosen with the
+    exact Poisson formula so that the rate at capacity is fp_rate.
+
+    Parameters
+    ----------
+    capacity: int
+        Number of keys the filter is sized for.
+    fp_rate: float
+        False positive rate at capacity.
+    seed: int
+        Seed for the hash and the patterns. None uses a random seed.
+    patterns: int
+        Number of precomputed masks (a power of 2). Fewer patterns make
+        more keys share the same mask, which raises the rate slightly.
+    """
+
+    BLOCK = 64
+
+    def __init__(
+        self, capacity: int, fp_rate: float = 0.01, seed: int = None, patterns: int = 4096
+    ) -> None:
+        if not 0 < fp_rate < 1:
+            raise ValueError("fp_rate must be between 0 and 1")
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self.fp_rate = fp_rate
+        # Smallest bits per key (and best k for it) that reaches fp_rate
+        bits_per_key = 1.0
+        while True:
+            k = min(
+                range(1, 17), key=lambda k: _blocked_fp_rate(bits_per_key, k, self.BLOCK)
+            )
+            if _blocked_fp_rate(bits_per_key, k, self.BLOCK) <= fp_rate:
+                break
+            bits_per_key *= 1.05
+        self.k = k
+        self.words = math.ceil(capacity * bits_per_key / self.BLOCK)
+        self.bits = bytearray(8 * self.words)
+        self._view = memoryview(self.bits).cast("Q")
+        self.size = 0
+        rng = random.Random(seed)
+        self._seed = rng.getrandbits(64)
+        self._patterns = [
+            sum(1 << b for b in rng.sample(range(self.BLOCK), k)) for _ in range(patterns)
+        ]
+        self._pattern_mask = patterns - 1
+
+    def __len__(self) -> int:
+        return self.size
+
+    def nbytes(self) -> int:
+        return len(self.bits)
+
+    def add(self, key) -> None:
+        h = (hash(key) ^ self._seed) * GOLDEN_RATIO_64 & MASK64
+        # The top 32 bits choose the word (multiply-shift), the next ones
+        # the pattern
+        self._view[(h >> 32) * self.words >> 32] |= self._patterns[h >> 20 & self._pattern_mask]
+        self.size += 1
+
+    def __contains__(self, key) -> bool:
+        h = (hash(key) ^ self._seed) * GOLDEN_RATIO_64 & MASK64
+        mask = self._patterns[h >> 20 & self._pattern_mask]
+        return self._view[(h >> 32) * self.words >> 32] & mask == mask
+
+
+class CuckooFilter:
+    """
+    Cuckoo filter: stores a small fingerprint of each key in one of two
+    buckets of 4 slots, i1 = hash and i2 = i1 xor hash(fingerprint), so the
+    other bucket can be computed from the fingerprint alone when a
+    fingerprint is kicked out. Unlike a Bloom filter it supports remove().
+
+    Parameters
+    ----------
+    capacity: int
+        Number of keys the filter is sized for (at a load of 95%).
+    fp_rate: float
+        False positive rate. Fingerprints have ceil(log2(2 * 4 / fp_rate))
+        bits and are stored in an array of 8, 16 or 32-bit integers.
+    seed: int
+        Seed mixed into the hash and used for the evictions. None uses a
+        random seed.
+    max_kicks: int
+        Evictions tried before add() gives up and returns False.
+    """
+
+    SLOTS = 4
+
+    def __init__(
+        self, capacity: int, fp_rate: float = 0.01, seed: int = None, max_kicks: int = 500
+    ) -> None:
+        if not 0 < fp_rate < 1:
+            raise ValueError("fp_rate must be between 0 and 1")
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self.fp_rate = fp_rate
+        self.fingerprint_bits = math.ceil(math.log2(2 * self.SLOTS / fp_rate))
+        if self.fingerprint_bits > 32:
+            raise ValueError("fp_rate is too small")
+        typecode = "B" if self.fingerprint_bits <= 8 else "H" if self.fingerprint_bits <= 16 else "I"
+        self.buckets = 1 << max(math.ceil(capacity / (0.95 * self.SLOTS)) - 1, 1).bit_length()
+        self.slots = array(typecode, bytes(array(typecode).itemsize * self.buckets * self.SLOTS))
+        self.max_kicks = max_kicks
+        self.size = 0
+        self._rng = random.Random(seed)
+        self._seed = self._rng.getrandbits(64)
+        self._fingerprints = (1 << self.fingerprint_bits) - 1  # 0 marks an empty slot
+        self._shift = 64 - (self.buckets.bit_length() - 1)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def nbytes(self) -> int:
+        return len(self.slots) * self.slots.itemsize
+
+    def _locate(self, key) -> tuple[int, int, int]:
+        h = hash(key) ^ self._seed
+        # The bucket comes from the high bits of the product and the
+        # fingerprint from hash(key) itself, so they are not correlated
+        i1 = (h * GOLDEN_RATIO_64 & MASK64) >> self._shift
+        f = (h & MASK64) % self._fingerprints + 1
+        return f, i1, self._other(i1, f)
+
+    def _other(self, i: int, f: int) -> int:
+        return i ^ (f * GOLDEN_RATIO_64 & MASK64) >> self._shift
+
+    def _put(self, i: int, f: int) -> bool:
+        s = i * self.SLOTS
+        for j in range(s, s + self.SLOTS):
+            if self.slots[j] == 0:
+                self.slots[j] = f
+                return True
+        return False
+
+    def add(self, key) -> bool:
+        """Adds key. Returns False if the filter is too full to place it."""
+        f, i1, i2 = self._locate(key)
+        if self._put(i1, f) or self._put(i2, f):
+            self.size += 1
+            return True
+        i = self._rng.choice((i1, i2))
+        kicked = []
+        for _ in range(self.max_kicks):
+            j = i * self.SLOTS + self._rng.randrange(self.SLOTS)
+            kicked.append((j, self.slots[j]))
+            f, self.slots[j] = self.slots[j], f
+            i = self._other(i, f)
+            if self._put(i, f):
+                self.size += 1
+                return True
+        # Undo the evictions so no fingerprint that was in the filter is lost
+        for j, previous in reversed(kicked):
+            self.slots[j] = previous
+        return False
+
+    def __contains__(self, key) -> bool:
+        f, i1, i2 = self._locate(key)
+        s1, s2 = i1 * self.SLOTS, i2 * self.SLOTS
+        return f in self.slots[s1 : s1 + self.SLOTS] or f in self.slots[s2 : s2 + self.SLOTS]
+
+    def remove(self, key) -> bool:
+        """Removes one copy of key. Only remove keys that were added."""
+        f, i1, i2 = self._locate(key)
+        for i in (i1, i2):
+            s = i * self.SLOTS
+            for j in range(s, s + self.SLOTS):
+                if self.slots[j] == f:
+                    self.slots[j] = 0
+                    self.size -= 1
+                    return True
+        return False
+
+
+class FilteredTable:
+    """
+    Puts a filter in front of a hash table so lookups of keys that were
+    never inserted return without touching the table. Works with the
+    English tables (insert/search/get/delete, as in L13) and the Spanish
+    ones (insertar/obtener/eliminar, as in tablas_hash); any other
+    attribute is read from the table.
+
+    The filter only learns the keys inserted through the wrapper, so attach
+    it to an empty table. Deletes remove the key from filters that support
+    it (CuckooFilter); in a Bloom filter the key stays and only costs a
+    false positive. If the filter cannot take a key (a full CuckooFilter),
+    it is dropped and every lookup goes to the table from then on, since a
+    key missing from the filter would be a false negative.
+
+    Parameters
+    ----------
+    table:
+        The hash table.
+    filter:
+        A BloomFilter, BlockedBloomFilter or CuckooFilter.
+    key: Callable
+        Function extracting the key of an element. Defaults to the key of
+        the table (HashTable.key) or the element itself.
+    """
+
+    def __init__(self, table, filter, key=None) -> None:
+        self.table = table
+        self.filter = filter
+        self._key = key or getattr(table, "key", None) or (lambda e: e)
+
+    # Methods of the tables that add keys without going through the wrapper
+    _UNFILTERED = ("from_file", "poner_si_ausente", "calcular_si_ausente")
+
+    def __getattr__(self, name):
+        if name in FilteredTable._UNFILTERED:
+            raise AttributeError(f"{name} would bypass the filter, call it on the table")
+        return getattr(self.table, name)
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def _add(self, k) -> None:
+        # Bloom filters always accept a key (add returns None)
+        if self.filter is not None and self.filter.add(k) is False:
+            self.filter = None
+
+    def _may_contain(self, k) -> bool:
+        return self.filter is None or k in self.filter
+
+    def _remove(self, k) -> None:
+        if self.filter is not None and hasattr(self.filter, "remove"):
+            self.filter.remove(k)
+
+    # L13 - hash_table.py
+
+    def insert(self, e) -> bool:
+        inserted = self.table.insert(e)
+        if inserted:
+            self._add(self._key(e))
+        return inserted
+
+    def upsert(self, e) -> bool:
+        inserted = self.table.upsert(e)
+        if inserted:
+            self._add(self._key(e))
+        return inserted
+
+    def insert_many(self, A) -> int:
+        return sum(self.insert(e) for e in A)
+
+    def search(self, e) -> bool:
+        return self._may_contain(self._key(e)) and self.table.search(e)
+
+    def search_many(self, A) -> list[bool]:
+        return [self.search(e) for e in A]
+
+    def get(self, k):
+        return self.table.get(k) if self._may_contain(k) else None
+
+    def delete(self, e) -> bool:
+        deleted = self.table.delete(e)
+        if deleted:
+            self._remove(self._key(e))
+        return deleted
+
+    def delete_many(self, A) -> int:
+        return sum(self.delete(e) for e in A)
+
+    # tablas_hash.py
+
+    def insertar(self, clave, *valor) -> None:
+        # insertar no dice si la clave era nueva: solo se agrega si no está
+        if not self._may_contain(clave) or not self.table.obtener(clave):
+            self._add(clave)
+        self.table.insertar(clave, *valor)
+
+    def obtener(self, clave):
+        return self._may_contain(clave) and self.table.obtener(clave)
+
+    def eliminar(self, clave) -> bool:
+        eliminada = self.table.eliminar(clave)
+        if eliminada:
+            self._remove(clave)
+        return eliminada
+
+
+if __name__ == "__main__":
+    from functools import partial
+    from importlib import import_module
+    from time import perf_counter
+
+    import tablas_hash
+
+    hash_table = import_module("L13 - hash_table")
+
+    N = 100_000
+    keys = [tablas_hash.generar_clave() for _ in range(N)]
+    absent = [tablas_hash.generar_clave(9) for _ in range(N)]
+
+    filters = {
+        "bloom": lambda: BloomFilter(N, 0.01, seed=1),
+        "blocked bloom": lambda: BlockedBloomFilter(N, 0.01, seed=1),
+        "cuckoo": lambda: CuckooFilter(N, 0.01, seed=1),
+    }
+
+    # Configured vs measured false positive rate, and memory
+    for name, new_filter in filters.items():
+        f = new_filter()
+        for k in keys:
+            f.add(k)
+        measured = sum(k in f for k in absent) / N
+        print(
+            f"{name:>13}: configured fp={f.fp_rate:.2%} measured fp={measured:.2%} "
+            f"{f.nbytes() * 8 / N:.1f} bits per key, {f.nbytes()} bytes"
+        )
+    print(all(k in f for k in keys))
+    # True
+
+    # Miss-heavy lookups: 90% of the queries are not in the table
+    queries = keys[: N // 10] + absent[: N - N // 10]
+    random.shuffle(queries)
+    tables = {
+        "HashTable (L13)": (
+            lambda: hash_table.HashTable([], partial(hash_table.hash_code, m=N)),
+            "insert",
+            "search",
+        ),
+        "encadenamiento": (lambda: tablas_hash.HashTableChaining(tamaño=N), "insertar", "obtener"),
+        # Long chains: 8 keys per bucket on average
+        "encadenamiento (carga 8)": (
+            lambda: tablas_hash.HashTableChaining(tamaño=N // 8, factor_max=8),
+            "insertar",
+            "obtener",
+        ),
+        "direccionamiento abierto": (
+            lambda: tablas_hash.HashTableOpenAddressing(tamaño=N), "insertar", "obtener"
+        ),
+    }
+    for table_name, (new_table, insert, lookup) in tables.items():
+        for filter_name, new_filter in (("no filter", None), *filters.items()):
+            table = new_table()
+            if new_filter is not None:
+                table = FilteredTable(table, new_filter())
+            for k in keys:
+                getattr(table, insert)(k)
+            search = getattr(table, lookup)
+            start = perf_counter()
+            hits = sum(1 for k in queries if search(k))
+            elapsed = perf_counter() - start
+            print(
+                f"{table_name:>24} + {filter_name:<13}: {hits} hits, "
+                f"{elapsed / len(queries) * 1e9:.0f} ns per lookup"
+            )
@@ -1,53 +1,227 @@
+import csv
+import gc
+import json
+import platform
 import random
+import threading
 import time
+import tracemalloc
+from array import array
+
+# Marcas privadas: ningún objeto del usuario es idéntico (is) a ellas
+_BORRADO = object()
+_VACIO = object()
+
+_MASCARA64 = (1 << 64) - 1
+
+# Las tablas que guardan el hash completo de cada clave (Robin Hood,
+# compacta, cuckoo, hopscotch) llaman a funcion_hash(clave, _RANGO_HASH): el
+# resultado no depende del tamaño de la tabla y cabe en un entero con signo
+# de 64 bits (array "q").
+_RANGO_HASH = 1 << 63
+
+
+def _hash_completo(funcion_hash):
+    if funcion_hash is None:
+        return hash
+    return lambda clave: funcion_hash(clave, _RANGO_HASH)
 
 class Nodo:
+    __slots__ = ("clave", "siguiente")  # Sin __dict__ por nodo: menos memoria
+
     def __init__(self, clave):
         self.clave = clave  # Solo guardamos la clave
         self.siguiente = None  # Inicialmente, el siguiente nodo en None
 
+
+class _ReservaTabla:
+    """
+    Arreglo de None que se prepara poco a poco para el siguiente rehash.
+
+    Crear [None] * n (o liberar la tabla vieja) de golpe cuesta O(n) en una
+    sola operación. La reserva reutiliza la tabla vieja al terminar un
+    rehash y la limpia, alarga o recorta por partes en cada operación, de
+    modo que al empezar el siguiente rehash la tabla nueva ya está lista.
+    """
+
+    def __init__(self):
+        self.lista = []
+        self.limpias = 0  # Las casillas [0, limpias) ya valen None
+
+    def reciclar(self, tabla, limpia):
+        self.lista = tabla
+        self.limpias = len(tabla) if limpia else 0
+
+    def avanzar(self, objetivo, operaciones):
+        # Reparte el trabajo pendiente entre las `operaciones` que faltan
+        lista = self.lista
+        pendiente = len(lista) - self.limpias + abs(objetivo - len(lista))
+        cuota = pendiente // max(operaciones, 1) + 16
+        n = min(cuota, len(lista) - self.limpias, max(objetivo - self.limpias, 0))
+        if n > 0:
+            lista[self.limpias:self.limpias + n] = [None] * n
+            self.limpias += n
+            cuota -= n
+        if len(lista) < objetivo:
+            lista.extend([None] * min(cuota, objetivo - len(lista)))
+        elif len(lista) > objetivo:
+            del lista[max(objetivo, len(lista) - cuota):]
+        self.limpias = min(self.limpias, len(lista))
+
+    def tomar(self, tamaño):
+        lista = self.lista
+        del lista[tamaño:]
+        lista[self.limpias:] = [None] * (len(lista) - self.limpias)
+        lista.extend([None] * (tamaño - len(lista)))
+        self.lista = []
+        self.limpias = 0
+        return lista
+
+
 class HashTableChaining:
-    
-    def __init__(self, tamaño=100):
+    """
+    Tabla hash con encadenamiento que crece y se encoge sola.
+
+    Cuando num_elementos / tamaño supera factor_max la tabla duplica su
+    tamaño, y cuando baja de factor_min se reduce a la mitad (nunca por
+    debajo del tamaño inicial). El rehash es incremental: mientras dura,
+    conviven la tabla vieja y la nueva, y cada operación mueve solo
+    paso_migracion cubetas de la vieja a la nueva, así ninguna operación
+    paga el costo de mover toda la tabla de una vez. La tabla nueva también
+    se prepara por partes (ver _ReservaTabla).
+
+    funcion_hash(clave, tamaño) permite cambiar hash(clave) % tamaño por
+    cualquiera de las funciones de hash_functions.py.
+    """
+
+    def __init__(self, tamaño=100, factor_max=1.0, factor_min=0.25, paso_migracion=4,
+                 funcion_hash=None):
         self.tamaño = tamaño  # Tamaño de la tabla hash
         self.tabla = [None] * tamaño  # creamos la tabla dependiendo del tamaño que el usuario pida.
+        self.tamaño_minimo = tamaño
+        self.factor_max = factor_max
+        self.factor_min = factor_min
+        self.paso_migracion = paso_migracion
+        self.num_elementos = 0
+        self._nueva = None  # Tabla destino mientras hay un rehash en curso
+        self._tamaño_nuevo = 0
+        self._migradas = 0  # Cubetas de self.tabla que ya se movieron a la nueva
+        self._reserva = _ReservaTabla()
+        self.funcion_hash = funcion_hash
 
-    def _hash(self, clave):
-        return hash(clave) % self.tamaño # Multiplicamos por el módulo del tamaño del arreglo para hacer más propenso a colisiones.
+    def _hash(self, clave, tamaño=None):
+        if self.funcion_hash is not None:
+            return self.funcion_hash(clave, tamaño or self.tamaño)
+        return hash(clave) % (tamaño or self.tamaño) # Multiplicamos por el módulo del tamaño del arreglo para hacer más propenso a colisiones.
 
-    def insertar(self, clave):
-        # Calculamos el índice de la clave utilizando la función hash
-        indice = self._hash(clave)
-        
-        nodo = self.tabla[indice]  # Obtenemos el nodo en esa posición de la tabla
+    def factor_carga(self):
+        return self.num_elementos / (self._tamaño_nuevo if self._nueva else self.tamaño)
 
-        # Si la clave ya existe, no la insertamos de nuevo
-        while nodo:
-            
-            if nodo.clave == clave:
-                return  # La clave ya existe, no la insertamos de nuevo
-            nodo = nodo.siguiente # Si existe un nodo recorremos sus nodos hasta el ultimo
+    def _iniciar_rehash(self, nuevo_tamaño):
+        self._nueva = self._reserva.tomar(nuevo_tamaño)
+        self._tamaño_nuevo = nuevo_tamaño
+        self._migradas = 0
 
-        # Si no existe, insertamos la clave al inicio de la lista enlazada en ese índice
-        nuevo_nodo = Nodo(clave)
-        nuevo_nodo.siguiente = self.tabla[indice]  # hacemos que el nodo apunte al siguiente nodo o a null si no existe siguiente nodo.
-        self.tabla[indice] = nuevo_nodo  # El nuevo nodo se convierte en el primer nodo en esa posición
+    def _migrar(self):
+        # Mueve las siguientes cubetas de la tabla vieja a la nueva, reutilizando los nodos.
+        # Devuelve True si con este paso terminó el rehash.
+        if self._nueva is None:
+            return False
+        fin = min(self._migradas + self.paso_migracion, self.tamaño)
+        for i in range(self._migradas, fin):
+            nodo = self.tabla[i]
+            while nodo:
+                siguiente = nodo.siguiente
+                indice = self._hash(nodo.clave, self._tamaño_nuevo)
+                nodo.siguiente = self._nueva[indice]
+                self._nueva[indice] = nodo
+                nodo = siguiente
+            self.tabla[i] = None
+        self._migradas = fin
+        if fin == self.tamaño:  # Rehash terminado
+            self._reserva.reciclar(self.tabla, limpia=True)  # Quedó vacía
+            self.tabla = self._nueva
+            self.tamaño = self._tamaño_nuevo
+            self._nueva = None
+            return True
+        return False
 
-    def obtener(self, clave):
-        
-        indice = self._hash(clave)
-        nodo = self.tabla[indice]
+    def _encogimiento_atrasado(self):
+        # Los elementos bajaron tanto durante un encogimiento que la tabla
+        # destino ya quedó grande: se termina de migrar de una vez. Cuesta
+        # O(tamaño), pero desde que empezó hubo al menos factor_min *
+        # tamaño / 2 eliminaciones.
+        return (self._tamaño_nuevo < self.tamaño
+                and self.num_elementos < self.factor_min * self._tamaño_nuevo)
 
+    def _tamaño_encogido(self):
+        # La mitad, o menos si ni así se llega a factor_min, para que una
+        # tabla que se vació no tenga que encogerse mitad por mitad
+        tamaño = max(self.tamaño // 2, self.tamaño_minimo)
+        while tamaño > self.tamaño_minimo and self.num_elementos < self.factor_min * tamaño:
+            tamaño = max(tamaño // 2, self.tamaño_minimo)
+        return tamaño
+
+    def _comprobar_factor(self):
+        if self._nueva is not None:
+            if not self._encogimiento_atrasado():
+                return
+            while not self._migrar():
+                pass
+        limite_max = self.factor_max * self.tamaño
+        limite_min = self.factor_min * self.tamaño
+        if self.num_elementos > limite_max:
+            self._iniciar_rehash(self.tamaño * 2)
+        elif self.tamaño > self.tamaño_minimo and self.num_elementos < limite_min:
+            self._iniciar_rehash(self._tamaño_encogido())
+        elif self.num_elementos > limite_max / 2:
+            # Cerca de crecer: preparar la tabla del doble de tamaño
+            self._reserva.avanzar(self.tamaño * 2, int(limite_max) - self.num_elementos)
+        elif self.tamaño > self.tamaño_minimo and self.num_elementos < 2 * limite_min:
+            self._reserva.avanzar(max(self.tamaño // 2, self.tamaño_minimo), self.num_elementos - int(limite_min))
+
+    def _contiene(self, tabla, tamaño, clave):
+        nodo = tabla[self._hash(clave, tamaño)]
         while nodo:
             if nodo.clave == clave:
-                return True  # La clave existe en la tabla
+                return True
             nodo = nodo.siguiente
+        return False
+
+    def insertar(self, clave):
+        self._migrar()
+
+        # Si la clave ya existe (en cualquiera de las dos tablas), no la insertamos de nuevo
+        if self._contiene(self.tabla, self.tamaño, clave):
+            return
+        if self._nueva is not None and self._contiene(self._nueva, self._tamaño_nuevo, clave):
+            return
+
+        # Durante un rehash las claves nuevas van directo a la tabla nueva
+        if self._nueva is not None:
+            tabla, indice = self._nueva, self._hash(clave, self._tamaño_nuevo)
+        else:
+            tabla, indice = self.tabla, self._hash(clave)
+
+        # Insertamos la clave al inicio de la lista enlazada en ese índice
+        nuevo_nodo = Nodo(clave)
+        nuevo_nodo.siguiente = tabla[indice]  # hacemos que el nodo apunte al siguiente nodo o a null si no existe siguiente nodo.
+        tabla[indice] = nuevo_nodo  # El nuevo nodo se convierte en el primer nodo en esa posición
+        self.num_elementos += 1
+        self._comprobar_factor()
+
+    def obtener(self, clave):
+        if self._migrar():
+            self._comprobar_factor()  # Una tabla que solo se consulta también se encoge
+        if self._contiene(self.tabla, self.tamaño, clave):
+            return True  # La clave existe en la tabla
+        if self._nueva is not None:
+            return self._contiene(self._nueva, self._tamaño_nuevo, clave)
         return False  # La clave no está presente
 
-    def eliminar(self, clave):
-       
-        indice = self._hash(clave)
-        nodo = self.tabla[indice]
+    def _eliminar_de(self, tabla, tamaño, clave):
+        indice = self._hash(clave, tamaño)
+        nodo = tabla[indice]
         anterior = None
 
         while nodo:
@@ -55,107 +229,1169 @@ class HashTableChaining:
                 if anterior:
                     anterior.siguiente = nodo.siguiente
                 else:
-                    self.tabla[indice] = nodo.siguiente
+                    tabla[indice] = nodo.siguiente
                 return True  # La clave fue eliminada
             anterior = nodo
             nodo = nodo.siguiente
         return False  # La clave no existe en la tabla
 
+    def eliminar(self, clave):
+        self._migrar()
+        eliminada = self._eliminar_de(self.tabla, self.tamaño, clave)
+        if not eliminada and self._nueva is not None:
+            eliminada = self._eliminar_de(self._nueva, self._tamaño_nuevo, clave)
+        if eliminada:
+            self.num_elementos -= 1
+            self._comprobar_factor()
+        return eliminada
+
 
 class HashTableOpenAddressing:
-    
-    def __init__(self, tamaño=10):
+    """
+    Tabla hash con direccionamiento abierto (sondeo lineal) que crece y se
+    encoge sola.
+
+    El factor de carga cuenta también las casillas marcadas como borradas,
+    porque alargan los sondeos igual que las claves. Al superar factor_max se
+    hace un rehash: al doble del tamaño si las claves ocupan más de la mitad
+    de ese límite, o al mismo tamaño si lo que sobra son marcas de borrado.
+    Al bajar de factor_min se reduce a la mitad. Igual que en
+    HashTableChaining, el rehash es incremental (al menos paso_migracion
+    casillas por operación, más si la tabla nueva pasaría de factor_max antes
+    de terminar), por eso factor_max debe dejar sitio libre (< 1). La tabla
+    nueva también se prepara por partes (ver _ReservaTabla). funcion_hash
+    funciona igual que en HashTableChaining.
+    """
+
+    def __init__(self, tamaño=10, factor_max=0.7, factor_min=0.1, paso_migracion=8,
+                 funcion_hash=None):
+        if not 0 < factor_max < 1:
+            raise ValueError("factor_max debe estar entre 0 y 1")
         self.tamaño = tamaño
         self.tabla = [None] * tamaño
-        self.marcador_borrado = "<BORRADO>" # necesario por si se borra un elemento pero ya existia desplzamiento de indices.
+        self.marcador_borrado = _BORRADO # necesario por si se borra un elemento pero ya existia desplzamiento de indices.
+        self.tamaño_minimo = tamaño
+        self.factor_max = factor_max
+        self.factor_min = factor_min
+        self.paso_migracion = paso_migracion
+        self.num_elementos = 0
+        self._ocupadas = 0  # Claves + marcas de borrado en la tabla donde se inserta
+        self._nueva = None  # Tabla destino mientras hay un rehash en curso
+        self._tamaño_nuevo = 0
+        self._migradas = 0
+        self._ultimo_vacio = -1  # Última casilla migrada que ya estaba en None
+        self._paso = paso_migracion  # Casillas por operación del rehash en curso
+        self._sondeadas = 0  # Casillas de la tabla vieja recorridas desde el último paso
+        self._reserva = _ReservaTabla()
+        self.funcion_hash = funcion_hash
 
-    def _hash(self, clave):
-        return hash(clave) % self.tamaño
+    def _hash(self, clave, tamaño=None):
+        if self.funcion_hash is not None:
+            return self.funcion_hash(clave, tamaño or self.tamaño)
+        return hash(clave) % (tamaño or self.tamaño)
 
-    def insertar(self, clave):
-        
+    def factor_carga(self):
+        return self._ocupadas / (self._tamaño_nuevo if self._nueva else self.tamaño)
+
+    def _buscar_en(self, tabla, tamaño, clave):
+        # Devuelve (índice de la clave o -1, primera casilla libre o borrada del sondeo)
+        indice = self._hash(clave, tamaño)
+        libre = -1
+        for i in range(tamaño):
+            nuevo_indice = (indice + i) % tamaño
+            actual = tabla[nuevo_indice]
+            if actual is None:
+                return -1, (libre if libre != -1 else nuevo_indice)
+            if actual is self.marcador_borrado:
+                if libre == -1:
+                    libre = nuevo_indice
+            elif actual == clave:
+                return nuevo_indice, libre
+        return -1, libre
+
+    def _buscar_vieja(self, clave):
+        # Índice de la clave en self.tabla o -1. Durante un rehash las
+        # casillas migradas [0, _migradas) quedan en None; un sondeo que
+        # pasaría por ellas sin encontrar un None original salta a _migradas.
+        # Lo recorrido se suma al siguiente paso de migración: un cúmulo largo
+        # en la tabla vieja se migra en vez de recorrerse una y otra vez.
+        if self._nueva is None:
+            return self._buscar_en(self.tabla, self.tamaño, clave)[0]
         indice = self._hash(clave)
-        
-        for i in range(self.tamaño):
-            
-            nuevo_indice = (indice + i) % self.tamaño
-            
-            if self.tabla[nuevo_indice] is None or self.tabla[nuevo_indice] == self.marcador_borrado:
-                self.tabla[nuevo_indice] = clave
+        if indice < self._migradas:
+            if self._ultimo_vacio >= indice:
+                return -1
+            indice = self._migradas
+        for rango in (range(indice, self.tamaño), range(self._migradas, indice)):
+            for i in rango:
+                self._sondeadas += 1
+                actual = self.tabla[i]
+                if actual is None:
+                    return -1
+                if actual is not self.marcador_borrado and actual == clave:
+                    return i
+            if self._ultimo_vacio != -1:  # El sondeo se cortaba al dar la vuelta
+                return -1
+        return -1
+
+    def _iniciar_rehash(self, nuevo_tamaño):
+        self._nueva = self._reserva.tomar(nuevo_tamaño)
+        self._tamaño_nuevo = nuevo_tamaño
+        self._migradas = 0
+        self._ultimo_vacio = -1
+        self._ocupadas = 0
+        # Mientras dura el rehash cada operación puede ocupar una casilla más
+        # de la tabla nueva, y no se vuelve a comprobar su factor hasta que
+        # termine. Se migra lo bastante rápido para acabar antes de que las
+        # claves que ya había más esas operaciones pasen de factor_max.
+        holgura = max(int(self.factor_max * nuevo_tamaño) - self.num_elementos, 1)
+        self._paso = max(self.paso_migracion, -(-self.tamaño // holgura))
+
+    def _migrar(self):
+        # Devuelve True si con este paso terminó el rehash
+        if self._nueva is None:
+            return False
+        fin = min(self._migradas + max(self._paso, self._sondeadas), self.tamaño)
+        self._sondeadas = 0
+        for i in range(self._migradas, fin):
+            clave = self.tabla[i]
+            if clave is None:
+                self._ultimo_vacio = i
+                continue
+            if clave is not self.marcador_borrado:
+                # La clave no puede estar en la tabla nueva: basta la primera casilla libre
+                _, libre = self._buscar_en(self._nueva, self._tamaño_nuevo, clave)
+                if self._nueva[libre] is None:
+                    self._ocupadas += 1
+                self._nueva[libre] = clave
+            # _buscar_vieja salta las casillas migradas, así que pueden quedar en None
+            self.tabla[i] = None
+        self._migradas = fin
+        if fin == self.tamaño:  # Rehash terminado
+            self._reserva.reciclar(self.tabla, limpia=True)
+            self.tabla = self._nueva
+            self.tamaño = self._tamaño_nuevo
+            self._nueva = None
+            return True
+        return False
+
+    def _encogimiento_atrasado(self):
+        # Los elementos bajaron tanto durante un encogimiento que la tabla
+        # destino ya quedó grande: se termina de migrar de una vez. Cuesta
+        # O(tamaño), pero desde que empezó hubo al menos factor_min *
+        # tamaño / 2 eliminaciones.
+        return (self._tamaño_nuevo < self.tamaño
+                and self.num_elementos < self.factor_min * self._tamaño_nuevo)
+
+    def _tamaño_encogido(self):
+        # La mitad, o menos si ni así se llega a factor_min, para que una
+        # tabla que se vació no tenga que encogerse mitad por mitad
+        tamaño = max(self.tamaño // 2, self.tamaño_minimo)
+        while tamaño > self.tamaño_minimo and self.num_elementos < self.factor_min * tamaño:
+            tamaño = max(tamaño // 2, self.tamaño_minimo)
+        return tamaño
+
+    def _comprobar_factor(self):
+        if self._nueva is not None:
+            if not self._encogimiento_atrasado():
                 return
-            if self.tabla[nuevo_indice] == clave:
-                return  # Ya existe, no insertamos de nuevo
+            while not self._migrar():
+                pass
+        limite_max = self.factor_max * self.tamaño
+        limite_min = self.factor_min * self.tamaño
+        if self._ocupadas > limite_max:
+            if self.num_elementos > limite_max / 2:
+                self._iniciar_rehash(self.tamaño * 2)
+            else:
+                self._iniciar_rehash(self.tamaño)  # Solo limpia las marcas de borrado
+        elif self.tamaño > self.tamaño_minimo and self.num_elementos < limite_min:
+            self._iniciar_rehash(self._tamaño_encogido())
+        elif self._ocupadas > limite_max / 2:
+            # Cerca de crecer: preparar la tabla del doble de tamaño
+            self._reserva.avanzar(self.tamaño * 2, int(limite_max) - self._ocupadas)
+        elif self.tamaño > self.tamaño_minimo and self.num_elementos < 2 * limite_min:
+            self._reserva.avanzar(max(self.tamaño // 2, self.tamaño_minimo), self.num_elementos - int(limite_min))
+
+    def insertar(self, clave):
+        if self._migrar():
+            self._comprobar_factor()  # Aunque la clave ya exista y se salga antes
+
+        if self._nueva is None:
+            tabla = self.tabla
+            encontrada, libre = self._buscar_en(tabla, self.tamaño, clave)
+        else:
+            if self._buscar_vieja(clave) != -1:
+                return
+            # Durante un rehash las claves nuevas van directo a la tabla nueva
+            tabla = self._nueva
+            encontrada, libre = self._buscar_en(tabla, self._tamaño_nuevo, clave)
+        if encontrada != -1:
+            return  # Ya existe, no insertamos de nuevo
+        if libre == -1:
+            raise RuntimeError("Tabla llena")
+        if tabla[libre] is None:
+            self._ocupadas += 1
+        tabla[libre] = clave
+        self.num_elementos += 1
+        self._comprobar_factor()
 
     def obtener(self, clave):
-        indice = self._hash(clave)
-        for i in range(self.tamaño):
-            nuevo_indice = (indice + i) % self.tamaño
-            if self.tabla[nuevo_indice] is None:
-                return False 
-            if self.tabla[nuevo_indice] == clave:
-                return True
+        if self._migrar():
+            self._comprobar_factor()  # Una tabla que solo se consulta también se encoge
+        if self._buscar_vieja(clave) != -1:
+            return True
+        if self._nueva is not None:
+            return self._buscar_en(self._nueva, self._tamaño_nuevo, clave)[0] != -1
         return False
 
     def eliminar(self, clave):
-        indice = self._hash(clave)
-        for i in range(self.tamaño):
-            nuevo_indice = (indice + i) % self.tamaño
-            if self.tabla[nuevo_indice] is None:
+        if self._migrar():
+            self._comprobar_factor()
+        tabla = self.tabla
+        indice = self._buscar_vieja(clave)
+        if indice == -1 and self._nueva is not None:
+            tabla = self._nueva
+            indice = self._buscar_en(tabla, self._tamaño_nuevo, clave)[0]
+        if indice == -1:
+            return False
+        tabla[indice] = self.marcador_borrado
+        self.num_elementos -= 1
+        self._comprobar_factor()
+        return True
+
+
+class HashTableRobinHood:
+    """
+    Tabla hash con direccionamiento abierto y hashing Robin Hood.
+
+    Al insertar, si la clave que ocupa una casilla está más cerca de su
+    posición ideal que la clave que se inserta, se intercambian y se sigue
+    insertando la desplazada ("se le quita al rico para darle al pobre").
+    Así todas las claves quedan a una distancia parecida de su casilla
+    ideal, y una búsqueda puede parar en cuanto encuentra una clave más
+    cercana a su casilla que la distancia recorrida. Al eliminar no se dejan
+    marcas de borrado: las claves siguientes se recorren una casilla hacia
+    atrás (backward shift), así los sondeos nunca se alargan con el uso.
+
+    El hash completo de cada clave se guarda junto a ella, de modo que solo
+    se llama a __eq__ cuando los hashes coinciden. El tamaño es siempre una
+    potencia de 2 y se duplica (de una vez) al superar factor_max.
+
+    funcion_hash(clave, tamaño) reemplaza a hash(clave), igual que en
+    HashTableChaining; se llama con tamaño = 2**63 y se guarda el resultado.
+    Como la casilla son los bits bajos del hash, la función debe mezclarlos
+    bien (SeededHash o TabulationHash, no fibonacci_hash).
+    """
+
+    def __init__(self, tamaño=16, factor_max=0.9, funcion_hash=None):
+        if not 0 < factor_max < 1:
+            raise ValueError("factor_max debe estar entre 0 y 1")
+        self.tamaño = 1 << max(tamaño - 1, 1).bit_length()  # Potencia de 2 >= tamaño
+        self.factor_max = factor_max
+        self.num_elementos = 0
+        self.claves = [_VACIO] * self.tamaño
+        self.hashes = [0] * self.tamaño
+        self.funcion_hash = funcion_hash
+        self._hash = _hash_completo(funcion_hash)
+
+    def factor_carga(self):
+        return self.num_elementos / self.tamaño
+
+    def _buscar(self, clave, h):
+        # Devuelve el índice de la clave o -1
+        claves, hashes = self.claves, self.hashes
+        mascara = self.tamaño - 1
+        i = h & mascara
+        distancia = 0
+        while True:
+            actual = claves[i]
+            if actual is _VACIO:
+                return -1
+            ha = hashes[i]
+            if ha == h and (actual is clave or actual == clave):
+                return i
+            if (i - ha) & mascara < distancia:
+                return -1  # Esa clave está más cerca de su casilla: la buscada no está
+            i = (i + 1) & mascara
+            distancia += 1
+
+    def _colocar(self, clave, h):
+        # Inserta una clave que se sabe que no está en la tabla
+        claves, hashes = self.claves, self.hashes
+        mascara = self.tamaño - 1
+        i = h & mascara
+        distancia = 0
+        while True:
+            actual = claves[i]
+            if actual is _VACIO:
+                claves[i] = clave
+                hashes[i] = h
+                return
+            distancia_actual = (i - hashes[i]) & mascara
+            if distancia_actual < distancia:
+                claves[i], clave = clave, actual
+                hashes[i], h = h, hashes[i]
+                distancia = distancia_actual
+            i = (i + 1) & mascara
+            distancia += 1
+
+    def _redimensionar(self, nuevo_tamaño):
+        claves, hashes = self.claves, self.hashes
+        self.tamaño = nuevo_tamaño
+        self.claves = [_VACIO] * nuevo_tamaño
+        self.hashes = [0] * nuevo_tamaño
+        for clave, h in zip(claves, hashes):
+            if clave is not _VACIO:
+                self._colocar(clave, h)
+
+    def insertar(self, clave):
+        h = self._hash(clave)
+        if self._buscar(clave, h) != -1:
+            return  # Ya existe, no insertamos de nuevo
+        if self.num_elementos + 1 > self.factor_max * self.tamaño:
+            self._redimensionar(self.tamaño * 2)
+        self._colocar(clave, h)
+        self.num_elementos += 1
+
+    def obtener(self, clave):
+        return self._buscar(clave, self._hash(clave)) != -1
+
+    def eliminar(self, clave):
+        i = self._buscar(clave, self._hash(clave))
+        if i == -1:
+            return False
+        claves, hashes = self.claves, self.hashes
+        mascara = self.tamaño - 1
+        # Backward shift: recorre hacia atrás las claves que no están en su casilla ideal
+        siguiente = (i + 1) & mascara
+        while claves[siguiente] is not _VACIO and (siguiente - hashes[siguiente]) & mascara != 0:
+            claves[i] = claves[siguiente]
+            hashes[i] = hashes[siguiente]
+            i = siguiente
+            siguiente = (i + 1) & mascara
+        claves[i] = _VACIO
+        hashes[i] = 0
+        self.num_elementos -= 1
+        return True
+
+
+class HashSetCompacto:
+    """
+    Conjunto hash con encadenamiento guardado como "estructura de arreglos".
+
+    En lugar de un objeto Nodo por clave, cada clave ocupa una posición i en
+    tres arreglos paralelos: claves[i] (referencia a la clave), hashes[i]
+    (su hash) y siguientes[i] (posición del siguiente elemento de la cadena,
+    o -1). cabezas[c] es la primera posición de la cubeta c. hashes,
+    siguientes y cabezas son array.array de enteros de 8 bytes, sin un
+    objeto de Python por entrada. Las posiciones eliminadas se reutilizan
+    mediante una lista de libres encadenada en siguientes.
+
+    Al superar factor_max la tabla de cabezas se duplica y las cadenas se
+    reconstruyen con los hashes guardados, sin volver a llamar a hash().
+
+    funcion_hash(clave, tamaño) reemplaza a hash(clave), igual que en
+    HashTableChaining; se llama con tamaño = 2**63 y se guarda el resultado.
+    """
+
+    def __init__(self, tamaño=100, factor_max=1.0, funcion_hash=None):
+        self.tamaño = tamaño
+        self.factor_max = factor_max
+        self.num_elementos = 0
+        self.cabezas = array("q", [-1]) * tamaño
+        self.claves = []
+        self.hashes = array("q")
+        self.siguientes = array("q")
+        self._libre = -1  # Primera posición libre (lista encadenada en siguientes)
+        self.funcion_hash = funcion_hash
+        self._hash = _hash_completo(funcion_hash)
+
+    def factor_carga(self):
+        return self.num_elementos / self.tamaño
+
+    def _redimensionar(self, nuevo_tamaño):
+        self.tamaño = nuevo_tamaño
+        if self._libre != -1:
+            # Se aprovecha para descartar las posiciones libres
+            vivas = [i for i, clave in enumerate(self.claves) if clave is not _VACIO]
+            self.claves = [self.claves[i] for i in vivas]
+            self.hashes = array("q", (self.hashes[i] for i in vivas))
+            self.siguientes = array("q", [-1]) * len(vivas)
+            self._libre = -1
+        cabezas = array("q", [-1]) * nuevo_tamaño
+        siguientes = self.siguientes
+        for i, h in enumerate(self.hashes):
+            c = h % nuevo_tamaño
+            siguientes[i] = cabezas[c]
+            cabezas[c] = i
+        self.cabezas = cabezas
+
+    def _buscar(self, clave, h):
+        # Devuelve (posición de la clave o -1, posición anterior en la cadena o -1)
+        claves, hashes, siguientes = self.claves, self.hashes, self.siguientes
+        anterior = -1
+        i = self.cabezas[h % self.tamaño]
+        while i != -1:
+            if hashes[i] == h:
+                actual = claves[i]
+                if actual is clave or actual == clave:
+                    return i, anterior
+            anterior = i
+            i = siguientes[i]
+        return -1, -1
+
+    def insertar(self, clave):
+        h = self._hash(clave)
+        if self._buscar(clave, h)[0] != -1:
+            return  # La clave ya existe, no la insertamos de nuevo
+        if self.num_elementos + 1 > self.factor_max * self.tamaño:
+            self._redimensionar(self.tamaño * 2)
+        c = h % self.tamaño
+        if self._libre != -1:
+            i = self._libre
+            self._libre = self.siguientes[i]
+            self.claves[i] = clave
+            self.hashes[i] = h
+            self.siguientes[i] = self.cabezas[c]
+        else:
+            i = len(self.claves)
+            self.claves.append(clave)
+            self.hashes.append(h)
+            self.siguientes.append(self.cabezas[c])
+        self.cabezas[c] = i
+        self.num_elementos += 1
+
+    def obtener(self, clave):
+        return self._buscar(clave, self._hash(clave))[0] != -1
+
+    def eliminar(self, clave):
+        h = self._hash(clave)
+        i, anterior = self._buscar(clave, h)
+        if i == -1:
+            return False  # La clave no existe en la tabla
+        if anterior == -1:
+            self.cabezas[h % self.tamaño] = self.siguientes[i]
+        else:
+            self.siguientes[anterior] = self.siguientes[i]
+        self.claves[i] = _VACIO  # Suelta la referencia a la clave
+        self.siguientes[i] = self._libre
+        self._libre = i
+        self.num_elementos -= 1
+        return True
+
+
+class HashTableCuckoo:
+    """
+    Tabla hash cuckoo: cada clave solo puede estar en una cubeta de cada una
+    de las num_tablas tablas (cada cubeta con `ranuras` lugares) o en un
+    pequeño stash. Una búsqueda revisa a lo más num_tablas cubetas más el
+    stash, así que su costo en el peor caso es constante.
+
+    Al insertar, si todas las cubetas de la clave están llenas se expulsa
+    una clave al azar y se reinserta en otra de sus cubetas, y así
+    sucesivamente (hasta max_desplazamientos). Si la cadena no termina, la
+    clave va al stash; si el stash está lleno, se hace un rehash al doble
+    con nuevas funciones hash. Con 2 tablas y 4 ranuras por cubeta la tabla
+    admite factores de carga mayores a 0.9.
+
+    Cada función hash es multiplicativa sobre hash(clave), con un
+    multiplicador impar aleatorio por tabla. histograma_sondeos() devuelve
+    cuántas búsquedas (obtener) necesitaron cada número de sondeos
+    (cubetas revisadas + claves del stash comparadas).
+
+    funcion_hash(clave, tamaño) reemplaza a hash(clave), igual que en
+    HashTableChaining; se llama con tamaño = 2**63 y los multiplicadores
+    se aplican a ese resultado.
+    """
+
+    def __init__(self, tamaño=16, num_tablas=2, ranuras=4, tam_stash=8, factor_max=0.9,
+                 max_desplazamientos=500, funcion_hash=None):
+        self.num_tablas = num_tablas
+        self.ranuras = ranuras
+        self.tam_stash = tam_stash
+        self.factor_max = factor_max
+        self.max_desplazamientos = max_desplazamientos
+        self.num_elementos = 0
+        self.sondeos = {}  # número de sondeos -> número de búsquedas
+        self._azar = random.Random()
+        self.funcion_hash = funcion_hash
+        self._hash = _hash_completo(funcion_hash)
+        self._crear_tablas(tamaño)
+
+    def _crear_tablas(self, tamaño):
+        cubetas = max(-(-tamaño // (self.num_tablas * self.ranuras)), 1)
+        self._bits = (cubetas - 1).bit_length()  # Cubetas por tabla: 2 ** _bits
+        self.tamaño = self.num_tablas * self.ranuras << self._bits
+        self.tablas = [[[] for _ in range(1 << self._bits)] for _ in range(self.num_tablas)]
+        self.stash = []
+        self._multiplicadores = [self._azar.getrandbits(64) | 1 for _ in range(self.num_tablas)]
+
+    def factor_carga(self):
+        return self.num_elementos / self.tamaño
+
+    def _cubetas(self, clave):
+        h = self._hash(clave) & _MASCARA64
+        desplazamiento = 64 - self._bits
+        return [tabla[(h * m & _MASCARA64) >> desplazamiento]
+                for tabla, m in zip(self.tablas, self._multiplicadores)]
+
+    def _buscar(self, clave):
+        # Devuelve (cubeta o stash que contiene la clave o None, sondeos)
+        sondeos = 0
+        for cubeta in self._cubetas(clave):
+            sondeos += 1
+            if clave in cubeta:
+                return cubeta, sondeos
+        for actual in self.stash:
+            sondeos += 1
+            if actual == clave:
+                return self.stash, sondeos
+        return None, sondeos
+
+    def _colocar(self, clave):
+        for _ in range(self.max_desplazamientos):
+            cubetas = self._cubetas(clave)
+            for cubeta in cubetas:
+                if len(cubeta) < self.ranuras:
+                    cubeta.append(clave)
+                    return
+            # Todas llenas: expulsamos una clave al azar y seguimos con ella
+            cubeta = self._azar.choice(cubetas)
+            i = self._azar.randrange(self.ranuras)
+            cubeta[i], clave = clave, cubeta[i]
+        if len(self.stash) < self.tam_stash:
+            self.stash.append(clave)
+        else:
+            self._rehash(self.tamaño * 2, clave)
+
+    def _rehash(self, nuevo_tamaño, pendiente=_VACIO):
+        claves = [clave for tabla in self.tablas for cubeta in tabla for clave in cubeta]
+        claves += self.stash
+        if pendiente is not _VACIO:
+            claves.append(pendiente)
+        self._crear_tablas(nuevo_tamaño)
+        for clave in claves:
+            self._colocar(clave)
+
+    def insertar(self, clave):
+        if self._buscar(clave)[0] is not None:
+            return  # Ya existe, no insertamos de nuevo
+        if self.num_elementos + 1 > self.factor_max * self.tamaño:
+            self._rehash(self.tamaño * 2)
+        self._colocar(clave)
+        self.num_elementos += 1
+
+    def obtener(self, clave):
+        cubeta, sondeos = self._buscar(clave)
+        self.sondeos[sondeos] = self.sondeos.get(sondeos, 0) + 1
+        return cubeta is not None
+
+    def eliminar(self, clave):
+        cubeta = self._buscar(clave)[0]
+        if cubeta is None:
+            return False
+        cubeta.remove(clave)
+        self.num_elementos -= 1
+        # Si se liberó lugar, una clave del stash puede volver a su cubeta
+        for actual in self.stash:
+            for cubeta in self._cubetas(actual):
+                if len(cubeta) < self.ranuras:
+                    cubeta.append(actual)
+                    self.stash.remove(actual)
+                    return True
+        return True
+
+    def histograma_sondeos(self):
+        return dict(sorted(self.sondeos.items()))
+
+    def reiniciar_sondeos(self):
+        self.sondeos = {}
+
+
+class HashTableHopscotch:
+    """
+    Tabla hash hopscotch: cada clave se guarda a menos de `vecindario`
+    casillas de su casilla ideal, y cada casilla ideal tiene un mapa de bits
+    que dice cuáles de las casillas de su vecindario tienen claves suyas.
+    Una búsqueda solo compara esas casillas, así que a lo más hace
+    `vecindario` comparaciones.
+
+    Al insertar se busca la primera casilla libre (sondeo lineal). Si quedó
+    lejos, se la acerca moviendo hacia ella claves que sigan dentro de su
+    propio vecindario. Si no se puede, la tabla se duplica. Se guarda el
+    hash de cada clave para comparar hashes antes que claves y para mover
+    claves sin volver a calcularlo.
+
+    histograma_sondeos() devuelve cuántas búsquedas (obtener) necesitaron
+    cada número de comparaciones de casillas.
+
+    funcion_hash(clave, tamaño) reemplaza a hash(clave), igual que en
+    HashTableChaining; se llama con tamaño = 2**63 y se guarda el resultado.
+    Igual que en HashTableRobinHood, la casilla son los bits bajos del hash.
+    """
+
+    def __init__(self, tamaño=16, vecindario=32, factor_max=0.9, funcion_hash=None):
+        if not 0 < factor_max < 1:
+            raise ValueError("factor_max debe estar entre 0 y 1")
+        self.vecindario = vecindario
+        self.factor_max = factor_max
+        self.num_elementos = 0
+        self.sondeos = {}  # número de sondeos -> número de búsquedas
+        self.funcion_hash = funcion_hash
+        self._hash = _hash_completo(funcion_hash)
+        self._crear_tabla(1 << max(tamaño - 1, 1).bit_length())
+
+    def _crear_tabla(self, tamaño):
+        self.tamaño = tamaño
+        self.claves = [_VACIO] * tamaño
+        self.hashes = [0] * tamaño
+        self.saltos = [0] * tamaño  # Mapa de bits del vecindario de cada casilla
+
+    def factor_carga(self):
+        return self.num_elementos / self.tamaño
+
+    def _buscar(self, clave, h):
+        # Devuelve (índice de la clave o -1, sondeos)
+        mascara = self.tamaño - 1
+        inicio = h & mascara
+        mapa = self.saltos[inicio]
+        sondeos = 0
+        while mapa:
+            bit = mapa & -mapa
+            j = (inicio + bit.bit_length() - 1) & mascara
+            sondeos += 1
+            if self.hashes[j] == h:
+                actual = self.claves[j]
+                if actual is clave or actual == clave:
+                    return j, sondeos
+            mapa ^= bit
+        return -1, sondeos
+
+    def _colocar(self, clave, h):
+        # Devuelve False si no hay forma de dejar la clave dentro de su vecindario
+        claves, hashes, saltos = self.claves, self.hashes, self.saltos
+        mascara = self.tamaño - 1
+        inicio = h & mascara
+        distancia = 0
+        while claves[(inicio + distancia) & mascara] is not _VACIO:
+            distancia += 1
+            if distancia == self.tamaño:
                 return False
-            if self.tabla[nuevo_indice] == clave:
-                self.tabla[nuevo_indice] = self.marcador_borrado
-                return True
+        libre = (inicio + distancia) & mascara
+        while distancia >= self.vecindario:
+            # Buscamos, de la más lejana a la más cercana, una clave que pueda pasar a la casilla libre
+            for k in range(self.vecindario - 1, 0, -1):
+                candidata = (libre - k) & mascara
+                casa = hashes[candidata] & mascara
+                if (libre - casa) & mascara < self.vecindario:
+                    claves[libre], hashes[libre] = claves[candidata], hashes[candidata]
+                    saltos[casa] ^= (1 << ((candidata - casa) & mascara)) | (1 << ((libre - casa) & mascara))
+                    claves[candidata] = _VACIO
+                    libre = candidata
+                    distancia -= k
+                    break
+            else:
+                return False
+        claves[libre] = clave
+        hashes[libre] = h
+        saltos[inicio] |= 1 << distancia
+        return True
+
+    def _redimensionar(self, nuevo_tamaño):
+        viejas = [(clave, h) for clave, h in zip(self.claves, self.hashes) if clave is not _VACIO]
+        while True:
+            self._crear_tabla(nuevo_tamaño)
+            if all(self._colocar(clave, h) for clave, h in viejas):
+                return
+            nuevo_tamaño *= 2
+
+    def insertar(self, clave):
+        h = self._hash(clave)
+        if self._buscar(clave, h)[0] != -1:
+            return  # Ya existe, no insertamos de nuevo
+        if self.num_elementos + 1 > self.factor_max * self.tamaño:
+            self._redimensionar(self.tamaño * 2)
+        while not self._colocar(clave, h):
+            self._redimensionar(self.tamaño * 2)
+        self.num_elementos += 1
+
+    def obtener(self, clave):
+        j, sondeos = self._buscar(clave, self._hash(clave))
+        self.sondeos[sondeos] = self.sondeos.get(sondeos, 0) + 1
+        return j != -1
+
+    def eliminar(self, clave):
+        h = self._hash(clave)
+        j = self._buscar(clave, h)[0]
+        if j == -1:
+            return False
+        mascara = self.tamaño - 1
+        inicio = h & mascara
+        self.saltos[inicio] &= ~(1 << ((j - inicio) & mascara))
+        self.claves[j] = _VACIO
+        self.num_elementos -= 1
+        return True
+
+    def histograma_sondeos(self):
+        return dict(sorted(self.sondeos.items()))
+
+    def reiniciar_sondeos(self):
+        self.sondeos = {}
+
+
+class _EstadoConcurrente:
+    # Se reemplaza entero (nunca se modifica tabla/bits) para que un lector
+    # vea siempre una combinación consistente con una sola lectura
+    __slots__ = ("tabla", "bits", "nueva", "bits_nueva", "migradas")
+
+    def __init__(self, tabla, bits, nueva=None, bits_nueva=0, migradas=None):
+        self.tabla = tabla
+        self.bits = bits
+        self.nueva = nueva
+        self.bits_nueva = bits_nueva
+        self.migradas = migradas
+
+
+class HashTableConcurrente:
+    """
+    Mapa hash (clave -> valor) que se puede compartir entre hilos.
+
+    Cada cubeta es una tupla de pares (clave, valor) que nunca se modifica:
+    para escribir se arma una tupla nueva y se reemplaza la casilla. Así las
+    lecturas (obtener) no toman ningún candado: leer una casilla de la lista
+    es atómico, y la tupla que se obtiene está completa. Las escrituras
+    toman el candado de su franja, un rango contiguo de cubetas (los bits
+    altos del hash), así que escrituras en franjas distintas no se esperan.
+
+    Al duplicar el tamaño, cada cubeta i pasa a las cubetas 2i y 2i+1, que
+    quedan en la misma franja. El hilo que dispara el rehash migra la tabla
+    franja por franja, tomando solo el candado de la franja que mueve: los
+    lectores nunca se bloquean y los escritores solo esperan si escriben en
+    esa franja. Los lectores buscan en la tabla nueva las franjas ya migradas
+    y en la vieja las demás.
+
+    poner_si_ausente y calcular_si_ausente (put_if_absent y
+    compute_if_absent) son atómicas respecto a las demás escrituras.
+    funcion de calcular_si_ausente se llama con el candado de la franja
+    tomado, así que debe ser corta y no escribir en el mapa.
+    """
+
+    def __init__(self, tamaño=64, franjas=16, factor_max=1.0):
+        self._bits_franjas = max(franjas - 1, 1).bit_length()
+        self.franjas = 1 << self._bits_franjas
+        bits = max(max(tamaño, self.franjas) - 1, 1).bit_length()
+        self.factor_max = factor_max
+        self._candados = [threading.Lock() for _ in range(self.franjas)]
+        self._elementos = [0] * self.franjas  # Por franja, con su candado
+        self._rehash = threading.Lock()  # Solo un rehash a la vez
+        self._estado = _EstadoConcurrente([()] * (1 << bits), bits)
+
+    @property
+    def tamaño(self):
+        return len(self._estado.tabla)
+
+    @property
+    def num_elementos(self):
+        return sum(self._elementos)
+
+    def __len__(self):
+        return self.num_elementos
+
+    def factor_carga(self):
+        return self.num_elementos / self.tamaño
+
+    def _hash(self, clave):
+        # Fibonacci: los bits altos quedan bien mezclados
+        return (hash(clave) * 0x9E3779B97F4A7C15) & _MASCARA64
+
+    def _cubeta(self, estado, h):
+        # (tabla, índice) donde está la clave con hash h según estado
+        if estado.nueva is not None and estado.migradas[h >> (64 - self._bits_franjas)]:
+            return estado.nueva, h >> (64 - estado.bits_nueva)
+        return estado.tabla, h >> (64 - estado.bits)
+
+    def obtener(self, clave, defecto=None):
+        h = (hash(clave) * 0x9E3779B97F4A7C15) & _MASCARA64
+        estado = self._estado
+        if estado.nueva is None:
+            cubeta = estado.tabla[h >> (64 - estado.bits)]
+            if self._estado is not estado:  # Empezó un rehash mientras tanto
+                return self.obtener(clave, defecto)
+        else:
+            while True:
+                tabla, i = self._cubeta(estado, h)
+                cubeta = tabla[i]
+                # Si mientras tanto migraron la franja, la cubeta leída puede
+                # no tener las últimas escrituras: se vuelve a leer en la nueva
+                estado = self._estado
+                if self._cubeta(estado, h)[0] is tabla:
+                    break
+        for c, valor in cubeta:
+            if c is clave or c == clave:
+                return valor
+        return defecto
+
+    def _escribir(self, clave, valor, solo_si_ausente, funcion=None):
+        # Pone clave -> valor (o funcion(clave) si se da). Devuelve el valor
+        # que quedó y si la clave era nueva
+        h = (hash(clave) * 0x9E3779B97F4A7C15) & _MASCARA64
+        franja = h >> (64 - self._bits_franjas)
+        with self._candados[franja]:
+            tabla, i = self._cubeta(self._estado, h)
+            cubeta = tabla[i]
+            for j, (c, anterior) in enumerate(cubeta):
+                if c is clave or c == clave:
+                    if solo_si_ausente:
+                        return anterior, False
+                    tabla[i] = cubeta[:j] + ((c, valor),) + cubeta[j + 1:]
+                    return valor, False
+            if funcion is not None:
+                valor = funcion(clave)
+            tabla[i] = cubeta + ((clave, valor),)
+            self._elementos[franja] += 1
+            lleno = self._elementos[franja] > self.factor_max * (len(tabla) >> self._bits_franjas)
+        if lleno:
+            self._duplicar(len(tabla))
+        return valor, True
+
+    def insertar(self, clave, valor=True):
+        # Inserta o reemplaza el valor de la clave
+        self._escribir(clave, valor, False)
+
+    def poner_si_ausente(self, clave, valor):
+        """Guarda valor si la clave no está. Devuelve el valor que quedó."""
+        return self._escribir(clave, valor, True)[0]
+
+    def calcular_si_ausente(self, clave, funcion):
+        """
+        Si la clave no está guarda funcion(clave), llamada una sola vez
+        aunque varios hilos lo intenten a la vez. Devuelve el valor que quedó.
+        """
+        return self._escribir(clave, None, True, funcion)[0]
+
+    def eliminar(self, clave):
+        h = self._hash(clave)
+        franja = h >> (64 - self._bits_franjas)
+        with self._candados[franja]:
+            tabla, i = self._cubeta(self._estado, h)
+            cubeta = tabla[i]
+            for j, (c, _) in enumerate(cubeta):
+                if c is clave or c == clave:
+                    tabla[i] = cubeta[:j] + cubeta[j + 1:]
+                    self._elementos[franja] -= 1
+                    return True
         return False
 
+    def _duplicar(self, tamaño):
+        if not self._rehash.acquire(blocking=False):
+            return  # Otro hilo ya está duplicando la tabla
+        try:
+            viejo = self._estado
+            if len(viejo.tabla) != tamaño:
+                return  # Otro hilo ya la duplicó
+            bits = viejo.bits + 1
+            nueva = [()] * (1 << bits)
+            migradas = [False] * self.franjas
+            self._estado = _EstadoConcurrente(viejo.tabla, viejo.bits, nueva, bits, migradas)
+            por_franja = len(viejo.tabla) >> self._bits_franjas
+            desplazamiento = 64 - bits
+            for franja, candado in enumerate(self._candados):
+                with candado:
+                    for i in range(franja * por_franja, (franja + 1) * por_franja):
+                        for par in viejo.tabla[i]:
+                            j = self._hash(par[0]) >> desplazamiento
+                            nueva[j] = nueva[j] + (par,)
+                    migradas[franja] = True
+            self._estado = _EstadoConcurrente(nueva, bits)
+        finally:
+            self._rehash.release()
 
 
-def generar_clave(longitud=8): # crea las claves alfanumericas que se utilizaran en cada insersion 
+def generar_clave(longitud=8, azar=random): # crea las claves alfanumericas que se utilizaran en cada insersion 
     caracteres = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
-    return ''.join(random.choice(caracteres) for _ in range(longitud))
-
-# tablas hash con direccionamiento encadenado y direccionamiento abierto
-tabla_encadenada = HashTableChaining(tamaño=10000)
-tabla_abierta = HashTableOpenAddressing(tamaño=10000)
-
-# Insertar 10,000 claves aleatorias
-claves_iniciales = [generar_clave() for _ in range(10000)]
-
-# Medir el tiempo de inserción para la tabla de encadenamiento
-start_time = time.time()
-
-for clave in claves_iniciales:
-    tabla_encadenada.insertar(clave)
-print(f"Tiempo de inserción en tabla de encadenamiento: {time.time() - start_time} segundos")
-
-# Medir el tiempo de inserción para la tabla de direccionamiento abierto
-start_time = time.time()
-for clave in claves_iniciales:
-    tabla_abierta.insertar(clave)
-print(f"Tiempo de inserción en tabla de direccionamiento abierto: {time.time() - start_time} segundos")
-
-# Elegir un subconjunto de claves para realizar búsquedas y eliminaciones
-subconjunto_claves = random.sample(claves_iniciales, 1000)
-
-# Medir el tiempo de búsqueda en la tabla de encadenamiento
-start_time = time.time()
-for clave in subconjunto_claves:
-    tabla_encadenada.obtener(clave)
-print(f"Tiempo de búsqueda en tabla de encadenamiento: {time.time() - start_time} segundos")
-
-# Medir el tiempo de búsqueda en la tabla de direccionamiento abierto
-start_time = time.time()
-for clave in subconjunto_claves:
-    tabla_abierta.obtener(clave)
-print(f"Tiempo de búsqueda en tabla de direccionamiento abierto: {time.time() - start_time} segundos")
-
-# Medir el tiempo de eliminación en la tabla de encadenamiento
-start_time = time.time()
-for clave in subconjunto_claves:
-    tabla_encadenada.eliminar(clave)
-print(f"Tiempo de eliminación en tabla de encadenamiento: {time.time() - start_time} segundos")
-
-# Medir el tiempo de eliminación en la tabla de direccionamiento abierto
-start_time = time.time()
-for clave in subconjunto_claves:
-    tabla_abierta.eliminar(clave)
-print(f"Tiempo de eliminación en tabla de direccionamiento abierto: {time.time() - start_time} segundos")
\ No newline at end of file
+    return ''.join(azar.choice(caracteres) for _ in range(longitud))
+
+
+# Suite de pruebas de rendimiento. Importar el módulo no ejecuta nada: las
+# pruebas corren con ejecutar_suite() o al ejecutar el archivo.
+
+IMPLEMENTACIONES = {
+    "encadenamiento": HashTableChaining,
+    "direccionamiento abierto": HashTableOpenAddressing,
+    "Robin Hood": HashTableRobinHood,
+    "conjunto compacto": HashSetCompacto,
+    "cuckoo": HashTableCuckoo,
+    "hopscotch": HashTableHopscotch,
+    "concurrente": HashTableConcurrente,
+}
+
+
+def _percentil(ordenados, q):
+    return ordenados[min(int(len(ordenados) * q), len(ordenados) - 1)]
+
+
+def medir(preparar, metodo, claves, repeticiones=5, calentamiento=1):
+    """
+    Mide una operación (insertar, obtener o eliminar) sobre una lista de
+    claves.
+
+    preparar() devuelve la tabla sobre la que se corre cada repetición (una
+    nueva si la operación la modifica). Primero se hacen `calentamiento`
+    pasadas sin medir. Cada repetición mide el tiempo total de la pasada con
+    perf_counter_ns, y una pasada extra mide cada operación por separado
+    para los percentiles de latencia. El recolector de basura se apaga
+    mientras se mide.
+
+    Devuelve un diccionario con la mediana y el mínimo de ns por operación
+    entre repeticiones, las operaciones por segundo (según la mediana) y los
+    percentiles p50, p90, p99 y el máximo de la latencia en ns.
+    """
+    for _ in range(calentamiento):
+        operacion = getattr(preparar(), metodo)
+        for clave in claves:
+            operacion(clave)
+    reloj = time.perf_counter_ns
+    totales = []
+    latencias = [0] * len(claves)
+    gc.disable()
+    try:
+        for _ in range(repeticiones):
+            operacion = getattr(preparar(), metodo)
+            inicio = reloj()
+            for clave in claves:
+                operacion(clave)
+            totales.append(reloj() - inicio)
+        operacion = getattr(preparar(), metodo)
+        for i, clave in enumerate(claves):
+            inicio = reloj()
+            operacion(clave)
+            latencias[i] = reloj() - inicio
+    finally:
+        gc.enable()
+    totales.sort()
+    latencias.sort()
+    ns_por_op = _percentil(totales, 0.5) / len(claves)
+    return {
+        "ns_por_op": ns_por_op,
+        "ns_por_op_min": totales[0] / len(claves),
+        "ops_por_segundo": 1e9 / ns_por_op,
+        "p50_ns": _percentil(latencias, 0.5),
+        "p90_ns": _percentil(latencias, 0.9),
+        "p99_ns": _percentil(latencias, 0.99),
+        "max_ns": latencias[-1],
+    }
+
+
+def ejecutar_suite(tamaños=(2 ** 10, 2 ** 13, 2 ** 16), factores=(0.5, 0.7, 0.9),
+                   aciertos=(1.0, 0.5, 0.0), implementaciones=None, repeticiones=5,
+                   calentamiento=1, semilla=0, mostrar=True):
+    """
+    Corre insertar, obtener y eliminar en cada implementación para cada
+    combinación de tamaño de tabla, factor de carga y proporción de
+    búsquedas exitosas (aciertos).
+
+    Cada tabla se crea con el tamaño dado y factor_max=0.95, y se le
+    insertan tamaño * factor claves, así no crece mientras se mide. Los
+    tamaños son potencias de 2 porque varias tablas redondean a la
+    siguiente; cada resultado guarda también el factor de carga real. Las
+    búsquedas fallidas usan claves de 9 caracteres, que nunca están en la
+    tabla. Las claves salen de random.Random(semilla).
+
+    implementaciones es un diccionario nombre -> clase (por defecto
+    IMPLEMENTACIONES). Devuelve una lista de diccionarios, uno por medición,
+    lista para guardar_json o guardar_csv.
+    """
+    implementaciones = implementaciones or IMPLEMENTACIONES
+    azar = random.Random(semilla)
+    resultados = []
+    todas = [generar_clave(azar=azar) for _ in range(max(tamaños))]
+    todas_ausentes = [generar_clave(9, azar=azar) for _ in range(max(tamaños))]
+    for tamaño in tamaños:
+        for factor in factores:
+            n = int(tamaño * factor)
+            claves, ausentes = todas[:n], todas_ausentes[:n]
+            for nombre, clase in implementaciones.items():
+
+                def nueva_tabla():
+                    return clase(tamaño=tamaño, factor_max=0.95)
+
+                def llena():
+                    tabla = nueva_tabla()
+                    for clave in claves:
+                        tabla.insertar(clave)
+                    return tabla
+
+                tabla = llena()
+                base = {"implementacion": nombre, "tamaño": tamaño, "claves": n, "factor": factor,
+                        "factor_real": round(tabla.factor_carga(), 3)}
+                mediciones = [("insertar", None, nueva_tabla, claves)]
+                for proporcion in aciertos:
+                    exitosas = int(n * proporcion)
+                    consultas = claves[:exitosas] + ausentes[:n - exitosas]
+                    azar.shuffle(consultas)
+                    mediciones.append(("obtener", proporcion, lambda: tabla, consultas))
+                mediciones.append(("eliminar", None, llena, claves))
+                for operacion, proporcion, preparar, lista in mediciones:
+                    fila = dict(base, operacion=operacion, aciertos=proporcion)
+                    fila.update(medir(preparar, operacion, lista, repeticiones, calentamiento))
+                    resultados.append(fila)
+                    if mostrar:
+                        print(f"{nombre:>24} tamaño={tamaño:<6} factor={factor} ({fila['factor_real']:.2f}) "
+                              f"{operacion:>8}{'' if proporcion is None else f' aciertos={proporcion}':<14} "
+                              f"{fila['ns_por_op']:8.0f} ns/op {fila['ops_por_segundo'] / 1e6:6.2f} Mops/s "
+                              f"p50={fila['p50_ns']} p99={fila['p99_ns']} ns")
+    return resultados
+
+
+def guardar_json(resultados, ruta):
+    metadatos = {"python": platform.python_version(), "implementacion": platform.python_implementation(),
+                 "plataforma": platform.platform(), "fecha": time.strftime("%Y-%m-%dT%H:%M:%S")}
+    with open(ruta, "w") as f:
+        json.dump({"metadatos": metadatos, "resultados": resultados}, f, indent=1, ensure_ascii=False)
+
+
+def guardar_csv(resultados, ruta):
+    with open(ruta, "w", newline="") as f:
+        escritor = csv.DictWriter(f, fieldnames=list(resultados[0]))
+        escritor.writeheader()
+        escritor.writerows(resultados)
+
+
+def experimento_churn():
+    # Direccionamiento abierto lineal vs Robin Hood a factores de carga altos,
+    # después de una ronda de eliminaciones e inserciones (churn)
+    for factor in (0.5, 0.7, 0.9):
+        tamaño = 2 ** 15
+        n = int(factor * tamaño)
+        claves = [generar_clave() for _ in range(n)]
+        reemplazos = [generar_clave() for _ in range(n // 2)]
+        ausentes = [generar_clave(9) for _ in range(1000)]
+        for nombre, tabla in (("direccionamiento abierto", HashTableOpenAddressing(tamaño=tamaño, factor_max=0.95)),
+                              ("Robin Hood", HashTableRobinHood(tamaño=tamaño, factor_max=0.95))):
+            for clave in claves:
+                tabla.insertar(clave)
+            for viejo, nuevo in zip(claves, reemplazos):
+                tabla.eliminar(viejo)
+                tabla.insertar(nuevo)
+            exitosas = medir(lambda: tabla, "obtener", claves[n // 2:n // 2 + 1000])
+            fallidas = medir(lambda: tabla, "obtener", ausentes)
+            print(f"Factor {factor} en tabla de {nombre}: búsquedas exitosas {exitosas['ns_por_op']:.0f} ns, "
+                  f"fallidas {fallidas['ns_por_op']:.0f} ns")
+
+
+def experimento_sondeos():
+    # Sondeos por búsqueda (exitosas y fallidas) en cuckoo y hopscotch: el
+    # máximo debe quedar acotado por una constante aunque suba el factor de carga
+    for factor in (0.5, 0.7, 0.8, 0.9):
+        tamaño = 2 ** 14
+        claves = [generar_clave() for _ in range(int(factor * tamaño))]
+        ausentes = [generar_clave(9) for _ in range(2000)]
+        for nombre, tabla in (("cuckoo", HashTableCuckoo(tamaño=tamaño, factor_max=0.95)),
+                              ("hopscotch", HashTableHopscotch(tamaño=tamaño, factor_max=0.95))):
+            for clave in claves:
+                tabla.insertar(clave)
+            tabla.reiniciar_sondeos()
+            for clave in claves[:2000] + ausentes:
+                tabla.obtener(clave)
+            histograma = tabla.histograma_sondeos()
+            print(f"Factor {factor} en tabla {nombre} (carga real {tabla.factor_carga():.2f}): "
+                  f"máximo {max(histograma)} sondeos, histograma {histograma}")
+
+
+def experimento_memoria(n=200_000):
+    # Tiempo de inserción y memoria por clave (sin contar las claves mismas)
+    claves = [generar_clave() for _ in range(n)]
+    for nombre, clase in (("encadenamiento", HashTableChaining),
+                          ("direccionamiento abierto", HashTableOpenAddressing),
+                          ("Robin Hood", HashTableRobinHood),
+                          ("conjunto compacto", HashSetCompacto)):
+        tabla = clase(tamaño=16)
+        start_time = time.perf_counter()
+        for clave in claves:
+            tabla.insertar(clave)
+        tiempo = time.perf_counter() - start_time
+        tracemalloc.start()
+        tabla = clase(tamaño=16)
+        for clave in claves:
+            tabla.insertar(clave)
+        memoria = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(f"Tabla de {nombre}: {n} inserciones en {tiempo:.3f} s, "
+              f"{memoria / n:.1f} bytes por clave")
+
+
+def experimento_latencia(n=1_000_000):
+    # Latencia de cada inserción mientras la tabla crece (rehash incremental).
+    # Usar n=10_000_000 para la prueba completa. El recolector de basura se
+    # apaga durante la medición porque sus pausas no dependen de la tabla.
+    for nombre, tabla in (("encadenamiento", HashTableChaining(tamaño=8)),
+                          ("direccionamiento abierto", HashTableOpenAddressing(tamaño=8))):
+        latencias = [0] * n
+        gc.disable()
+        for i in range(n):
+            inicio = time.perf_counter_ns()
+            tabla.insertar(i)
+            latencias[i] = time.perf_counter_ns() - inicio
+        gc.enable()
+        latencias.sort()
+        p50, p99, p999 = (latencias[int(n * q)] / 1000 for q in (0.5, 0.99, 0.999))
+        print(f"Latencia de inserción en tabla de {nombre} ({n} claves, tamaño final {tabla.tamaño}): "
+              f"p50={p50:.1f}us p99={p99:.1f}us p99.9={p999:.1f}us max={latencias[-1] / 1000:.1f}us")
+
+
+class _ConCandadoGlobal:
+    def __init__(self):
+        self.tabla = HashTableChaining(tamaño=1024)
+        self.candado = threading.Lock()
+
+    def insertar(self, clave):
+        with self.candado:
+            self.tabla.insertar(clave)
+
+    def obtener(self, clave):
+        with self.candado:
+            return self.tabla.obtener(clave)
+
+
+def experimento_concurrencia(n=200_000):
+    # Mapa concurrente contra encadenamiento con un solo candado global, con
+    # varios hilos y mezclas de lecturas/escrituras. Con el GIL los hilos no
+    # corren en paralelo, así que lo que se mide es el costo de sincronizar.
+    claves = [generar_clave() for _ in range(20_000)]
+    for mezcla, escrituras in (("lecturas (90/10)", 0.1), ("escrituras (50/50)", 0.5)):
+        for hilos in (1, 2, 4, 8):
+            for nombre, tabla in (("concurrente", HashTableConcurrente(tamaño=1024)),
+                                  ("candado global", _ConCandadoGlobal())):
+                for clave in claves[:10_000]:
+                    tabla.insertar(clave)
+                por_hilo = n // hilos
+
+                def trabajar(semilla):
+                    azar = random.Random(semilla)
+                    for _ in range(por_hilo):
+                        clave = claves[azar.randrange(len(claves))]
+                        if azar.random() < escrituras:
+                            tabla.insertar(clave)
+                        else:
+                            tabla.obtener(clave)
+
+                trabajadores = [threading.Thread(target=trabajar, args=(i,)) for i in range(hilos)]
+                start_time = time.perf_counter()
+                for t in trabajadores:
+                    t.start()
+                for t in trabajadores:
+                    t.join()
+                tiempo = time.perf_counter() - start_time
+                print(f"Mezcla de {mezcla}, {hilos} hilos, {nombre}: "
+                      f"{n / tiempo / 1e6:.2f} millones de operaciones por segundo")
+
+
+if __name__ == "__main__":
+    resultados = ejecutar_suite()
+    guardar_json(resultados, "resultados_tablas_hash.json")
+    guardar_csv(resultados, "resultados_tablas_hash.csv")
+    experimento_churn()
+    experimento_sondeos()
+    experimento_memoria()
+    experimento_latencia()
+    experimento_concurrencia()
@@ -0,0 +1,45 @@
+import random
+import time
+import unittest
+
+from tablas_hash import HashTableOpenAddressing
+
+
+class TestRehashIncremental(unittest.TestCase):
+    """
+    Con paso_migracion chico la tabla nueva recibe claves más rápido de lo
+    que se migra la vieja: no debe llenarse ni degradar los sondeos.
+    """
+
+    def test_insertar_y_eliminar_al_azar(self):
+        rnd = random.Random(0)
+        tabla = HashTableOpenAddressing(tamaño=8, paso_migracion=1,
+                                        factor_max=0.9, factor_min=0.4)
+        referencia = set()
+        for _ in range(20000):
+            clave = rnd.randrange(200)
+            if rnd.random() < 0.5:
+                tabla.insertar(clave)  # Antes: RuntimeError("Tabla llena")
+                referencia.add(clave)
+            else:
+                self.assertEqual(tabla.eliminar(clave), clave in referencia)
+                referencia.discard(clave)
+            tamaño = tabla._tamaño_nuevo if tabla._nueva is not None else tabla.tamaño
+            self.assertLessEqual(tabla._ocupadas, tabla.factor_max * tamaño + 1)
+        self.assertEqual(tabla.num_elementos, len(referencia))
+        for clave in range(200):
+            self.assertEqual(tabla.obtener(clave), clave in referencia)
+
+    def test_insercion_secuencial_lineal(self):
+        tabla = HashTableOpenAddressing(tamaño=8, paso_migracion=1, factor_max=0.9)
+        inicio = time.perf_counter()
+        for clave in range(20000):
+            tabla.insertar(clave)
+        # Antes tardaba ~19 s (cuadrático); lineal son décimas de segundo
+        self.assertLess(time.perf_counter() - inicio, 5)
+        self.assertEqual(tabla.num_elementos, 20000)
+        self.assertTrue(all(tabla.obtener(clave) for clave in range(20000)))
+
+
+if __name__ == "__main__":
+    unittest.main()